@@ -0,0 +1,4 @@
+#!/usr/bin/env sh
+
+echo "Starting outbox relay"
+cd /opt/app/src || exit ; exec python manage.py relay_outbox
@@ -276,12 +276,27 @@ CELERY_TIMEZONE = "Asia/Yekaterinburg"
 CELERY_BEAT_SCHEDULE = {
     "accept-pending-orders": {
         "task": "orders.tasks.accept_pending_orders_task",
-        "schedule": crontab(hour="0", minute='0'),
-    }
+        "schedule": crontab(minute='*/5'),
+    },
+    "reconcile-order-objective-status-counters": {
+        "task": "orders.tasks.reconcile_order_objective_status_counters_task",
+        "schedule": crontab(minute='*/10'),
+    },
+    "flush-shopping-cart-touches": {
+        "task": "orders.tasks.flush_shopping_cart_touches_task",
+        "schedule": crontab(minute='*'),
+    },
+    "delete-stale-shopping-carts": {
+        "task": "orders.tasks.delete_stale_shopping_carts_task",
+        "schedule": crontab(minute='30'),
+    },
 }
 
 SITE_ID = os.environ.get("SITE_ID", 1)
 
+# "machine" (transitions.Machine) or "table" (precomputed TransitionTable)
+ORDER_OBJECTIVE_TRANSITIONS = os.environ.get("ORDER_OBJECTIVE_TRANSITIONS", "machine")
+
 ASGI_APPLICATION = 'boosting.asgi.application'
 
 CHANNEL_LAYERS = {
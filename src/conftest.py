@@ -1,20 +1,32 @@
+import contextlib
 import datetime as dt
+import statistics
+import time
+import typing as t
+from dataclasses import dataclass
 from unittest.mock import MagicMock
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from core.boosters.domain.entities import Booster
 from core.bungie.entities import DestinyBungieProfile
 from core.bungie.test_utils import generate_destiny_bungie_profile, generate_destiny_character
 from core.clients.domain.client import Client
+from core.domain.entities.constants import ConfigurationType
 from core.domain.entities.tests.utils import generate_service, generate_service_config
+from core.domain.utils import generate_id
 from core.order.test_utils import generate_client_order, generate_order_objectives
-from orders.orm_models import ORMClientOrder, ORMOrderObjective
+from orders.orm_models import ORMClientOrder, ORMOrderObjective, ORMShoppingCart, ORMShoppingCartItem
 from orders.repositories import DjangoClientOrderRepository
 from profiles.constants import CharacterClasses, Membership
-from profiles.models import User
+from profiles.models import BoosterUser, User
 from profiles.orm_models import ORMDestinyBungieCharacter, ORMDestinyBungieProfile
-from services.models import Category as CategoryORM, Service as ServiceORM, ServiceConfig as ServiceConfigORM
+from services.repositories import DjangoServicePriceTableRepository
+from services.models import (
+    Category as CategoryORM, PromoCode as PromoCodeORM, Service as ServiceORM, ServiceConfig as ServiceConfigORM,
+)
 from utils import generate_random_id
 
 
@@ -230,6 +242,17 @@ def db_client(client: Client) -> User:
     )
 
 
+@pytest.fixture()
+def db_booster_user() -> User:
+    booster_profile = BoosterUser.objects.create()
+    return User.objects.create(
+        username='booster@littlelight.store',
+        email='booster@littlelight.store',
+        is_booster=True,
+        booster_profile=booster_profile
+    )
+
+
 @pytest.fixture()
 def boosters_repository_mock():
     from core.boosters.application.repository import BoostersRepository
@@ -252,3 +275,140 @@ def order_objectives_repository_mock():
 def order_objective_mock():
     from core.order.domain.order import ClientOrderObjective
     return MagicMock(spec=ClientOrderObjective)
+
+
+@pytest.fixture()
+def locmem_cache(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_service_price_tables():
+    """
+    Price tables are compiled once per process and the version bump waits for commit,
+    which never happens in tests: tables of previous tests must not be served
+    """
+    DjangoServicePriceTableRepository().bump_version()
+
+
+@pytest.fixture()
+def run_on_commit():
+    """
+    Runs callbacks registered with transaction.on_commit, test transaction itself is never committed
+    """
+    def func():
+        callbacks, connection.run_on_commit = connection.run_on_commit, []
+        for _, callback in callbacks:
+            callback()
+    return func
+
+
+@pytest.fixture()
+def db_options_service(db_category):
+    service = ServiceORM.objects.create(
+        category=db_category,
+        title='Options service',
+        option_type='single',
+        slug='options-service',
+        base_price=10,
+        configuration_type=ConfigurationType.options_select.value
+    )
+    ServiceConfigORM.objects.create(service=service, title='First', price=20, old_price=25)
+    ServiceConfigORM.objects.create(service=service, title='Second', price=30)
+    return service
+
+
+@pytest.fixture()
+def db_promo_code(db_options_service):
+    promo = PromoCodeORM.objects.create(code='TEST-PROMO', discount=10)
+    promo.service.add(db_options_service)
+    return promo
+
+
+@pytest.fixture()
+def db_shopping_cart(db_options_service, db_promo_code, db_destiny_profile, db_destiny_character):
+    def func(items_count: int, promo_code: bool = True) -> ORMShoppingCart:
+        cart = ORMShoppingCart.objects.create(id=generate_id(), promo_code=db_promo_code if promo_code else None)
+        items = ORMShoppingCartItem.objects.bulk_create([
+            ORMShoppingCartItem(
+                id=generate_id(),
+                bungie_profile=db_destiny_profile,
+                character=db_destiny_character,
+                service=db_options_service,
+                shopping_cart=cart,
+            ) for _ in range(items_count)
+        ])
+
+        through = ORMShoppingCartItem.selected_options.through
+        through.objects.bulk_create([
+            through(ormshoppingcartitem_id=item.id, serviceconfig_id=option.id)
+            for item in items for option in db_options_service.configs.all()
+        ])
+        return cart
+    return func
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    rounds: int
+    min: float
+    mean: float
+    queries: t.Optional[int]
+
+
+BENCHMARK_RESULTS: t.List[BenchmarkResult] = []
+
+
+@pytest.fixture()
+def benchmark(request):
+    """
+    Runs `func` several rounds and records wall time and queries count of each round,
+    `setup` result is passed to `func` and is not measured. Timings are reported in the
+    terminal summary, tests assert queries count only. Queries are not counted without db access.
+    """
+    count_queries = request.node.get_closest_marker('django_db') is not None
+
+    def run(
+        func: t.Callable,
+        setup: t.Optional[t.Callable[[], t.Tuple]] = None,
+        rounds: int = 3,
+        warmup_rounds: int = 1,
+        name: t.Optional[str] = None,
+    ) -> BenchmarkResult:
+        timings, queries = [], []
+
+        for i in range(warmup_rounds + rounds):
+            args = setup() if setup else ()
+            with CaptureQueriesContext(connection) if count_queries else contextlib.nullcontext() as ctx:
+                started_at = time.perf_counter()
+                func(*args)
+                elapsed = time.perf_counter() - started_at
+
+            if i >= warmup_rounds:
+                timings.append(elapsed)
+                if count_queries:
+                    queries.append(len(ctx.captured_queries))
+
+        result = BenchmarkResult(
+            name=name or request.node.name,
+            rounds=rounds,
+            min=min(timings),
+            mean=statistics.mean(timings),
+            queries=max(queries) if queries else None,
+        )
+        BENCHMARK_RESULTS.append(result)
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not BENCHMARK_RESULTS:
+        return
+
+    terminalreporter.section('benchmarks')
+    terminalreporter.write_line(f'{"name":<70} {"min, ms":>10} {"mean, ms":>10} {"queries":>8}')
+    for r in BENCHMARK_RESULTS:
+        queries = '-' if r.queries is None else r.queries
+        terminalreporter.write_line(f'{r.name:<70} {r.min * 1000:>10.2f} {r.mean * 1000:>10.2f} {queries:>8}')
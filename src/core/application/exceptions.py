@@ -0,0 +1,5 @@
+from core.exceptions import BaseNotExistsException
+
+
+class ServiceDoesNotExists(BaseNotExistsException):
+    pass
@@ -1,7 +1,10 @@
 import typing as t
 import abc
 
-from core.domain.entities.service import Service, ServiceConfig, ServiceDetailedInfo, ServiceGroupTag
+from core.domain.entities.service import (
+    Service, ServiceConfig, ServiceDetailedInfo, ServiceGroupTag,
+    ServicePriceTable,
+)
 
 
 class ServiceRepository(abc.ABC):
@@ -40,6 +43,22 @@ class ServiceConfigsRepository(abc.ABC):
         pass
 
 
+class ServicePriceTableRepository(abc.ABC):
+    @abc.abstractmethod
+    def get_by_slug(self, slug: str) -> ServicePriceTable:
+        """
+        @raise ServiceDoesNotExists if service not found
+        """
+        pass
+
+    @abc.abstractmethod
+    def bump_version(self) -> t.NoReturn:
+        """
+        Drops compiled price tables, should be called when services or their configs are changed
+        """
+        pass
+
+
 class ServiceDetailedInfoRepository(abc.ABC):
     @abc.abstractmethod
     def get_by_slug(self, service_slug: str) -> ServiceDetailedInfo:
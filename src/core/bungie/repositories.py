@@ -23,10 +23,18 @@ class DestinyBungieProfileRepository(abc.ABC):
     def get_by_id(self, membership_id: str) -> DestinyBungieProfile:
         pass
 
+    @abc.abstractmethod
+    def list_by_ids(self, membership_ids: t.List[str]) -> t.List[DestinyBungieProfile]:
+        pass
+
     @abc.abstractmethod
     def create_or_update(self, profile: DestinyBungieProfile):
         pass
 
+    @abc.abstractmethod
+    def create_or_update_bulk(self, profiles: t.List[DestinyBungieProfile]) -> t.NoReturn:
+        pass
+
     @abc.abstractmethod
     def get_by_cart_id(self, cart_id: ShoppingCartId) -> t.List[DestinyBungieProfile]:
         pass
@@ -45,10 +53,18 @@ class DestinyBungieCharacterRepository(abc.ABC):
     def create_or_update(self, character: DestinyCharacter):
         pass
 
+    @abc.abstractmethod
+    def create_or_update_bulk(self, characters: t.List[DestinyCharacter]) -> t.NoReturn:
+        pass
+
     @abc.abstractmethod
     def get_by_id(self, character_id: str) -> DestinyCharacter:
         pass
 
+    @abc.abstractmethod
+    def list_by_ids(self, character_ids: t.List[str]) -> t.List[DestinyCharacter]:
+        pass
+
     @abc.abstractmethod
     def list_by_client_order_id(self, client_order_id: str) -> t.List[DestinyCharacter]:
         pass
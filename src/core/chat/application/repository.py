@@ -1,5 +1,6 @@
 import typing as t
 import abc
+import datetime as dt
 
 from core.chat.domain.chat_room import ChatRole, ChatRoom, ChatMessage
 
@@ -28,6 +29,38 @@ class ChatMessagesRepository(abc.ABC):
     ) -> t.List[ChatMessage]:
         pass
 
+    @abc.abstractmethod
+    def list_page_by_users_pair(
+        self,
+        client_id: int,
+        booster_id: int,
+        limit: int,
+        before: t.Optional[t.Tuple[dt.datetime, int]] = None
+    ) -> t.List[ChatMessage]:
+        """
+        Up to `limit` latest messages sent before (created_at, id) cursor, oldest first
+        """
+        pass
+
+    @abc.abstractmethod
+    def list_last_by_users_pairs(
+        self,
+        pairs: t.List[t.Tuple[int, int]],
+        limit: int
+    ) -> t.Dict[t.Tuple[int, int], t.List[ChatMessage]]:
+        """
+        Up to `limit` latest messages of every (client_id, booster_id) pair, oldest first
+        """
+        pass
+
+    @abc.abstractmethod
+    def count_unread_by_senders(self, receiver_id: int) -> t.Dict[int, int]:
+        pass
+
     @abc.abstractmethod
     def create(self, message: ChatMessage):
         pass
+
+    @abc.abstractmethod
+    def create_bulk(self, messages: t.List[ChatMessage]):
+        pass
@@ -0,0 +1,61 @@
+import datetime as dt
+import typing as t
+
+from pydantic import BaseModel, conint
+
+from core.chat.application.repository import ChatMessagesRepository, ChatRoomRepository
+from core.chat.application.use_cases.list_user_rooms import ChatMessageDTO, encode_message
+from core.chat.domain.chat_room import ChatRole
+
+
+class ChatHistoryCursorDTO(BaseModel):
+    created_at: dt.datetime
+    id: int
+
+
+class ListChatHistoryDTOInput(BaseModel):
+    role: ChatRole
+    user_id: int
+    receiver_id: int
+    before: ChatHistoryCursorDTO
+    limit: conint(ge=1) = 30
+
+
+class ListChatHistoryDTOOutput(BaseModel):
+    messages: t.List[ChatMessageDTO]
+    has_more: bool
+
+
+class ListChatHistoryUseCase:
+    MAX_LIMIT = 100
+
+    def __init__(
+        self,
+        chat_rooms_repository: ChatRoomRepository,
+        chat_messages_repository: ChatMessagesRepository,
+    ):
+        self.chat_rooms_repository = chat_rooms_repository
+        self.chat_messages_repository = chat_messages_repository
+
+    def execute(self, dto: ListChatHistoryDTOInput) -> ListChatHistoryDTOOutput:
+        """
+        @raise OrderObjectiveNotExists if users do not share an order
+        """
+        chat_room = self.chat_rooms_repository.get_chat_room(
+            user_id=dto.user_id,
+            user_id_2=dto.receiver_id,
+            role=dto.role
+        )
+        limit = min(dto.limit, self.MAX_LIMIT)
+
+        messages = self.chat_messages_repository.list_page_by_users_pair(
+            client_id=chat_room.client_id,
+            booster_id=chat_room.booster_id,
+            limit=limit + 1,
+            before=(dto.before.created_at, dto.before.id)
+        )
+
+        return ListChatHistoryDTOOutput(
+            messages=list(map(encode_message, messages[-limit:])),
+            has_more=len(messages) > limit
+        )
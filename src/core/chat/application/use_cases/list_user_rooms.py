@@ -11,6 +11,7 @@ from core.utils.map_by_key import map_by_key
 class ListUserRoomsDTOInput(BaseModel):
     role: ChatRole
     user_id: int
+    messages_limit: int = 30
 
 
 class ChatSideDTO(BaseModel):
@@ -20,6 +21,7 @@ class ChatSideDTO(BaseModel):
 
 
 class ChatMessageDTO(BaseModel):
+    id: t.Optional[int]
     message: str
     created_at: dt.datetime
     sender_id: int
@@ -30,6 +32,8 @@ class ChatRoomDTO(BaseModel):
     client: ChatSideDTO
     booster: ChatSideDTO
     messages: t.List[ChatMessageDTO]
+    unread_count: int = 0
+    has_more: bool = False
 
 
 class ListUserRoomsDTOOutput(BaseModel):
@@ -52,14 +56,20 @@ class ListUserRoomsUseCase:
 
         unique_ids = set()
 
+        messages_by_pair = self.chat_messages_repository.list_last_by_users_pairs(
+            [(room.client_id, room.booster_id) for room in rooms],
+            limit=dto.messages_limit + 1
+        )
+
+        has_more = []
         for room in rooms:
             unique_ids.add(room.client_id)
             unique_ids.add(room.booster_id)
-            messages = self.chat_messages_repository.list_messages_by_users_pair(
-                client_id=room.client_id,
-                booster_id=room.booster_id
-            )
-            room.messages = messages
+            messages = messages_by_pair[(room.client_id, room.booster_id)]
+            has_more.append(len(messages) > dto.messages_limit)
+            room.messages = messages[-dto.messages_limit:]
+
+        unread = self.chat_messages_repository.count_unread_by_senders(dto.user_id)
 
         chat_sides = map_by_key(
             self.users_repository.list_by_ids(list(unique_ids)),
@@ -68,7 +78,7 @@ class ListUserRoomsUseCase:
 
         result = ListUserRoomsDTOOutput(rooms=[])
 
-        for room in rooms:
+        for room, room_has_more in zip(rooms, has_more):
             client = chat_sides[room.client_id]
             booster = chat_sides[room.booster_id]
 
@@ -84,7 +94,9 @@ class ListUserRoomsUseCase:
                         username=booster.username,
                         id=booster.id
                     ),
-                    messages=list(map(encode_message, room.messages))
+                    messages=list(map(encode_message, room.messages)),
+                    unread_count=unread.get(booster.id if dto.user_id == client.id else client.id, 0),
+                    has_more=room_has_more
                 )
             )
         return result
@@ -92,6 +104,7 @@ class ListUserRoomsUseCase:
 
 def encode_message(message: ChatMessage) -> ChatMessageDTO:
     return ChatMessageDTO(
+        id=message.id,
         message=message.text,
         created_at=message.created_at,
         receiver_id=message.receiver_id,
@@ -0,0 +1,112 @@
+import collections
+import contextlib
+import logging
+import typing as t
+
+from pydantic import BaseModel
+
+from core.application.dtos.notifications.event_notifications import EventChatMessageDTO
+from core.application.repositories import EventNotificationRepository
+from core.chat.application.repository import ChatMessagesRepository
+from core.chat.application.use_cases.create_chat_message import CreateChatMessageDTOOutput
+from core.chat.domain.chat_room import ChatMessage
+from core.clients.application.repository import ClientsRepository
+from core.clients.domain.client import Client
+from core.order.application.repository import MQEventsRepository
+from core.utils.map_by_key import map_by_key
+
+logger = logging.getLogger(__name__)
+
+
+class PersistChatMessagesDTOInput(BaseModel):
+    messages: t.List[CreateChatMessageDTOOutput]
+
+
+class PersistChatMessagesDTOOutput(BaseModel):
+    created: int
+    notified_receivers: int
+
+
+class PersistChatMessagesUseCase:
+    """
+    Writes batch of already broadcasted messages and notifies every receiver once per batch
+    """
+
+    def __init__(
+        self,
+        chat_messages_repository: ChatMessagesRepository,
+        event_repository: EventNotificationRepository,
+        users_repository: ClientsRepository,
+        events_repository: MQEventsRepository,
+        savepoint: t.Callable[[], t.ContextManager] = contextlib.nullcontext
+    ):
+        # failed notification of receiver is rolled back to it, written messages are kept
+        self.savepoint = savepoint
+        self.events_repository = events_repository
+        self.event_repository = event_repository
+        self.chat_messages_repository = chat_messages_repository
+        self.users_repository = users_repository
+
+    def execute(self, dto: PersistChatMessagesDTOInput) -> PersistChatMessagesDTOOutput:
+        messages = [
+            ChatMessage(
+                sender_id=message.sender_id,
+                receiver_id=message.receiver_id,
+                created_at=message.created_at,
+                text=message.text
+            ) for message in dto.messages
+        ]
+        self.chat_messages_repository.create_bulk(messages)
+
+        by_receiver = collections.defaultdict(list)
+        for message in messages:
+            by_receiver[message.receiver_id].append(message)
+
+        users = map_by_key(
+            self.users_repository.list_by_ids(
+                list({m.sender_id for m in messages} | {m.receiver_id for m in messages})
+            ),
+            'id'
+        )
+
+        notified = 0
+        for receiver_id, receiver_messages in by_receiver.items():
+            receiver = users.get(receiver_id)
+            if receiver is None:
+                logger.warning(f"Chat messages receiver {receiver_id} is not found, not notified")
+                continue
+
+            # messages are written already, failed notification must not fail the batch
+            try:
+                with self.savepoint():
+                    self._notify(receiver, receiver_messages, users)
+            except Exception as e:
+                logger.exception(f"Chat messages receiver {receiver_id} is not notified: {e}")
+            else:
+                notified += 1
+
+        return PersistChatMessagesDTOOutput(created=len(messages), notified_receivers=notified)
+
+    def _notify(self, receiver: Client, messages: t.List[ChatMessage], users: t.Dict[int, Client]):
+        senders = [users[sender_id] for sender_id in dict.fromkeys(m.sender_id for m in messages)]
+        last_sender = users[messages[-1].sender_id]
+
+        if receiver.can_send_email_chat_notification():
+            logger.info("Message may be sent to client, sending")
+            self.events_repository.new_message_send(
+                from_message=last_sender.username,
+                user_email=receiver.email
+            )
+            receiver.set_message_sent()
+            self.users_repository.save(receiver)
+
+        self.events_repository.new_message_push_send(
+            receiver_id=receiver.id,
+            message=messages[-1].text
+        )
+
+        self.event_repository.chat_message(EventChatMessageDTO(
+            text='\n'.join(m.text for m in messages),
+            from_=', '.join(str(sender.username or sender.id) for sender in senders),
+            to_=receiver.username or receiver.id
+        ))
@@ -0,0 +1,98 @@
+import datetime as dt
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.application.repositories import EventNotificationRepository
+from core.chat.application.repository import ChatMessagesRepository
+from core.chat.application.use_cases.create_chat_message import CreateChatMessageDTOOutput
+from core.chat.application.use_cases.persist_chat_messages import (
+    PersistChatMessagesDTOInput,
+    PersistChatMessagesUseCase,
+)
+from core.chat.domain.chat_room import ChatRole
+from core.clients.application.repository import ClientsRepository
+from core.clients.domain.client import Client
+from core.order.application.repository import MQEventsRepository
+
+CLIENT_ID, BOOSTER_ID, BOOSTER_2_ID = 1, 2, 3
+
+
+@pytest.fixture()
+def users():
+    return [
+        Client(_id=CLIENT_ID, email='client@test.com', username='client'),
+        Client(
+            _id=BOOSTER_ID, email='booster@test.com', username='booster',
+            last_chat_message_send_at=dt.datetime.now(tz=dt.timezone.utc)
+        ),
+        Client(_id=BOOSTER_2_ID, email='booster2@test.com', username='booster2'),
+    ]
+
+
+@pytest.fixture()
+def uc(users):
+    users_repository = MagicMock(spec=ClientsRepository)
+    users_repository.list_by_ids = MagicMock(return_value=users)
+    return PersistChatMessagesUseCase(
+        chat_messages_repository=MagicMock(spec=ChatMessagesRepository),
+        event_repository=MagicMock(spec=EventNotificationRepository),
+        users_repository=users_repository,
+        events_repository=MagicMock(spec=MQEventsRepository)
+    )
+
+
+def make_message(sender_id: int, receiver_id: int, text: str) -> CreateChatMessageDTOOutput:
+    return CreateChatMessageDTOOutput(
+        sender_id=sender_id,
+        receiver_id=receiver_id,
+        created_at=dt.datetime.now(tz=dt.timezone.utc),
+        text=text,
+        role=ChatRole.client if sender_id == CLIENT_ID else ChatRole.booster
+    )
+
+
+def test_messages_are_created_in_bulk_and_notifications_coalesced(uc):
+    result = uc.execute(PersistChatMessagesDTOInput(messages=[
+        make_message(BOOSTER_ID, CLIENT_ID, 'first'),
+        make_message(CLIENT_ID, BOOSTER_ID, 'reply'),
+        make_message(BOOSTER_2_ID, CLIENT_ID, 'second'),
+        make_message(BOOSTER_ID, CLIENT_ID, 'third'),
+    ]))
+
+    assert result.created == 4
+    assert result.notified_receivers == 2
+
+    uc.chat_messages_repository.create_bulk.assert_called_once()
+    created, = uc.chat_messages_repository.create_bulk.call_args[0]
+    assert [m.text for m in created] == ['first', 'reply', 'second', 'third']
+
+    # booster got an email less than an hour ago
+    uc.events_repository.new_message_send.assert_called_once_with(
+        from_message='booster', user_email='client@test.com'
+    )
+    uc.users_repository.save.assert_called_once()
+    assert uc.events_repository.new_message_push_send.call_count == 2
+    uc.events_repository.new_message_push_send.assert_any_call(receiver_id=CLIENT_ID, message='third')
+
+    client_event = uc.event_repository.chat_message.call_args_list[0][0][0]
+    assert client_event.text == 'first\nsecond\nthird'
+    assert client_event.from_ == 'booster, booster2'
+    assert client_event.to_ == 'client'
+
+
+def test_failed_notification_does_not_fail_batch(uc, users):
+    # booster was deleted after the messages were broadcasted
+    uc.users_repository.list_by_ids.return_value = [u for u in users if u.id != BOOSTER_ID]
+    uc.events_repository.new_message_push_send.side_effect = [Exception('broker is down'), None]
+
+    result = uc.execute(PersistChatMessagesDTOInput(messages=[
+        make_message(CLIENT_ID, BOOSTER_ID, 'to deleted'),
+        make_message(CLIENT_ID, BOOSTER_2_ID, 'not pushed'),
+        make_message(BOOSTER_2_ID, CLIENT_ID, 'pushed'),
+    ]))
+
+    assert result.created == 3
+    assert result.notified_receivers == 1
+    uc.chat_messages_repository.create_bulk.assert_called_once()
+    uc.events_repository.new_message_push_send.assert_called_with(receiver_id=CLIENT_ID, message='pushed')
@@ -59,7 +59,9 @@ class ChatMessage:
         receiver_id: int,
         created_at: dt.datetime,
         text: str,
+        _id: t.Optional[int] = None,
     ):
+        self.id = _id
         self.text = text
         self.created_at = created_at
         self.receiver_id = receiver_id
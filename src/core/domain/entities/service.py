@@ -64,6 +64,41 @@ def service_options_price_calculator(
     return SERVICE_OPTIONS_PRICE_CALCULATOR_STRATEGIES[service.configuration_type]
 
 
+class ServicePriceTable:
+    """
+    Compiled service prices: base price and option id -> (price, old price)
+    """
+    def __init__(
+        self,
+        slug: str,
+        configuration_type: t.Optional[ConfigurationType],
+        base_price: t.Optional[Decimal],
+        options: t.Dict[int, t.Tuple[Decimal, Decimal]],
+    ):
+        self.slug = slug
+        self.configuration_type = configuration_type
+        self.base_price = base_price
+        self.options = options
+
+    def get_price(
+        self,
+        option_ids: t.Iterable[int],
+        range_options: t.Optional[CartRangeOptionsDTO],
+    ) -> t.Tuple[Decimal, Decimal]:
+        if self.configuration_type == ConfigurationType.range_select:
+            return RangeOptionsPriceCalculator.get_price([], range_options, self.base_price)
+
+        total_price = total_old_price = self.base_price if self.base_price else 0
+
+        for option_id in option_ids:
+            prices = self.options.get(option_id)
+            if prices:
+                total_price += prices[0]
+                total_old_price += prices[1]
+
+        return total_price, total_old_price
+
+
 class Service(IService):
     price_resolver: t.Optional[ServicePriceCalculatorStrategy]
 
@@ -1,6 +1,8 @@
 import abc
+import datetime as dt
 import typing as t
 
+from core.order.domain.consts import OrderObjectiveStatus
 from core.order.domain.order import ClientOrder, ClientOrderObjective
 from core.shopping_cart.domain.types import ShoppingCartId
 
@@ -54,6 +56,37 @@ class OrderObjectiveRepository(abc.ABC):
     def save(self, order: ClientOrderObjective):
         pass
 
+    @abc.abstractmethod
+    def save_many(self, orders: t.List[ClientOrderObjective]):
+        pass
+
+    @abc.abstractmethod
+    def assign_booster(self, order: ClientOrderObjective) -> bool:
+        """
+        Saves booster and status of objective only if it has no booster yet
+        @return False if other booster was first
+        """
+        pass
+
+    def transition_many(self, orders: t.List[ClientOrderObjective], trigger: str):
+        """
+        Triggers transition on every objective, saves them at once and runs `after` callbacks once saved
+        @raise MachineError if transition is not allowed from objective status
+        """
+        for order in orders:
+            order.defer_tasks()
+        try:
+            for order in orders:
+                getattr(order, trigger)()
+            self.save_many(orders)
+        except Exception:
+            for order in orders:
+                order.discard_deferred_tasks()
+            raise
+
+        for order in orders:
+            order.run_deferred_tasks()
+
     @abc.abstractmethod
     def get_by_user_and_id(self, order_objective_id: str, client_id: int) -> ClientOrderObjective:
         pass
@@ -74,10 +107,62 @@ class OrderObjectiveRepository(abc.ABC):
     def count_orders_in_progress(self) -> int:
         pass
 
+    @abc.abstractmethod
+    def count_by_status(self) -> t.Dict[OrderObjectiveStatus, int]:
+        pass
+
     @abc.abstractmethod
     def list_pending_approval_orders(self) -> t.List[ClientOrderObjective]:
         pass
 
+    @abc.abstractmethod
+    def list_pending_approval_keys(
+        self,
+        changed_before: dt.datetime,
+        after: t.Optional[t.Tuple[dt.datetime, str]],
+        limit: int
+    ) -> t.List[t.Tuple[dt.datetime, str]]:
+        """
+        Keyset page of (status_changed_at, id) of objectives pending approval since before changed_before
+        """
+        pass
+
+    @abc.abstractmethod
+    def transition_bulk(self, order_objective_ids: t.List[str], trigger: str, changed_at: dt.datetime) -> int:
+        """
+        Applies trigger to objectives which are in its source state, returns count of transited objectives
+        @raise ValueError if trigger is unknown or has callbacks
+        """
+        pass
+
+
+class OrderObjectiveStatusCountersRepository(abc.ABC):
+    """
+    Objectives count by status, kept up to date on transitions and reconciled with the database periodically
+    """
+    @abc.abstractmethod
+    def move(
+        self,
+        from_status: t.Optional[OrderObjectiveStatus],
+        to_status: t.Optional[OrderObjectiveStatus],
+        count: int = 1
+    ):
+        """
+        Moves `count` objectives between statuses, None stands for created or deleted objectives
+        """
+        pass
+
+    @abc.abstractmethod
+    def get(self, statuses: t.List[OrderObjectiveStatus]) -> t.Optional[t.Dict[OrderObjectiveStatus, int]]:
+        """
+        Returns None if counters are not reconciled yet or not available
+        """
+        pass
+
+    @abc.abstractmethod
+    def reset(self, counts: t.Dict[OrderObjectiveStatus, int]):
+        pass
+
 
 class MQEventsRepository(abc.ABC):
 
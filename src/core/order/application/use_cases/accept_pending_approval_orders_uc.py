@@ -3,6 +3,8 @@ import logging
 from dataclasses import dataclass
 
 from core.order.application.repository import OrderObjectiveRepository
+from core.order.domain.order import AUTO_ACCEPT_AFTER
+from core.order.domain.order_states import OrderObjectiveStatusSM
 
 logger = logging.getLogger(__name__)
 
@@ -12,18 +14,40 @@ class AcceptPendingApprovalOrdersDTORequest:
     now: dt.datetime
 
 
+@dataclass
+class AcceptPendingApprovalOrdersDTOResponse:
+    accepted: int
+
+
 class AcceptPendingApprovalOrdersUseCase:
+    BATCH_SIZE = 500
+
     def __init__(
         self,
         order_objectives_repository: OrderObjectiveRepository
     ):
         self.order_objectives_repository = order_objectives_repository
 
-    def execute(self, dto: AcceptPendingApprovalOrdersDTORequest):
-        objectives = self.order_objectives_repository.list_pending_approval_orders()
-
-        for o in objectives:
-            if o.must_be_auto_accepted(dto.now):
-                logger.info(f"Order objective: {o.id} must be accepted")
-                o.completed()
-                self.order_objectives_repository.save(o)
+    def execute(self, dto: AcceptPendingApprovalOrdersDTORequest) -> AcceptPendingApprovalOrdersDTOResponse:
+        changed_before = dto.now - AUTO_ACCEPT_AFTER
+        accepted = 0
+        after = None
+
+        while True:
+            keys = self.order_objectives_repository.list_pending_approval_keys(
+                changed_before, after, self.BATCH_SIZE
+            )
+            if not keys:
+                break
+
+            accepted += self.order_objectives_repository.transition_bulk(
+                [_id for _, _id in keys], OrderObjectiveStatusSM.SET_COMPLETED, dto.now
+            )
+            after = keys[-1]
+
+            if len(keys) < self.BATCH_SIZE:
+                break
+
+        if accepted:
+            logger.info(f"Order objectives auto accepted: {accepted}")
+        return AcceptPendingApprovalOrdersDTOResponse(accepted=accepted)
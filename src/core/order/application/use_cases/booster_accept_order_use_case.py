@@ -5,6 +5,7 @@ from core.application.repositories.notifications import BoosterAssignedNotificat
 from core.boosters.application.repository import BoostersRepository
 from core.boosters.domain.entities import Booster
 from core.order.application.repository import OrderObjectiveRepository
+from core.order.domain.exceptions import OrderIsAlreadyAccepted
 from core.order.domain.order import ClientOrderObjective
 
 
@@ -43,8 +44,10 @@ class BoosterAcceptOrderUseCase:
         booster_profile = self.boosters_repository.get_by_user_id(dto.booster_user_id)
         order_objective = self.order_objectives_repository.get_by_id(dto.order_objective_id)
         order_objective.assign_booster(booster_profile.id)
+        if not self.order_objectives_repository.assign_booster(order_objective):
+            raise OrderIsAlreadyAccepted()
+
         self.event_notifications_repository.booster_assigned(get_event_notification_repository_dto(
             booster_profile, order_objective
         ))
-        self.order_objectives_repository.save(order_objective)
 
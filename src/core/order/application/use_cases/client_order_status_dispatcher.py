@@ -1,10 +1,11 @@
 import enum
+import typing as t
 
 from pydantic import BaseModel
 
 from core.order.application.repository import OrderObjectiveRepository
 from core.order.domain.consts import OrderObjectiveStatus
-from core.order.domain.order import ClientOrderObjective
+from core.order.domain.order_states import OrderObjectiveStatusSM
 
 
 class ClientStatusDispatcherAction(str, enum.Enum):
@@ -36,35 +37,24 @@ class OrderStatusDispatcher:
     ):
         self.order_objectives_repository = order_objective_repository
 
-    def set_next_status_by_action(
-        self,
-        order_objective: ClientOrderObjective,
-        action: ClientStatusDispatcherAction
-    ):
-        if action == ClientStatusDispatcherAction.approve_order:
-            order_objective.completed()
-        elif action == ClientStatusDispatcherAction.accept_order:
-            order_objective.booster_accepted()
-        elif (
-            action == ClientStatusDispatcherAction.booster_signed_in or
-            action == ClientStatusDispatcherAction.booster_unpause
-        ):
-            order_objective.in_progress()
-        elif action == ClientStatusDispatcherAction.booster_invalid_credentials:
-            order_objective.invalid_credentials()
-        elif action == ClientStatusDispatcherAction.booster_required_2_fa:
-            order_objective.required_2fa_code()
-        elif action == ClientStatusDispatcherAction.booster_pause_order:
-            order_objective.pause_booster()
-        elif action == ClientStatusDispatcherAction.booster_order_completed:
-            order_objective.status = OrderObjectiveStatus.PENDING_APPROVAL
-            self.order_objectives_repository.save(order_objective)
-            order_objective.pending_approval()
+    @staticmethod
+    def get_trigger_by_action(action: ClientStatusDispatcherAction) -> t.Optional[str]:
+        return {
+            ClientStatusDispatcherAction.approve_order: OrderObjectiveStatusSM.SET_COMPLETED,
+            ClientStatusDispatcherAction.accept_order: OrderObjectiveStatusSM.SET_BOOSTER_ACCEPTED,
+            ClientStatusDispatcherAction.booster_signed_in: OrderObjectiveStatusSM.SET_IN_PROGRESS,
+            ClientStatusDispatcherAction.booster_unpause: OrderObjectiveStatusSM.SET_IN_PROGRESS,
+            ClientStatusDispatcherAction.booster_invalid_credentials: OrderObjectiveStatusSM.SET_INVALID_CREDENTIALS,
+            ClientStatusDispatcherAction.booster_required_2_fa: OrderObjectiveStatusSM.SET_REQUIRED_2FA_CODE,
+            ClientStatusDispatcherAction.booster_pause_order: OrderObjectiveStatusSM.SET_PAUSE_BOOSTER,
+            ClientStatusDispatcherAction.booster_order_completed: OrderObjectiveStatusSM.SET_PENDING_APPROVAL,
+        }.get(action)
 
     def execute(self, dto: OrderStatusDispatcherDTORequest):
         objective = self.order_objectives_repository.get_by_user_and_id(dto.order_objective_id, dto.client_id)
-        self.set_next_status_by_action(objective, dto.action)
-        self.order_objectives_repository.save(objective)
+        trigger = self.get_trigger_by_action(dto.action)
+        if trigger is not None:
+            self.order_objectives_repository.transition_many([objective], trigger)
 
         return OrderStatusDispatcherDTOOutput(
             status=objective.status
@@ -1,4 +1,7 @@
+import functools
+import logging
 import typing as t
+from concurrent.futures import ThreadPoolExecutor, wait
 from decimal import Decimal
 
 from pydantic import BaseModel
@@ -18,12 +21,24 @@ from core.utils.map_by_key import map_by_key
 from notificators.discord import _get_channels_category
 from notificators.new_email import DjangoEmailNotificator, NewOrderCreatedNotification
 
+logger = logging.getLogger(__name__)
+
 
 class OrderCreatedNotificationsUseCaseDTOInput(BaseModel):
     client_order_id: str
 
 
+class OrderCreatedNotificationsUseCaseDTOOutput(BaseModel):
+    failed_targets: t.List[str]
+
+
 class OrderCreatedNotificationsUseCase:
+    """
+    Notifications are sent concurrently, a failed or timed out target does not stop the others
+    """
+    MAX_WORKERS = 8
+    SEND_TIMEOUT = 20
+
     def __init__(
         self,
         event_notifications_repository: EventNotificationRepository,
@@ -121,7 +136,28 @@ class OrderCreatedNotificationsUseCase:
         )
         self.order_executors_repository.order_created(dto)
 
-    def execute(self, dto: OrderCreatedNotificationsUseCaseDTOInput):
+    def dispatch(self, sends: t.Dict[str, t.Callable[[], None]]) -> t.List[str]:
+        """
+        Runs sends concurrently, returns targets which failed or did not finish in SEND_TIMEOUT
+        """
+        executor = ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(sends)))
+        try:
+            futures = {executor.submit(send): target for target, send in sends.items()}
+            done, not_done = wait(futures, timeout=self.SEND_TIMEOUT)
+        finally:
+            executor.shutdown(wait=False)
+
+        failed_targets = []
+        for future, target in futures.items():
+            if future in not_done:
+                logger.error(f'Order created notification to {target} is timed out')
+                failed_targets.append(target)
+            elif future.exception() is not None:
+                logger.error(f'Order created notification to {target} is failed', exc_info=future.exception())
+                failed_targets.append(target)
+        return failed_targets
+
+    def execute(self, dto: OrderCreatedNotificationsUseCaseDTOInput) -> OrderCreatedNotificationsUseCaseDTOOutput:
         order = self.client_orders_repository.get_by_id(dto.client_order_id)
         objectives = self.order_objectives_repository.get_by_order(order.id)
 
@@ -138,6 +174,7 @@ class OrderCreatedNotificationsUseCase:
         services = self.services_map(self.services_repository.list_by_client_order(order.id))
         service_configs = self.service_configs_repository.map_by_client_order(order.id)
 
+        sends = {}
         for obj in objectives:
             service = services.get(obj.service_slug)
             configs = service_configs.get(obj.service_slug, [])
@@ -151,7 +188,8 @@ class OrderCreatedNotificationsUseCase:
             profile = profiles.get(obj.destiny_profile_id)
             character = characters.get(obj.destiny_character_id)
 
-            self.event_notifications_repository.new_order_created(
+            sends[f'events:{obj.id}'] = functools.partial(
+                self.event_notifications_repository.new_order_created,
                 self._make_event_order_created_dto(
                     service=service,
                     order=order,
@@ -162,7 +200,8 @@ class OrderCreatedNotificationsUseCase:
                     character=character
                 )
             )
-            self.send_order_executors_notifications(
+            sends[f'executors:{obj.id}'] = functools.partial(
+                self.send_order_executors_notifications,
                 service=service,
                 order=order,
                 order_objective=obj,
@@ -170,11 +209,12 @@ class OrderCreatedNotificationsUseCase:
                 profile=profile
             )
 
-        self.send_email(
+        sends['email'] = functools.partial(
+            self.send_email,
             order=order,
             order_objectives=objectives,
             services=services,
             client=client
         )
 
-
+        return OrderCreatedNotificationsUseCaseDTOOutput(failed_targets=self.dispatch(sends))
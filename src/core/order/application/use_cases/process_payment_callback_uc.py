@@ -3,6 +3,7 @@ from pydantic import BaseModel
 
 from core.order.application.repository import ClientOrderRepository, OrderObjectiveRepository
 from core.order.domain.order import ClientOrderStatus
+from core.order.domain.order_states import OrderObjectiveStatusSM
 
 
 class ProcessPaymentCallbackDTORequest(BaseModel):
@@ -26,8 +27,6 @@ class ProcessPaymentCallbackUseCase:
         order.order_status = ClientOrderStatus.PAYED
         order.order_status_changed_at = dt.datetime.now()
 
-        for objective in objectives:
-            objective.processing()
-            self.order_objectives_repository.save(objective)
+        self.order_objectives_repository.transition_many(objectives, OrderObjectiveStatusSM.SET_PROCESSING)
         self.client_orders_repository.save(order)
 
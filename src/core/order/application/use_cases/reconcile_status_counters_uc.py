@@ -0,0 +1,28 @@
+import logging
+
+from core.order.application.repository import OrderObjectiveRepository, OrderObjectiveStatusCountersRepository
+from core.order.domain.consts import OrderObjectiveStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ReconcileOrderObjectiveStatusCountersUseCase:
+    def __init__(
+        self,
+        order_objectives_repository: OrderObjectiveRepository,
+        status_counters_repository: OrderObjectiveStatusCountersRepository
+    ):
+        self.order_objectives_repository = order_objectives_repository
+        self.status_counters_repository = status_counters_repository
+
+    def execute(self):
+        counts = self.order_objectives_repository.count_by_status()
+        counts = {status: counts.get(status, 0) for status in OrderObjectiveStatus}
+
+        counted = self.status_counters_repository.get(list(OrderObjectiveStatus))
+        if counted is not None:
+            drift = {status: count - counts[status] for status, count in counted.items() if count != counts[status]}
+            if drift:
+                logger.warning(f'Order objectives status counters drift: {drift}')
+
+        self.status_counters_repository.reset(counts)
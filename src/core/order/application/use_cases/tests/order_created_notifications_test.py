@@ -1,8 +1,10 @@
+import threading
 from unittest.mock import MagicMock, Mock
 
 import pytest
 
 from core.application.repositories import EventNotificationRepository
+from core.application.repositories.notifications import OrderExecutorsNotificationRepository
 from core.application.repositories.services import ServiceConfigsRepository, ServiceRepository
 from core.bungie.repositories import DestinyBungieCharacterRepository, DestinyBungieProfileRepository
 from core.clients.application.repository import ClientsRepository
@@ -25,7 +27,8 @@ def uc():
         destiny_bungie_profile_repository=Mock(spec=DestinyBungieProfileRepository),
         destiny_character_repository=Mock(spec=DestinyBungieCharacterRepository),
         clients_repository=Mock(spec=ClientsRepository),
-        email_notificator=Mock(spec=DjangoEmailNotificator)
+        email_notificator=Mock(spec=DjangoEmailNotificator),
+        order_executors_repository=Mock(spec=OrderExecutorsNotificationRepository)
     )
 
 
@@ -77,3 +80,34 @@ def test_send_order_created_message(
     setup_uc.execute(dto)
 
     setup_uc.client_orders_repository.get_by_id.assert_called_with(dto.client_order_id)
+
+
+def test_send_order_created_partially_failed(
+    setup_uc,
+    created_order_objective,
+    service_config
+):
+    created_order_objective.selected_option_ids = [service_config.id]
+    setup_uc.order_executors_repository.order_created.side_effect = ConnectionError()
+
+    result = setup_uc.execute(OrderCreatedNotificationsUseCaseDTOInput(client_order_id='some-id'))
+
+    assert result.failed_targets == [f'executors:{created_order_objective.id}']
+    setup_uc.event_notifications_repository.new_order_created.assert_called_once()
+    setup_uc.email_notificator.send_order_created.assert_called_once()
+
+
+def test_send_order_created_timed_out(
+    setup_uc,
+    created_order_objective,
+    service_config
+):
+    created_order_objective.selected_option_ids = [service_config.id]
+    sent = threading.Event()
+    setup_uc.SEND_TIMEOUT = 0.1
+    setup_uc.order_executors_repository.order_created.side_effect = lambda dto: sent.wait(1)
+
+    result = setup_uc.execute(OrderCreatedNotificationsUseCaseDTOInput(client_order_id='some-id'))
+    sent.set()
+
+    assert result.failed_targets == [f'executors:{created_order_objective.id}']
@@ -2,6 +2,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from core.application.repositories import EventNotificationRepository
 from core.order.application.use_cases.booster_accept_order_use_case import (
     BoosterAcceptOrderDTORequest,
     BoosterAcceptOrderUseCase,
@@ -16,7 +17,8 @@ def uc(
 ):
     return BoosterAcceptOrderUseCase(
         boosters_repository_mock,
-        order_objectives_repository_mock
+        order_objectives_repository_mock,
+        MagicMock(spec=EventNotificationRepository)
     )
 
 
@@ -37,11 +39,13 @@ def setup_mocks(
 ):
     boosters_repository_mock.get_by_user_id = MagicMock(return_value=booster)
     order_objectives_repository_mock.get_by_id = MagicMock(return_value=order_objective_mock)
-    order_objectives_repository_mock.save = MagicMock()
+    order_objectives_repository_mock.assign_booster = MagicMock(return_value=True)
 
 
 @pytest.fixture()
 def objective_dont_have_booster(order_objective_mock):
+    order_objective_mock.id = 'objective-id'
+    order_objective_mock.service_slug = 'service-slug'
     order_objective_mock.assign_booster = MagicMock()
 
 
@@ -62,10 +66,26 @@ def test_positive_booster_accept_order(
     uc.execute(dto)
 
     order_objective_mock.assign_booster.assert_called_once_with(booster.id)
-    order_objectives_repository_mock.save.assert_called_once_with(order_objective_mock)
+    order_objectives_repository_mock.assign_booster.assert_called_once_with(order_objective_mock)
+    uc.event_notifications_repository.booster_assigned.assert_called_once()
 
 
 def test_order_already_taken(uc, dto, setup_mocks, objective_has_booster, order_objective_mock, booster):
     with pytest.raises(OrderIsAlreadyAccepted):
         uc.execute(dto)
         order_objective_mock.assign_booster.assert_called_once_with(booster.id)
+
+
+def test_order_taken_concurrently(
+    uc,
+    dto,
+    setup_mocks,
+    objective_dont_have_booster,
+    order_objectives_repository_mock
+):
+    order_objectives_repository_mock.assign_booster.return_value = False
+
+    with pytest.raises(OrderIsAlreadyAccepted):
+        uc.execute(dto)
+
+    uc.event_notifications_repository.booster_assigned.assert_not_called()
@@ -11,6 +11,9 @@ from core.order.domain.order_states import OrderObjectiveStateMachineMixin
 from core.shopping_cart.domain.exceptions import CartCashbackNotApplied
 from profiles.constants import Membership
 
+# completed objectives pending client approval for longer are accepted automatically
+AUTO_ACCEPT_AFTER = dt.timedelta(days=2)
+
 
 class ClientOrderStatus(str, enum.Enum):
     AWAIT_PAYMENT = 'AWAIT_PAYMENT'
@@ -70,7 +73,7 @@ class ClientOrderObjective(OrderObjectiveStateMachineMixin):
         if not self.status == OrderObjectiveStatus.PENDING_APPROVAL:
             return False
         else:
-            will_be_accepted_at = self.status_changed_at + dt.timedelta(days=2)
+            will_be_accepted_at = self.status_changed_at + AUTO_ACCEPT_AFTER
             return will_be_accepted_at <= at
 
     def get_booster_price(self, booster_percent: Decimal):
@@ -1,7 +1,10 @@
+from functools import partial
+
 from django.utils.timezone import now
 from django_transitions.workflow import StateMachineMixinBase, StatusBase
 
-from transitions import Machine
+from transitions import Machine, MachineError
+from transitions.core import listify
 
 
 class OrderObjectiveStatusSM(StatusBase):
@@ -163,6 +166,52 @@ class OrderObjectiveStatusSM(StatusBase):
         }
     ]
 
+    @classmethod
+    def get_transition(cls, trigger: str) -> dict:
+        """
+        @raise ValueError if trigger is not defined
+        """
+        for transition in cls.SM_TRANSITIONS:
+            if transition['trigger'] == trigger:
+                return transition
+        raise ValueError(f'Unknown transition: {trigger}')
+
+
+class TransitionTable:
+    """
+    Precomputed (state, trigger) -> (dest, after callbacks) of status class transitions.
+    Alternative to `transitions.Machine` for models which only need triggers: no event objects
+    or callbacks resolution per call, `after_state_change` callback is called the same way.
+    """
+
+    def __init__(self, status_class, after_state_change: str = None):
+        self.after_state_change = after_state_change
+        self.table = {}
+        for transition in status_class.SM_TRANSITIONS:
+            sources = status_class.SM_STATES if transition['source'] == '*' else listify(transition['source'])
+            for source in sources:
+                self.table.setdefault(
+                    (source, transition['trigger']),
+                    (transition['dest'], tuple(listify(transition.get('after', []))))
+                )
+        self.triggers = {trigger for _, trigger in self.table}
+
+    def trigger(self, model, trigger: str) -> bool:
+        """
+        @raise MachineError if trigger is not allowed from model state
+        """
+        try:
+            dest, after = self.table[(model.state, trigger)]
+        except KeyError:
+            raise MachineError(f"Can't trigger event {trigger} from state {model.state}!")
+
+        model.state = dest
+        for callback in after:
+            getattr(model, callback)()
+        if self.after_state_change:
+            getattr(model, self.after_state_change)()
+        return True
+
 
 def get_state_machine(notifier):
     m = Machine(
@@ -184,6 +233,22 @@ class OrderObjectiveStateMachineMixin(StateMachineMixinBase):
         **status_class.get_kwargs()  # noqa: C815
     )
 
+    # transitions backend, triggers are resolved by `machine` when it is not set
+    transition_table = None
+
+    def __getattribute__(self, item):
+        try:
+            return object.__getattribute__(self, item)
+        except AttributeError:
+            table = type(self).transition_table
+            if table is not None and item in table.triggers:
+                return partial(table.trigger, self, item)
+            return super().__getattribute__(item)
+
+    @classmethod
+    def use_transition_table(cls):
+        cls.transition_table = TransitionTable(cls.status_class, after_state_change='status_updated')
+
     @property
     def state(self):
         """Get the items workflowstate or the initial state if none is set."""
@@ -197,21 +262,48 @@ class OrderObjectiveStateMachineMixin(StateMachineMixinBase):
         self.status = value
         return self.status
 
+    # callbacks are collected here instead of running while tasks are deferred
+    _deferred_tasks = None
+
+    def defer_tasks(self):
+        """Collect `after` callbacks until run_deferred_tasks, e.g. until the new status is written."""
+        self._deferred_tasks = []
+
+    def run_deferred_tasks(self):
+        tasks, self._deferred_tasks = self._deferred_tasks or [], None
+        for task in tasks:
+            task()
+
+    def discard_deferred_tasks(self):
+        self._deferred_tasks = None
+
+    def _run_task(self, task):
+        if self._deferred_tasks is None:
+            task()
+        else:
+            self._deferred_tasks.append(task)
+
     def status_updated(self):
         self.status_changed_at = now()
 
     def task_pending_approval(self):
+        from orders.outbox import send_task
         from orders.tasks import set_pending_approval_task
-        set_pending_approval_task.delay(order_objective_id=self.id)
+        self._run_task(lambda: send_task(set_pending_approval_task, order_objective_id=self.id))
 
     def task_order_paused(self):
+        from orders.outbox import send_task
         from orders.tasks import set_paused_task
-        set_paused_task.delay(order_objective_id=self.id, client_id=self.client_id)
+        self._run_task(lambda: send_task(set_paused_task, order_objective_id=self.id, client_id=self.client_id))
 
     def task_2fa_required(self):
+        from orders.outbox import send_task
         from orders.tasks import required_2fa_code_task
-        required_2fa_code_task.delay(client_id=self.client_id)
+        self._run_task(lambda: send_task(required_2fa_code_task, client_id=self.client_id))
 
     def task_invalid_credentials(self):
+        from orders.outbox import send_task
         from orders.tasks import invalid_credentials_task
-        invalid_credentials_task.delay(client_id=self.client_id, order_objective_id=self.id)
+        self._run_task(
+            lambda: send_task(invalid_credentials_task, client_id=self.client_id, order_objective_id=self.id)
+        )
@@ -0,0 +1,93 @@
+import datetime as dt
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from transitions import MachineError
+
+from core.order.domain.consts import OrderObjectiveStatus
+from core.order.domain.order import ClientOrderObjective
+from core.order.domain.order_states import OrderObjectiveStateMachineMixin, OrderObjectiveStatusSM, TransitionTable
+
+TRIGGERS = [t['trigger'] for t in OrderObjectiveStatusSM.SM_TRANSITIONS]
+
+
+def make_objective(status: OrderObjectiveStatus) -> ClientOrderObjective:
+    return ClientOrderObjective(
+        _id='objective-id',
+        client_order_id='order-id',
+        service_slug='service-slug',
+        destiny_character_id='character-id',
+        destiny_profile_id='profile-id',
+        selected_option_ids=[1, 2],
+        range_options=None,
+        price=Decimal(100),
+        status=status,
+        status_changed_at=dt.datetime(2020, 1, 1),
+        created_at=dt.datetime(2020, 1, 1),
+        client_id=1,
+    )
+
+
+def transition_table_backend():
+    return patch.object(
+        OrderObjectiveStateMachineMixin,
+        'transition_table',
+        TransitionTable(OrderObjectiveStatusSM, after_state_change='status_updated')
+    )
+
+
+@pytest.fixture()
+def transition_table():
+    with transition_table_backend():
+        yield
+
+
+@pytest.fixture(autouse=True)
+def calls():
+    calls = []
+    with patch.object(OrderObjectiveStateMachineMixin, '_run_task', lambda self, task: calls.append('task')), \
+            patch.object(OrderObjectiveStateMachineMixin, 'status_updated', lambda self: calls.append('updated')):
+        yield calls
+
+
+def trigger(status: OrderObjectiveStatus, trigger_name: str, calls: list):
+    objective = make_objective(status)
+    calls.clear()
+    try:
+        getattr(objective, trigger_name)()
+    except MachineError:
+        return 'not allowed', []
+    return objective.status, list(calls)
+
+
+@pytest.mark.parametrize('status', list(OrderObjectiveStatus))
+def test_same_as_machine(status, calls):
+    with_machine = {t: trigger(status, t, calls) for t in TRIGGERS}
+
+    with transition_table_backend():
+        with_table = {t: trigger(status, t, calls) for t in TRIGGERS}
+
+    assert with_table == with_machine
+
+
+def test_not_allowed(transition_table):
+    with pytest.raises(MachineError):
+        make_objective(OrderObjectiveStatus.IN_PROGRESS).completed()
+
+
+def test_benchmark_transitions(benchmark):
+    count = 2000
+
+    def construct():
+        for _ in range(count):
+            make_objective(OrderObjectiveStatus.PENDING_APPROVAL)
+
+    def transit():
+        for _ in range(count):
+            make_objective(OrderObjectiveStatus.PENDING_APPROVAL).completed()
+
+    benchmark(construct, name=f'order objectives, {count} constructed')
+    benchmark(transit, name=f'order objectives, {count} constructed and transited with machine')
+    with transition_table_backend():
+        benchmark(transit, name=f'order objectives, {count} constructed and transited with transition table')
@@ -1,3 +1,4 @@
+import datetime as dt
 import typing as t
 import abc
 
@@ -17,6 +18,17 @@ class ShoppingCartRepository(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def get_aggregate_by_id(
+        self,
+        shopping_cart_id: str,
+    ) -> ShoppingCart:
+        """
+        Load cart together with its items, their services, selected options and promo code
+        @raise ShoppingCartDoesNotExists if cart is not found
+        """
+        pass
+
     @abc.abstractmethod
     def create(
         self,
@@ -32,6 +44,37 @@ class ShoppingCartRepository(abc.ABC):
     def update(self, shopping_cart: ShoppingCart) -> t.NoReturn:
         pass
 
+    @abc.abstractmethod
+    def list_stale_ids(
+        self,
+        fetched_before: dt.datetime,
+        after_id: t.Optional[ShoppingCartId],
+        limit: int,
+    ) -> t.List[ShoppingCartId]:
+        """
+        Ids of carts not fetched since `fetched_before` which do not belong to any order, ordered by id
+        """
+        pass
+
+    @abc.abstractmethod
+    def delete_stale_bulk(
+        self,
+        shopping_cart_ids: t.List[ShoppingCartId],
+        fetched_before: dt.datetime,
+    ) -> t.Tuple[int, int]:
+        """
+        Deletes carts which are still stale together with their items and selected options
+        @return deleted carts count and total deleted rows count
+        """
+        pass
+
+    @abc.abstractmethod
+    def update_fetched_at_bulk(self, fetched_at: t.Dict[ShoppingCartId, dt.datetime]) -> t.NoReturn:
+        """
+        Moves fetched_at of carts forward, older values are ignored
+        """
+        pass
+
 
 class ShoppingCartItemRepository(abc.ABC):
 
@@ -43,6 +86,17 @@ class ShoppingCartItemRepository(abc.ABC):
     ) -> ShoppingCartItem:
         pass
 
+    @abc.abstractmethod
+    def create_bulk(
+        self,
+        items: t.List[ShoppingCartItem],
+        options: t.Dict[str, t.List[int]],
+    ) -> t.List[ShoppingCartItem]:
+        """
+        Inserts items with their selected options, options are mapped by cart item id
+        """
+        pass
+
     @abc.abstractmethod
     def get_by_shopping_cart(self, shopping_cart: ShoppingCart) -> t.List[ShoppingCartItem]:
         pass
@@ -63,3 +117,54 @@ class PromoCodeRepository(abc.ABC):
         @raise PromoCodeDoesNotExists if code not found
         """
         pass
+
+
+class ShoppingCartSnapshotRepository(abc.ABC):
+    @abc.abstractmethod
+    def get(self, shopping_cart_id: ShoppingCartId) -> t.Optional[dict]:
+        """
+        Returns serialized cart listing or None if there is no actual snapshot
+        """
+        pass
+
+    @abc.abstractmethod
+    def save(self, shopping_cart_id: ShoppingCartId, snapshot: dict) -> t.NoReturn:
+        pass
+
+    @abc.abstractmethod
+    def invalidate(self, shopping_cart_id: ShoppingCartId) -> t.NoReturn:
+        pass
+
+    @abc.abstractmethod
+    def bump_version(self) -> t.NoReturn:
+        """
+        Invalidates snapshots of all carts, e.g. when services, configs or promo codes were changed
+        """
+        pass
+
+    @abc.abstractmethod
+    def stats(self) -> t.Dict[str, int]:
+        pass
+
+
+class ShoppingCartTouchesRepository(abc.ABC):
+    """
+    Coalesces cart accesses, so carts fetched_at is not written on every read
+    """
+    @abc.abstractmethod
+    def touch(self, shopping_cart_id: ShoppingCartId) -> t.NoReturn:
+        pass
+
+    @abc.abstractmethod
+    def pop(self, limit: int) -> t.Dict[ShoppingCartId, dt.datetime]:
+        """
+        Removes and returns up to `limit` least recently touched carts with their last access time
+        """
+        pass
+
+    @abc.abstractmethod
+    def restore(self, touches: t.Dict[ShoppingCartId, dt.datetime]) -> t.NoReturn:
+        """
+        Puts back popped touches which were not flushed, newer touches of the same carts are kept
+        """
+        pass
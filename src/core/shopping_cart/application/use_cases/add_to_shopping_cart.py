@@ -1,9 +1,12 @@
 import logging
 import typing as t
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
 
-from core.application.repositories.services import ServiceConfigsRepository, ServiceRepository
+from core.application.repositories.services import (
+    ServiceConfigsRepository, ServicePriceTableRepository,
+    ServiceRepository,
+)
 from core.bungie.entities import DestinyBungieProfile, DestinyCharacter
 from core.bungie.repositories import DestinyBungieCharacterRepository, DestinyBungieProfileRepository
 from core.domain.entities.shopping_cart.exceptions import ShoppingCartDoesNotExists
@@ -50,6 +53,20 @@ class AddItemToShoppingCartDTOOutput(CartResponse):
     added: bool
 
 
+# items and their options are inserted in one request, their count is bounded
+MAX_ITEMS_ADDED = 50
+
+
+class AddItemsToShoppingCartDTOInput(BaseModel):
+    cart_id: t.Optional[ShoppingCartId]
+    adding_to_cart: conlist(ItemAddedToCart, max_items=MAX_ITEMS_ADDED)
+
+
+class AddItemsToShoppingCartDTOOutput(CartResponse):
+    cart_item_ids: t.List[str]
+    added: bool
+
+
 class AddItemToShoppingCartUseCase(ListCartItemsUseCaseMixin):
 
     def __init__(
@@ -60,7 +77,8 @@ class AddItemToShoppingCartUseCase(ListCartItemsUseCaseMixin):
         destiny_character_repository: DestinyBungieCharacterRepository,
         service_repository: ServiceRepository,
         service_configs_repository: ServiceConfigsRepository,
-        promo_code_repository: PromoCodeRepository
+        promo_code_repository: PromoCodeRepository,
+        service_price_table_repository: ServicePriceTableRepository,
     ):
         self.destiny_bungie_profile_repository = destiny_bungie_profile_repository
         self.destiny_character_repository = destiny_character_repository
@@ -72,7 +90,8 @@ class AddItemToShoppingCartUseCase(ListCartItemsUseCaseMixin):
             shopping_cart_items_repository,
             service_repository,
             service_configs_repository,
-            promo_code_repository
+            promo_code_repository,
+            service_price_table_repository
         )
 
     def _get_or_create_cart(
@@ -152,3 +171,79 @@ class AddItemToShoppingCartUseCase(ListCartItemsUseCaseMixin):
             ) if cart.promo else None
 
         )
+
+
+class AddItemsToShoppingCartUseCase(AddItemToShoppingCartUseCase):
+    """
+    Adds bundle of items, bungie entities are upserted once and cart is priced once after all items are added
+    """
+
+    def _get_or_create_cart(
+        self,
+        cart_id: t.Optional[str],
+    ) -> ShoppingCart:
+        try:
+            if not cart_id:
+                raise ShoppingCartDoesNotExists()
+
+            cart = self.shopping_cart_repository.get_by_id(cart_id)
+        except ShoppingCartDoesNotExists:
+            cart = ShoppingCart.create()
+            self.shopping_cart_repository.create(cart)
+
+        return cart
+
+    def _update_bungie_entities_bulk(self, items: t.List[ItemAddedToCart]):
+        profiles = {
+            i.bungie_profile.membership_id: DestinyBungieProfile(
+                membership_id=i.bungie_profile.membership_id,
+                username=i.bungie_profile.username,
+                membership_type=i.bungie_profile.membership_type
+            ) for i in items
+        }
+        characters = {
+            i.character.character_id: DestinyCharacter(
+                character_id=i.character.character_id,
+                character_class=i.character.character_class,
+                bungie_id=i.character.bungie_profile_id
+            ) for i in items
+        }
+
+        self.destiny_bungie_profile_repository.create_or_update_bulk(list(profiles.values()))
+        self.destiny_character_repository.create_or_update_bulk(list(characters.values()))
+
+    def execute(self, dto: AddItemsToShoppingCartDTOInput) -> AddItemsToShoppingCartDTOOutput:
+        logger.info(f'Adding {len(dto.adding_to_cart)} items to cart {dto.cart_id}')
+
+        cart = self._get_or_create_cart(dto.cart_id)
+
+        self._update_bungie_entities_bulk(dto.adding_to_cart)
+
+        cart_items = []
+        options = {}
+
+        for adding_to_cart in dto.adding_to_cart:
+            cart_item = ShoppingCartItem.create(
+                bungie_profile_id=adding_to_cart.bungie_profile.membership_id,
+                character_id=adding_to_cart.character.character_id,
+                service_slug=adding_to_cart.service_slug,
+                shopping_cart_id=cart.id,
+                range_options=adding_to_cart.range_options.dict() if adding_to_cart.range_options else None
+            )
+            cart_items.append(cart_item)
+            options[cart_item.id] = adding_to_cart.option_ids
+
+        self.shopping_cart_items_repository.create_bulk(cart_items, options)
+
+        cart = self.get_shopping_cart_by_id(cart.id)
+        total_price, total_old_price = cart.prices
+        return AddItemsToShoppingCartDTOOutput(
+            cart_id=cart.id,
+            cart_item_ids=[i.id for i in cart_items],
+            added=True,
+            total_price=total_price,
+            total_old_price=total_old_price,
+            promo_code=PromoCodeDTO.from_entity(
+                cart.promo
+            ) if cart.promo else None
+        )
@@ -1,6 +1,9 @@
 from pydantic import BaseModel
 
-from core.application.repositories.services import ServiceConfigsRepository, ServiceRepository
+from core.application.repositories.services import (
+    ServiceConfigsRepository, ServicePriceTableRepository,
+    ServiceRepository,
+)
 from core.shopping_cart.application.repository import (
     PromoCodeRepository, ShoppingCartItemRepository,
     ShoppingCartRepository,
@@ -27,13 +30,14 @@ class ApplyPromoUseCase(ListCartItemsUseCaseMixin):
         shopping_cart_items_repository: ShoppingCartItemRepository,
         service_repository: ServiceRepository,
         service_configs_repository: ServiceConfigsRepository,
-        promo_code_repository: PromoCodeRepository
+        promo_code_repository: PromoCodeRepository,
+        service_price_table_repository: ServicePriceTableRepository,
     ):
         self.promo_code_repository = promo_code_repository
         super().__init__(
             shopping_cart_repository, shopping_cart_items_repository,
             service_repository, service_configs_repository,
-            promo_code_repository
+            promo_code_repository, service_price_table_repository
         )
 
     def execute(self, dto: ApplyPromoUseCaseDTOInput):
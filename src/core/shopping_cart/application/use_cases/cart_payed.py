@@ -4,7 +4,10 @@ from decimal import Decimal
 
 from pydantic import BaseModel, EmailStr
 
-from core.application.repositories.services import ServiceConfigsRepository, ServiceRepository
+from core.application.repositories.services import (
+    ServiceConfigsRepository, ServicePriceTableRepository,
+    ServiceRepository,
+)
 from core.bungie.repositories import DestinyBungieProfileRepository
 from core.clients.application.repository import ClientCredentialsRepository, ClientsRepository
 from core.clients.domain.client import Client
@@ -50,6 +53,7 @@ class CartPayedUseCase(ListCartItemsUseCaseMixin):
         service_repository: ServiceRepository,
         service_configs_repository: ServiceConfigsRepository,
         promo_code_repository: PromoCodeRepository,
+        service_price_table_repository: ServicePriceTableRepository,
         profile_credentials_repository: ClientCredentialsRepository,
         destiny_bungie_profile_repository: DestinyBungieProfileRepository,
         events_repository: MQEventsRepository,
@@ -70,7 +74,8 @@ class CartPayedUseCase(ListCartItemsUseCaseMixin):
             cart_item_repository,
             service_repository,
             service_configs_repository,
-            promo_code_repository
+            promo_code_repository,
+            service_price_table_repository
         )
 
     def update_game_profiles_with_created_user(
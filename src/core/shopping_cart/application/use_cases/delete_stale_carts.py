@@ -0,0 +1,63 @@
+import datetime as dt
+import logging
+import time
+from dataclasses import dataclass
+
+from core.shopping_cart.application.repository import ShoppingCartRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeleteStaleShoppingCartsDTORequest:
+    now: dt.datetime
+
+
+@dataclass
+class DeleteStaleShoppingCartsDTOResponse:
+    carts_count: int
+    rows_count: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_count / self.elapsed if self.elapsed else 0
+
+
+class DeleteStaleShoppingCartsUseCase:
+    STALE_AFTER = dt.timedelta(days=14)
+    BATCH_SIZE = 500
+    MAX_BATCHES = 200
+
+    def __init__(
+        self,
+        cart_repository: ShoppingCartRepository
+    ):
+        self.cart_repository = cart_repository
+
+    def execute(self, dto: DeleteStaleShoppingCartsDTORequest) -> DeleteStaleShoppingCartsDTOResponse:
+        fetched_before = dto.now - self.STALE_AFTER
+        started_at = time.monotonic()
+        after_id = None
+        carts_count = rows_count = 0
+
+        for _ in range(self.MAX_BATCHES):
+            cart_ids = self.cart_repository.list_stale_ids(fetched_before, after_id, self.BATCH_SIZE)
+            if not cart_ids:
+                break
+
+            deleted_carts, deleted_rows = self.cart_repository.delete_stale_bulk(cart_ids, fetched_before)
+            carts_count += deleted_carts
+            rows_count += deleted_rows
+            after_id = cart_ids[-1]
+
+        result = DeleteStaleShoppingCartsDTOResponse(
+            carts_count=carts_count,
+            rows_count=rows_count,
+            elapsed=time.monotonic() - started_at
+        )
+        logger.info(
+            f"Deleted {result.carts_count} stale carts, {result.rows_count} rows "
+            f"in {result.elapsed:.2f}s ({result.rows_per_second:.0f} rows/s)"
+        )
+        return result
@@ -0,0 +1,39 @@
+import logging
+
+from core.shopping_cart.application.repository import ShoppingCartRepository, ShoppingCartTouchesRepository
+
+logger = logging.getLogger(__name__)
+
+
+class FlushShoppingCartTouchesUseCase:
+    """
+    Moves coalesced cart touches to carts fetched_at
+    """
+    BATCH_SIZE = 1000
+    MAX_BATCHES = 100
+
+    def __init__(
+        self,
+        cart_repository: ShoppingCartRepository,
+        cart_touches_repository: ShoppingCartTouchesRepository,
+    ):
+        self.cart_repository = cart_repository
+        self.cart_touches_repository = cart_touches_repository
+
+    def execute(self) -> int:
+        flushed_count = 0
+
+        for _ in range(self.MAX_BATCHES):
+            touches = self.cart_touches_repository.pop(self.BATCH_SIZE)
+            if not touches:
+                break
+
+            try:
+                self.cart_repository.update_fetched_at_bulk(touches)
+            except Exception:
+                self.cart_touches_repository.restore(touches)
+                raise
+            flushed_count += len(touches)
+
+        logger.info(f"Flushed {flushed_count} cart touches")
+        return flushed_count
@@ -1,10 +1,12 @@
-from core.application.repositories.services import ServiceConfigsRepository, ServiceRepository
-from core.domain.entities.service import service_options_price_calculator
+from core.application.repositories.services import (
+    ServiceConfigsRepository, ServicePriceTableRepository,
+    ServiceRepository,
+)
+from core.domain.entities.service import Service
 from core.shopping_cart.application.repository import (
     PromoCodeRepository, ShoppingCartItemRepository,
     ShoppingCartRepository,
 )
-from core.shopping_cart.domain.promo_code import PromoCode, PromoCodeDoesNotExists
 from core.shopping_cart.domain.shopping_cart import ShoppingCart, ShoppingCartItem
 from core.shopping_cart.domain.types import ShoppingCartId
 
@@ -19,9 +21,10 @@ class ListCartItemsUseCaseMixin:
         cart_item_repository: ShoppingCartItemRepository,
         service_repository: ServiceRepository,
         service_configs_repository: ServiceConfigsRepository,
-        promo_code_repository: PromoCodeRepository
-
+        promo_code_repository: PromoCodeRepository,
+        service_price_table_repository: ServicePriceTableRepository,
     ):
+        self.service_price_table_repository = service_price_table_repository
         self.promo_code_repository = promo_code_repository
         self.service_repository = service_repository
         self.cart_item_repository = cart_item_repository
@@ -33,11 +36,18 @@ class ListCartItemsUseCaseMixin:
         cart_item: ShoppingCartItem,
     ):
         service = self.service_repository.get_by_slug(cart_item.service_slug)
-        service.set_price_resolver(service_options_price_calculator(service))
-
         cart_item.selected_options = self.service_configs_repository.list_by_shopping_cart_item(cart_item.id)
-        total_price, total_old_price = service.get_service_price(
-            options=cart_item.selected_options,
+        self.set_cart_item_price(cart_item, service)
+
+    def set_cart_item_price(
+        self,
+        cart_item: ShoppingCartItem,
+        service: Service,
+    ):
+        price_table = self.service_price_table_repository.get_by_slug(service.slug)
+
+        total_price, total_old_price = price_table.get_price(
+            option_ids=[o.id for o in cart_item.selected_options],
             range_options=cart_item.range_options,
         )
 
@@ -45,26 +55,13 @@ class ListCartItemsUseCaseMixin:
         cart_item.price = total_price
         cart_item.old_price = total_old_price
 
-    def _apply_promo(self, cart: ShoppingCart) -> PromoCode:
-        promo_code = None
-        if cart.promo_id:
-            try:
-                promo_code = self.promo_code_repository.find_by_code(cart.promo_id)
-                cart.apply_promo(promo_code)
-            except PromoCodeDoesNotExists:
-                pass
-        return promo_code
-
     def get_shopping_cart_by_id(self, cart_id: ShoppingCartId) -> ShoppingCart:
         """
         @raise ShoppingCartDoesNotExists if cart not found
         """
-        cart = self.cart_repository.get_by_id(cart_id)
-        cart_items = self.cart_item_repository.get_by_shopping_cart(cart)
-        self._apply_promo(cart)
+        cart = self.cart_repository.get_aggregate_by_id(cart_id)
 
-        for cart_item in cart_items:
-            self.calculate_price_for_cart_item(cart_item)
+        for cart_item in cart.items:
+            self.set_cart_item_price(cart_item, cart_item.service)
 
-        cart.set_current_items(cart_items)
         return cart
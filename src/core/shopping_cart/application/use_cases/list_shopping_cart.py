@@ -4,20 +4,24 @@ from decimal import Decimal
 
 from pydantic import BaseModel, Field
 
-from core.application.repositories.services import ServiceConfigsRepository, ServiceRepository
+from core.application.repositories.services import (
+    ServiceConfigsRepository, ServicePriceTableRepository,
+    ServiceRepository,
+)
 from core.shopping_cart.application.repository import (
     PromoCodeRepository, ShoppingCartItemRepository,
-    ShoppingCartRepository,
+    ShoppingCartRepository, ShoppingCartSnapshotRepository, ShoppingCartTouchesRepository,
 )
 from core.shopping_cart.application.use_cases.dto import (
     CartDestinyCharacterDTO, CartDestinyProfileDTO, CartItemModel, CartResponse, CartServiceDTO,
     CartServiceOptionDTO, PromoCodeDTO,
 )
+from core.bungie.exceptions import DestinyProfileDoesNotExists
 from core.bungie.repositories import DestinyBungieCharacterRepository, DestinyBungieProfileRepository
+from core.domain.entities.shopping_cart.exceptions import CharacterDoesNotExists
 from core.shopping_cart.application.use_cases.list_cart_items_mixin import ListCartItemsUseCaseMixin
-from core.shopping_cart.domain.promo_code import PromoCode, PromoCodeDoesNotExists
-from core.shopping_cart.domain.shopping_cart import ShoppingCart
 from core.shopping_cart.domain.types import ShoppingCartId
+from core.utils.map_by_key import map_by_key
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +44,13 @@ class ListShoppingCartUseCase(ListCartItemsUseCaseMixin):
         destiny_character_repository: DestinyBungieCharacterRepository,
         service_repository: ServiceRepository,
         service_configs_repository: ServiceConfigsRepository,
-        promo_code_repository: PromoCodeRepository
+        promo_code_repository: PromoCodeRepository,
+        service_price_table_repository: ServicePriceTableRepository,
+        cart_snapshot_repository: ShoppingCartSnapshotRepository,
+        cart_touches_repository: ShoppingCartTouchesRepository
     ):
+        self.cart_touches_repository = cart_touches_repository
+        self.cart_snapshot_repository = cart_snapshot_repository
         self.promo_code_repository = promo_code_repository
         self.service_configs_repository = service_configs_repository
         self.service_repository = service_repository
@@ -54,27 +63,50 @@ class ListShoppingCartUseCase(ListCartItemsUseCaseMixin):
             cart_item_repository=shopping_cart_items_repository,
             service_repository=service_repository,
             service_configs_repository=service_configs_repository,
-            promo_code_repository=promo_code_repository
+            promo_code_repository=promo_code_repository,
+            service_price_table_repository=service_price_table_repository
         )
 
-    def _apply_promo(self, cart: ShoppingCart) -> PromoCode:
-        promo_code = None
-        if cart.promo_id:
-            try:
-                promo_code = self.promo_code_repository.find_by_code(cart.promo_id)
-                cart.apply_promo(promo_code)
-            except PromoCodeDoesNotExists:
-                pass
-        return promo_code
-
     def execute(self, dto: ListShoppingCartDTOInput) -> ListShoppingCartDTOOutput:
-        cart = self.get_shopping_cart_by_id(dto.cart_id)
+        if not dto.cart_id:
+            return self._list_cart(dto.cart_id)
+
+        self.cart_touches_repository.touch(dto.cart_id)
+
+        snapshot = self.cart_snapshot_repository.get(dto.cart_id)
+        if snapshot is not None:
+            return ListShoppingCartDTOOutput.parse_obj(snapshot)
+
+        result = self._list_cart(dto.cart_id)
+        self.cart_snapshot_repository.save(dto.cart_id, result.dict())
+        return result
+
+    def _list_cart(self, cart_id: t.Optional[ShoppingCartId]) -> ListShoppingCartDTOOutput:
+        cart = self.get_shopping_cart_by_id(cart_id)
 
         result: t.List[CartItemModel] = []
 
+        destiny_profiles = map_by_key(
+            self.destiny_bungie_profile_repository.list_by_ids(
+                list({i.bungie_profile_id for i in cart.items})
+            ),
+            'membership_id'
+        )
+        destiny_characters = map_by_key(
+            self.destiny_character_repository.list_by_ids(
+                list({i.character_id for i in cart.items})
+            ),
+            'character_id'
+        )
+
         for cart_item in cart.items:
-            destiny_profile = self.destiny_bungie_profile_repository.get_by_id(cart_item.bungie_profile_id)
-            destiny_character = self.destiny_character_repository.get_by_id(cart_item.character_id)
+            destiny_profile = destiny_profiles.get(cart_item.bungie_profile_id)
+            if not destiny_profile:
+                raise DestinyProfileDoesNotExists()
+
+            destiny_character = destiny_characters.get(cart_item.character_id)
+            if not destiny_character:
+                raise CharacterDoesNotExists()
 
             service = cart_item.service
             selected_options = cart_item.selected_options
@@ -1,6 +1,9 @@
 from pydantic import BaseModel
 
-from core.application.repositories.services import ServiceConfigsRepository, ServiceRepository
+from core.application.repositories.services import (
+    ServiceConfigsRepository, ServicePriceTableRepository,
+    ServiceRepository,
+)
 from core.shopping_cart.application.repository import (
     PromoCodeRepository, ShoppingCartItemRepository,
     ShoppingCartRepository,
@@ -25,11 +28,12 @@ class RemoveCartItemUseCase(ListCartItemsUseCaseMixin):
         cart_repository: ShoppingCartRepository,
         service_repository: ServiceRepository,
         service_configs_repository: ServiceConfigsRepository,
-        promo_code_repository: PromoCodeRepository
+        promo_code_repository: PromoCodeRepository,
+        service_price_table_repository: ServicePriceTableRepository,
     ):
         self.shopping_cart_items_repository = shopping_cart_items_repository
         super().__init__(cart_repository, shopping_cart_items_repository, service_repository, service_configs_repository,
-                         promo_code_repository)
+                         promo_code_repository, service_price_table_repository)
 
     def execute(self, dto: RemoveCartItemDTOInput) -> RemoveCartItemDTOOutput:
         self.shopping_cart_items_repository.delete(dto.cart_item_id, dto.cart_id)
@@ -1,8 +1,11 @@
 from dependency_injector import containers, providers
+from django.db import transaction
 
 from core.chat.application.repository import ChatMessagesRepository, ChatRoomRepository
 from core.chat.application.use_cases.create_chat_message import CreateChatMessageUseCase
+from core.chat.application.use_cases.list_chat_history import ListChatHistoryUseCase
 from core.chat.application.use_cases.list_user_rooms import ListUserRoomsUseCase
+from core.chat.application.use_cases.persist_chat_messages import PersistChatMessagesUseCase
 
 
 class ChatContainer(containers.DeclarativeContainer):
@@ -20,11 +23,15 @@ class ChatContainer(containers.DeclarativeContainer):
     create_message_uc = providers.Factory(
         CreateChatMessageUseCase,
         chat_rooms_repository=chat_rooms_repository,
+    )
+
+    persist_messages_uc = providers.Factory(
+        PersistChatMessagesUseCase,
         chat_messages_repository=chat_messages_repository,
         users_repository=clients.clients_repository,
         event_repository=telegram_notifications.repository,
-        email_notificator=email_notificator,
-        events_repository=celery_events_repository.repository
+        events_repository=celery_events_repository.repository,
+        savepoint=providers.Object(transaction.atomic)
     )
 
     list_rooms_uc = providers.Factory(
@@ -33,3 +40,9 @@ class ChatContainer(containers.DeclarativeContainer):
         users_repository=clients.clients_repository,
         chat_messages_repository=chat_messages_repository
     )
+
+    list_history_uc = providers.Factory(
+        ListChatHistoryUseCase,
+        chat_rooms_repository=chat_rooms_repository,
+        chat_messages_repository=chat_messages_repository
+    )
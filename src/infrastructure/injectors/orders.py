@@ -1,9 +1,14 @@
 from dependency_injector import containers, providers
 
-from core.order.application.repository import ClientOrderRepository, OrderObjectiveRepository
+from core.order.application.repository import (
+    ClientOrderRepository, OrderObjectiveRepository, OrderObjectiveStatusCountersRepository,
+)
 from core.order.application.use_cases.accept_pending_approval_orders_uc import AcceptPendingApprovalOrdersUseCase
 from core.order.application.use_cases.order_created_notifications import OrderCreatedNotificationsUseCase
 from core.order.application.use_cases.process_payment_callback_uc import ProcessPaymentCallbackUseCase
+from core.order.application.use_cases.reconcile_status_counters_uc import (
+    ReconcileOrderObjectiveStatusCountersUseCase,
+)
 from core.order.application.use_cases.status_callbacks.invalid_credentials import InvalidCredentialsUseCase
 from core.order.application.use_cases.status_callbacks.order_paused_callback import BoosterPausedOrderUseCase
 from core.order.application.use_cases.status_callbacks.order_pending_approval import OrderPendingApprovalCallbackUseCase
@@ -44,10 +49,17 @@ class OrdersUseCases(containers.DeclarativeContainer):
         order_objectives_repository=orders.order_objectives_repository,
     )
 
+    reconcile_status_counters_uc = providers.Factory(
+        ReconcileOrderObjectiveStatusCountersUseCase,
+        order_objectives_repository=orders.order_objectives_repository,
+        status_counters_repository=orders.order_objective_status_counters_repository,
+    )
+
 
 class OrdersContainer(containers.DeclarativeContainer):
     client_orders_repository = providers.ExternalDependency(ClientOrderRepository)
     order_objectives_repository = providers.ExternalDependency(OrderObjectiveRepository)
+    order_objective_status_counters_repository = providers.ExternalDependency(OrderObjectiveStatusCountersRepository)
 
 
 class OrderStatusChangeUcContainer(containers.DeclarativeContainer):
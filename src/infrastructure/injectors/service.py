@@ -1,9 +1,13 @@
 from dependency_injector import containers, providers
 
-from services.repositories import DestinyServiceConfigRepository, DestinyServiceRepository, DestinyServiceTagRepository
+from services.repositories import (
+    DestinyServiceConfigRepository, DestinyServiceRepository, DestinyServiceTagRepository,
+    DjangoServicePriceTableRepository,
+)
 
 
 class DestinyServiceInjectors(containers.DeclarativeContainer):
     service_tag_rep = providers.Factory(DestinyServiceTagRepository)
     service_rep = providers.Factory(DestinyServiceRepository)
     service_configs_rep = providers.Factory(DestinyServiceConfigRepository)
+    service_price_table_rep = providers.Singleton(DjangoServicePriceTableRepository)
@@ -3,7 +3,7 @@ from dependency_injector import containers, providers
 from core.application.repositories.aggregates.main_page_services_repository import MainPageServicesRepository
 from core.application.repositories.services import (
     ServiceConfigsRepository, ServiceDetailedInfoRepository,
-    ServiceRepository,
+    ServicePriceTableRepository, ServiceRepository,
 )
 from core.shopping_cart.application.repository import PromoCodeRepository
 
@@ -11,6 +11,7 @@ from core.shopping_cart.application.repository import PromoCodeRepository
 class DestinyServiceContainer(containers.DeclarativeContainer):
     service_rep = providers.ExternalDependency(ServiceRepository)
     service_configs_rep = providers.ExternalDependency(ServiceConfigsRepository)
+    service_price_table_rep = providers.ExternalDependency(ServicePriceTableRepository)
 
     promo_code_repository = providers.ExternalDependency(PromoCodeRepository)
 
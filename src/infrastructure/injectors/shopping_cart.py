@@ -1,12 +1,18 @@
 from dependency_injector import containers, providers
 
-from core.shopping_cart.application.repository import ShoppingCartItemRepository, ShoppingCartRepository
+from core.shopping_cart.application.repository import (
+    ShoppingCartItemRepository, ShoppingCartRepository,
+    ShoppingCartTouchesRepository,
+)
 from core.shopping_cart.application.use_cases.cart_payed import CartPayedUseCase
+from core.shopping_cart.application.use_cases.delete_stale_carts import DeleteStaleShoppingCartsUseCase
+from core.shopping_cart.application.use_cases.flush_cart_touches import FlushShoppingCartTouchesUseCase
 
 
 class ShoppingCartContainer(containers.DeclarativeContainer):
     shopping_cart_repository = providers.ExternalDependency(ShoppingCartRepository)
     shopping_cart_items_repository = providers.ExternalDependency(ShoppingCartItemRepository)
+    shopping_cart_touches_repository = providers.ExternalDependency(ShoppingCartTouchesRepository)
 
 
 class ShoppingCartUseCases(containers.DeclarativeContainer):
@@ -28,7 +34,19 @@ class ShoppingCartUseCases(containers.DeclarativeContainer):
         service_repository=services.service_rep,
         service_configs_repository=services.service_configs_rep,
         promo_code_repository=services.promo_code_repository,
+        service_price_table_repository=services.service_price_table_rep,
         destiny_bungie_profile_repository=bungie.profiles_repository,
         profile_credentials_repository=clients.clients_credentials_repository,
         events_repository=celery_events_repository.repository,
     )
+
+    delete_stale_carts_uc = providers.Factory(
+        DeleteStaleShoppingCartsUseCase,
+        cart_repository=cart.shopping_cart_repository,
+    )
+
+    flush_cart_touches_uc = providers.Factory(
+        FlushShoppingCartTouchesUseCase,
+        cart_repository=cart.shopping_cart_repository,
+        cart_touches_repository=cart.shopping_cart_touches_repository,
+    )
@@ -5,13 +5,17 @@ from dependency_injector.wiring import Provide, inject
 from django.db import transaction
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from rest_framework.decorators import api_view, authentication_classes
+from pydantic import ValidationError
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
 from core.clients.domain.exceptions import NotEnoughCashback
 from core.domain.entities.shopping_cart.exceptions import ShoppingCartDoesNotExists
 from core.exceptions import BaseNotExistsException
 from core.shopping_cart.application.use_cases.add_to_shopping_cart import (
+    AddItemsToShoppingCartDTOInput,
+    AddItemsToShoppingCartUseCase,
     AddItemToShoppingCartDTOInput,
     AddItemToShoppingCartUseCase,
 )
@@ -31,6 +35,12 @@ CART_COOKIE_NAME = '_destiny-cart-id'
 SET_CREDENTIALS_COOKIE_NAME = '_set-credentials-cookie-name'
 
 
+def invalidate_cart_snapshot(cart_id):
+    # after commit, otherwise concurrent request may cache the cart as it was before the change
+    if cart_id:
+        transaction.on_commit(lambda: ShoppingCartService.cart_snapshot_repository().invalidate(cart_id))
+
+
 @api_view(["POST"])
 @csrf_exempt
 @authentication_classes([])
@@ -49,6 +59,42 @@ def add_item_to_cart(request):
 
     try:
         result = uc.execute(dto)
+        invalidate_cart_snapshot(result.cart_id)
+        response = JsonResponse(result.dict(by_alias=True), status=201)
+
+        response.set_cookie(
+            CART_COOKIE_NAME, result.cart_id,
+            path='/api/destiny2/',
+            httponly=True,
+        )
+
+        return response
+    except ShoppingCartDoesNotExists:
+        response = JsonResponse(status=404, data=[], safe=False)
+        response.delete_cookie(CART_COOKIE_NAME)
+        return response
+    except Exception as e:
+        logger.exception(e)
+        return JsonResponse(e, status=400)
+
+
+@api_view(["POST"])
+@csrf_exempt
+@authentication_classes([])
+def add_items_to_cart(request):
+
+    cart_id = request.COOKIES.get(CART_COOKIE_NAME)
+
+    uc: AddItemsToShoppingCartUseCase = ShoppingCartService.add_items_uc()
+
+    try:
+        dto = AddItemsToShoppingCartDTOInput(
+            cart_id=cart_id,
+            adding_to_cart=request.data.get('adding_to_cart')
+        )
+        with transaction.atomic():
+            result = uc.execute(dto)
+        invalidate_cart_snapshot(result.cart_id)
         response = JsonResponse(result.dict(by_alias=True), status=201)
 
         response.set_cookie(
@@ -62,6 +108,9 @@ def add_item_to_cart(request):
         response = JsonResponse(status=404, data=[], safe=False)
         response.delete_cookie(CART_COOKIE_NAME)
         return response
+    except ValidationError as e:
+        logger.warning(f'Items are not added to cart: {e}')
+        return JsonResponse(data=e.errors(), status=400, safe=False)
     except Exception as e:
         logger.exception(e)
         return JsonResponse(e, status=400)
@@ -119,6 +168,7 @@ def cart_payed(
 
     try:
         result = uc.execute(dto)
+        invalidate_cart_snapshot(cart_id)
         response = JsonResponse(result.dict(), status=201)
         response.delete_cookie(CART_COOKIE_NAME)
         if result.should_set_credentials:
@@ -152,6 +202,7 @@ def cart_delete(request):
 
     try:
         result = uc.execute(dto)
+        invalidate_cart_snapshot(cart_id)
         response = JsonResponse(result.dict(), status=201)
         return response
     except Exception as e:
@@ -174,6 +225,7 @@ def apply_promo(request):
 
     try:
         result = uc.execute(dto)
+        invalidate_cart_snapshot(cart_id)
         response = JsonResponse(result.dict(), status=200)
         return response
     except BaseNotExistsException:
@@ -181,3 +233,9 @@ def apply_promo(request):
     except Exception as e:
         logger.exception(e)
         return Response(str(e), status=400)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def cart_snapshot_stats(request):
+    return Response(ShoppingCartService.cart_snapshot_repository().stats())
@@ -15,7 +15,9 @@ urlpatterns = [
     path('cart/apply-promo', cart_api.apply_promo, name='v2_apply_promo'),
     path('cart/delete', cart_api.cart_delete, name='v2_cart_delete'),
     path('cart/add', cart_api.add_item_to_cart, name='v2_add_to_caft'),
+    path('cart/add-bulk', cart_api.add_items_to_cart, name='v2_add_bulk_to_cart'),
     path('cart/list', cart_api.list_cart_items, name='v2_list_cart_items'),
+    path('cart/snapshot-stats', cart_api.cart_snapshot_stats, name='v2_cart_snapshot_stats'),
     path('dashboard', ClientDashboardAPI.as_view()),
     path('dashboard/booster', BoosterDashboardAPI.as_view()),
     path('dashboard/booster/accept-order/<str:order_id>/', BoosterDashboardAcceptOrderAPI.as_view()),
@@ -1,16 +1,19 @@
-import json
+import asyncio
 import typing as t
 import logging
 
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from dependency_injector.wiring import Provide, inject
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 from core.chat.application.use_cases.create_chat_message import CreateChatMessageDTOInput
+from core.chat.application.use_cases.list_chat_history import ListChatHistoryDTOInput, ListChatHistoryDTOOutput
 from core.chat.application.use_cases.list_user_rooms import ListUserRoomsDTOInput, ListUserRoomsDTOOutput
+from core.chat.domain.chat_room import ChatRole
 from core.order.application.exceptions import OrderObjectiveNotExists
 from infrastructure.injectors.application import ApplicationContainer
+from infrastructure.ws.chat.write_behind import write_behind
 
 logger = logging.getLogger(__name__)
 
@@ -29,18 +32,13 @@ class BaseOutputEvent(BaseModel):
 class ChatConsumer(AsyncJsonWebsocketConsumer):
     room_name: str
     room_group_name: str
+    # (client_id, booster_id) rooms of connected user, messages to them are sent without authorization query
+    rooms: t.Set[t.Tuple[int, int]]
 
     @staticmethod
     def self_room(user_id: int):
         return f"self_{user_id}"
 
-    async def _init_self_room(self, user_id: int):
-        room_name = self.self_room(user_id)
-        await self.channel_layer.group_add(
-            room_name,
-            self.channel_name
-        )
-
     @staticmethod
     def get_room_group_name(room):
         return f'chat_{room.client.id}_{room.booster.id}'
@@ -58,25 +56,20 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
             )
         )
 
-        await self._init_self_room(user_id)
-        for room in result.rooms:
-            room_group_name = self.get_room_group_name(room)
+        rooms = [(self.get_room_group_name(room), room) for room in result.rooms]
+        self.rooms = {(room.client.id, room.booster.id) for room in result.rooms}
 
-            await self.channel_layer.group_add(
-                room_group_name,
-                self.channel_name
-            )
+        # memberships are registered concurrently, not one layer round trip after another
+        await asyncio.gather(*[
+            self.channel_layer.group_add(group_name, self.channel_name)
+            for group_name in [self.self_room(user_id)] + [room_name for room_name, _ in rooms]
+        ])
 
-            await self.channel_layer.group_send(
-                self.self_room(user_id),
-                {
-                    'type': 'send_initial_rooms',
-                    'room_data': room.json(),
-                    'room_name': room_group_name
-                }
-            )
-
-            # Вот тут броадкастить ивент только в комнату по тому же пользователю
+        await self.send(BaseOutputEvent(
+            action='initial_rooms',
+            payload=[{'room_name': room_name, 'room': room} for room_name, room in rooms],
+            room_name=self.self_room(user_id)
+        ).json())
 
     async def connect(
         self,
@@ -86,6 +79,7 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         await self._init_rooms(self.scope['user'].id)
 
     async def disconnect(self, code):
+        await write_behind.flush()
         try:
             await self.channel_layer.group_discard(
                 self.room_group_name,
@@ -115,6 +109,7 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
 
     def _init_handlers(self):
         self.add_handler('__new_message', self.new_chat_message)
+        self.add_handler('__load_history', self.load_history)
 
     def add_handler(self, name, func):
         self._handlers[name] = func
@@ -128,23 +123,28 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         uc=Provide[ApplicationContainer.chat.create_message_uc]
     ):
         message = data['message']
-        role = data['role']
         receiver_id = data['receiver_id']
         room_name = data['room_name']
-        user_id = data['user_id']
 
         try:
             message = await database_sync_to_async(uc.execute)((
                 CreateChatMessageDTOInput(
                     text=message,
-                    role=role,
-                    user_id=user_id,
-                    receiver_id=receiver_id
+                    role=self.role_with(receiver_id),
+                    user_id=self.scope['user'].id,
+                    receiver_id=receiver_id,
+                    known_rooms=frozenset(self.rooms)
                 )
             ))
         except OrderObjectiveNotExists:
-            print("not found Order objective")
+            logger.warning(f"Chat room is not found: {data}")
         else:
+            # room is added after connect, e.g. booster accepted another order
+            self.rooms.add(
+                (message.sender_id, message.receiver_id) if message.role == ChatRole.client else
+                (message.receiver_id, message.sender_id)
+            )
+            write_behind.add(message)
             result = BaseOutputEvent(
                 action='new_message',
                 payload=message,
@@ -159,6 +159,34 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
                 }
             )
 
+    @inject
+    async def load_history(
+        self, data,
+        uc=Provide[ApplicationContainer.chat.list_history_uc]
+    ):
+        try:
+            dto = ListChatHistoryDTOInput(
+                role=self.role_with(data['receiver_id']),
+                user_id=self.scope['user'].id,
+                receiver_id=data['receiver_id'],
+                before=data['before'],
+                limit=data.get('limit', 30)
+            )
+        except ValidationError as e:
+            logger.warning(f"Chat history request is not valid: {data}, {e}")
+            return
+
+        try:
+            result: ListChatHistoryDTOOutput = await database_sync_to_async(uc.execute)(dto)
+        except OrderObjectiveNotExists:
+            logger.warning(f"Chat history is not found: {data}")
+        else:
+            await self.send(BaseOutputEvent(
+                action='history',
+                payload=result.dict(),
+                room_name=data['room_name'],
+            ).json())
+
     ###########################
     # SEND HANDLERS
     ###########################
@@ -169,17 +197,17 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
     ):
         await self.send(event['payload'])
 
-    async def send_initial_rooms(
-        self,
-        event,
-    ):
-        result = BaseOutputEvent(
-            action='send_initial_rooms',
-            payload=json.loads(event['room_data']),
-            room_name=event['room_name']
-        )
-        await self.send(result.json())
-
     @property
     def role(self):
         return 'booster' if self.scope['user'].is_booster else 'client'
+
+    def role_with(self, receiver_id: int):
+        """
+        Role of connected user in the room with receiver, booster may be a client of own order.
+        Falls back to user role when the room is not known or user is on both sides of it.
+        """
+        user_id = self.scope['user'].id
+        as_client, as_booster = (user_id, receiver_id) in self.rooms, (receiver_id, user_id) in self.rooms
+        if as_client != as_booster:
+            return ChatRole.client if as_client else ChatRole.booster
+        return self.role
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core.chat.domain.chat_room import ChatRole
+from infrastructure.ws.chat.consumers import ChatConsumer
+
+BOOSTER_ID, CLIENT_ID, OTHER_BOOSTER_ID = 1, 2, 3
+
+
+@pytest.fixture()
+def consumer():
+    consumer = ChatConsumer()
+    consumer.scope = {'user': SimpleNamespace(id=BOOSTER_ID, is_booster=True)}
+    # booster of client's order and client of own order boosted by other booster
+    consumer.rooms = {(CLIENT_ID, BOOSTER_ID), (BOOSTER_ID, OTHER_BOOSTER_ID)}
+    return consumer
+
+
+@pytest.mark.parametrize('receiver_id, role', [
+    (CLIENT_ID, ChatRole.booster),
+    (OTHER_BOOSTER_ID, ChatRole.client),
+    (100, ChatRole.booster),
+])
+def test_role_is_resolved_from_rooms(consumer, receiver_id, role):
+    assert consumer.role_with(receiver_id) == role
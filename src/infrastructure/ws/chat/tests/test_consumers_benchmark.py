@@ -0,0 +1,131 @@
+import asyncio
+import datetime as dt
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer
+from channels.testing import WebsocketCommunicator
+
+from core.chat.application.use_cases.list_user_rooms import (
+    ChatMessageDTO, ChatRoomDTO, ChatSideDTO, ListUserRoomsDTOOutput, ListUserRoomsUseCase,
+)
+from infrastructure.ws.chat.consumers import BaseOutputEvent, ChatConsumer
+
+# round trip of a channel layer call, e.g. to redis in the same datacenter
+LAYER_LATENCY = 0.001
+CONNECTS = 5
+USER_ID = 1
+
+# database_sync_to_async closes old connections around the use case call
+pytestmark = pytest.mark.django_db
+
+
+class LatencyChannelLayer(InMemoryChannelLayer):
+    async def group_add(self, group, channel):
+        await asyncio.sleep(LAYER_LATENCY)
+        await super().group_add(group, channel)
+
+    async def group_send(self, group, message):
+        await asyncio.sleep(LAYER_LATENCY)
+        await super().group_send(group, message)
+
+
+def make_rooms(count: int) -> ListUserRoomsDTOOutput:
+    created_at = dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+    return ListUserRoomsDTOOutput(rooms=[
+        ChatRoomDTO(
+            client=ChatSideDTO(id=USER_ID, username='client'),
+            booster=ChatSideDTO(id=100 + i, username=f'booster {i}'),
+            messages=[
+                ChatMessageDTO(id=i, message='hello', created_at=created_at, sender_id=USER_ID, receiver_id=100 + i)
+            ]
+        ) for i in range(count)
+    ])
+
+
+class BenchmarkChatConsumer(ChatConsumer):
+    list_rooms_uc = None
+
+    async def _init_rooms(self, user_id: int, list_rooms_uc=None):
+        await super()._init_rooms(user_id, list_rooms_uc=self.list_rooms_uc)
+
+
+class LegacyChatConsumer(BenchmarkChatConsumer):
+    """Previous bootstrap: group_add and group_send to the self room for every room"""
+
+    async def _init_rooms(self, user_id: int, list_rooms_uc=None):
+        result = self.list_rooms_uc.execute(None)
+        await self.channel_layer.group_add(self.self_room(user_id), self.channel_name)
+        for room in result.rooms:
+            room_group_name = self.get_room_group_name(room)
+            await self.channel_layer.group_add(room_group_name, self.channel_name)
+            await self.channel_layer.group_send(
+                self.self_room(user_id),
+                {'type': 'send_initial_rooms', 'room_data': room.json(), 'room_name': room_group_name}
+            )
+
+    async def send_initial_rooms(self, event):
+        await self.send(BaseOutputEvent(
+            action='send_initial_rooms',
+            payload=json.loads(event['room_data']),
+            room_name=event['room_name']
+        ).json())
+
+
+@pytest.fixture()
+def latency_channel_layer(settings):
+    settings.CHANNEL_LAYERS = {
+        'default': {'BACKEND': 'infrastructure.ws.chat.tests.test_consumers_benchmark.LatencyChannelLayer'}
+    }
+
+
+def make_consumer(consumer_class, rooms_count: int):
+    list_rooms_uc = MagicMock(spec=ListUserRoomsUseCase)
+    list_rooms_uc.execute.return_value = make_rooms(rooms_count)
+    return type(consumer_class.__name__, (consumer_class,), {'list_rooms_uc': list_rooms_uc})
+
+
+async def connect(consumer_class, frames_count: int):
+    """
+    Connects and waits for bootstrap frames, returns the frames
+    """
+    communicator = WebsocketCommunicator(consumer_class.as_asgi(), '/ws/chat/client/')
+    communicator.scope['user'] = SimpleNamespace(id=USER_ID, is_booster=False)
+
+    connected, _ = await communicator.connect()
+    assert connected
+    frames = [json.loads(await communicator.receive_from()) for _ in range(frames_count)]
+
+    await communicator.disconnect()
+    return frames
+
+
+def test_init_rooms_sends_one_frame(latency_channel_layer):
+    consumer_class = make_consumer(BenchmarkChatConsumer, rooms_count=3)
+
+    (frame,) = async_to_sync(connect)(consumer_class, 1)
+
+    assert frame['action'] == 'initial_rooms'
+    assert frame['room_name'] == ChatConsumer.self_room(USER_ID)
+    assert [room['room_name'] for room in frame['payload']] == ['chat_1_100', 'chat_1_101', 'chat_1_102']
+    assert frame['payload'][0]['room']['messages'][0]['message'] == 'hello'
+
+
+@pytest.mark.parametrize('rooms_count', [1, 20, 100])
+def test_benchmark_connect_latency(latency_channel_layer, benchmark, rooms_count):
+    legacy_consumer = make_consumer(LegacyChatConsumer, rooms_count)
+    consumer = make_consumer(BenchmarkChatConsumer, rooms_count)
+
+    benchmark(
+        lambda: async_to_sync(connect)(legacy_consumer, rooms_count),
+        rounds=CONNECTS,
+        name=f'chat connect, {rooms_count} rooms, frame per room'
+    )
+    benchmark(
+        lambda: async_to_sync(connect)(consumer, 1),
+        rounds=CONNECTS,
+        name=f'chat connect, {rooms_count} rooms, one frame'
+    )
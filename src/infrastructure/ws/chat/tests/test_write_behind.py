@@ -0,0 +1,129 @@
+import asyncio
+import datetime as dt
+from unittest.mock import MagicMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from dependency_injector import providers
+
+from core.chat.application.use_cases.create_chat_message import CreateChatMessageDTOOutput
+from core.chat.application.use_cases.persist_chat_messages import PersistChatMessagesUseCase
+from core.chat.domain.chat_room import ChatRole
+from infrastructure.ws.chat.write_behind import ChatMessagesDeadLetters, ChatMessagesWriteBehind
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def persist_messages_uc():
+    from boosting import container
+    uc = MagicMock(spec=PersistChatMessagesUseCase)
+    with container.chat.persist_messages_uc.override(providers.Object(uc)):
+        yield uc
+
+
+def make_messages(count: int):
+    return [
+        CreateChatMessageDTOOutput(
+            sender_id=1,
+            receiver_id=2,
+            created_at=dt.datetime.now(tz=dt.timezone.utc),
+            text=f'message {i}',
+            role=ChatRole.client
+        ) for i in range(count)
+    ]
+
+
+def persisted_batches(uc):
+    return [[m.text for m in call[0][0].messages] for call in uc.execute.call_args_list]
+
+
+def test_messages_are_persisted_in_one_batch_after_interval(persist_messages_uc):
+    write_behind = ChatMessagesWriteBehind()
+    write_behind.FLUSH_INTERVAL = 0.05
+
+    async def send():
+        for message in make_messages(3):
+            write_behind.add(message)
+        assert not persist_messages_uc.execute.called
+        await asyncio.sleep(write_behind.FLUSH_INTERVAL * 2)
+        await write_behind.flush()
+
+    async_to_sync(send)()
+
+    assert persisted_batches(persist_messages_uc) == [['message 0', 'message 1', 'message 2']]
+
+
+def test_full_batch_is_persisted_without_waiting(persist_messages_uc):
+    write_behind = ChatMessagesWriteBehind()
+    write_behind.MAX_BATCH = 2
+    write_behind.FLUSH_INTERVAL = 60
+
+    async def send():
+        for message in make_messages(3):
+            write_behind.add(message)
+        await write_behind.flush()
+
+    async_to_sync(send)()
+
+    assert persisted_batches(persist_messages_uc) == [['message 0', 'message 1'], ['message 2']]
+
+
+def test_failed_batch_is_retried(persist_messages_uc):
+    write_behind = ChatMessagesWriteBehind()
+    write_behind.RETRY_DELAY = 0
+    persist_messages_uc.execute.side_effect = [Exception('db is down'), None]
+
+    async def send():
+        write_behind.add(make_messages(1)[0])
+        await write_behind.flush()
+
+    async_to_sync(send)()
+
+    assert persisted_batches(persist_messages_uc) == [['message 0'], ['message 0']]
+
+
+def test_failed_batch_does_not_break_next_ones(persist_messages_uc):
+    write_behind = ChatMessagesWriteBehind()
+    write_behind.RETRY_DELAY = 0
+    persist_messages_uc.execute.side_effect = [Exception('db is down')] * write_behind.MAX_ATTEMPTS + [None]
+
+    async def send():
+        first, second = make_messages(2)
+        write_behind.add(first)
+        await write_behind.flush()
+        write_behind.add(second)
+        await write_behind.flush()
+
+    async_to_sync(send)()
+
+    assert persisted_batches(persist_messages_uc) == [['message 0']] * write_behind.MAX_ATTEMPTS + [['message 1']]
+
+
+def test_failed_batch_is_kept_in_dead_letters(persist_messages_uc):
+    dead_letters = MagicMock(spec=ChatMessagesDeadLetters)
+    write_behind = ChatMessagesWriteBehind(dead_letters)
+    write_behind.RETRY_DELAY = 0
+    persist_messages_uc.execute.side_effect = Exception('db is down')
+    messages = make_messages(2)
+
+    async def send():
+        for message in messages:
+            write_behind.add(message)
+        await write_behind.flush()
+
+    async_to_sync(send)()
+
+    assert persist_messages_uc.execute.call_count == write_behind.MAX_ATTEMPTS
+    dead_letters.push.assert_called_once_with(messages)
+
+
+def test_dead_letters_are_kept_in_redis():
+    redis = MagicMock()
+    dead_letters = ChatMessagesDeadLetters()
+    messages = make_messages(2)
+
+    with patch.object(ChatMessagesDeadLetters, '_redis', return_value=redis):
+        assert dead_letters.push(messages)
+        redis.lpop.return_value = redis.rpush.call_args[0][1]
+        assert dead_letters.pop() == messages
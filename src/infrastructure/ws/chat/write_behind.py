@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import typing as t
+
+from channels.db import database_sync_to_async
+from dependency_injector.wiring import Provide, inject
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from core.chat.application.use_cases.create_chat_message import CreateChatMessageDTOOutput
+from core.chat.application.use_cases.persist_chat_messages import PersistChatMessagesDTOInput
+from infrastructure.injectors.application import ApplicationContainer
+
+logger = logging.getLogger(__name__)
+
+
+class ChatMessagesDeadLetters:
+    """
+    Keeps batches which are not persisted after all attempts in redis list,
+    replay_chat_dead_letters persists them once the cause is fixed.
+    """
+    KEY = 'chat-messages:dead-letters'
+
+    @staticmethod
+    def _redis():
+        try:
+            return get_redis_connection('default')
+        except NotImplementedError:
+            return None
+
+    def push(self, messages: t.List[CreateChatMessageDTOOutput], front: bool = False) -> bool:
+        redis = self._redis()
+        if redis is None:
+            return False
+
+        data = PersistChatMessagesDTOInput(messages=messages).json()
+        try:
+            if front:
+                redis.lpush(self.KEY, data)
+            else:
+                redis.rpush(self.KEY, data)
+        except RedisError as e:
+            logger.warning(f'Chat messages dead letter is not written: {e}')
+            return False
+        return True
+
+    def pop(self) -> t.Optional[t.List[CreateChatMessageDTOOutput]]:
+        """
+        Oldest dead letter batch, None when there is none
+        """
+        redis = self._redis()
+        data = redis.lpop(self.KEY) if redis is not None else None
+        return PersistChatMessagesDTOInput.parse_raw(data).messages if data else None
+
+
+class ChatMessagesWriteBehind:
+    """
+    Buffers broadcasted chat messages of this process and persists them in batches,
+    FLUSH_INTERVAL after the first buffered message or as soon as MAX_BATCH messages are buffered.
+    Messages buffered when the process is killed are lost, consumers flush on disconnect.
+    Failed batch is retried up to MAX_ATTEMPTS times, RETRY_DELAY grows with every attempt,
+    and is kept in dead letters after that.
+    """
+    FLUSH_INTERVAL = 0.2
+    MAX_BATCH = 200
+    MAX_ATTEMPTS = 3
+    RETRY_DELAY = 0.5
+
+    def __init__(self, dead_letters: t.Optional[ChatMessagesDeadLetters] = None):
+        self.dead_letters = dead_letters or ChatMessagesDeadLetters()
+        self._buffer: t.List[CreateChatMessageDTOOutput] = []
+        self._timer: t.Optional[asyncio.TimerHandle] = None
+        self._flushes: t.Set[asyncio.Future] = set()
+
+    def add(self, message: CreateChatMessageDTOOutput):
+        self._buffer.append(message)
+        if len(self._buffer) >= self.MAX_BATCH:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_event_loop().call_later(self.FLUSH_INTERVAL, self._start_flush)
+
+    async def flush(self):
+        """
+        Persists buffered messages and waits for flushes in progress
+        """
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes))
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        messages, self._buffer = self._buffer, []
+        if messages:
+            flush = asyncio.ensure_future(self._persist(messages))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    @inject
+    async def _persist(
+        self,
+        messages: t.List[CreateChatMessageDTOOutput],
+        uc=Provide[ApplicationContainer.chat.persist_messages_uc]
+    ):
+        def persist():
+            # messages and their notification tasks in outbox are committed together
+            with transaction.atomic():
+                return uc.execute(PersistChatMessagesDTOInput(messages=messages))
+
+        # failed attempt is rolled back as a whole, retry does not duplicate messages
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                await database_sync_to_async(persist)()
+                return
+            except Exception as e:
+                if attempt == self.MAX_ATTEMPTS:
+                    logger.exception(f"Chat messages are not persisted after {attempt} attempts: {e}")
+                    if not self.dead_letters.push(messages):
+                        logger.error(f"Chat messages are lost: {[m.dict() for m in messages]}")
+                else:
+                    logger.warning(f"Chat messages are not persisted, attempt {attempt}: {e}")
+                    await asyncio.sleep(self.RETRY_DELAY * attempt)
+
+
+write_behind = ChatMessagesWriteBehind()
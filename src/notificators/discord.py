@@ -1,8 +1,13 @@
 import datetime as dt
+import os
+import threading
+import typing as t
 
 import requests
-from discord import Colour, Embed, RequestsWebhookAdapter, Webhook
+from discord import Colour, Embed, RequestsWebhookAdapter, Webhook, WebhookAdapter
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from boosting.settings import BASE_URL
 from core.application.repositories.notifications import (
@@ -85,19 +90,59 @@ HTTP_TIMEOUT = 30
 
 class TimeoutRequestsSession(requests.Session):
     def request(self, *args, **kwargs):
-        kwargs.setdefault('timeout', HTTP_TIMEOUT)
         kwargs.setdefault('timeout', HTTP_TIMEOUT)
         return super(TimeoutRequestsSession, self).request(*args, **kwargs)
 
 
-def webhook_factory(platform: Membership, category: Category):
-    web_hook = web_hooks[platform][category]
-    session = TimeoutRequestsSession()
+class WebhooksRegistry:
+    """
+    Process wide webhook clients keyed by (platform, category), sharing one pooled keep-alive session.
+    Clients are re-created in a forked process (e.g. celery prefork child), connections are not shared with parent.
+    """
+    POOL_SIZE = 10
+    CONNECT_RETRIES = 3
+
+    def __init__(self, base_url: str = WebhookAdapter.BASE):
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        self._pid = None
+        self._session = None
+        self._webhooks: t.Dict[t.Tuple[Membership, Category], Webhook] = {}
+
+    def _make_session(self) -> requests.Session:
+        session = TimeoutRequestsSession()
+        # only connection errors are retried, posting a message again may duplicate it
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=Retry(total=self.CONNECT_RETRIES, connect=self.CONNECT_RETRIES, read=0, status=0),
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get(self, platform: Membership, category: Category) -> Webhook:
+        key = (platform, category)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._session = self._make_session()
+                self._webhooks = {}
+
+            webhook = self._webhooks.get(key)
+            if webhook is None:
+                webhook_id, token = web_hooks[platform][category].split('/')
+                adapter = RequestsWebhookAdapter(sleep=False, session=self._session)
+                adapter.BASE = self.base_url
+                webhook = self._webhooks[key] = Webhook.partial(int(webhook_id), token, adapter=adapter)
+            return webhook
 
-    return Webhook.from_url(
-        f"https://discordapp.com/api/webhooks/{web_hook}",
-        adapter=RequestsWebhookAdapter(sleep=False, session=session)
-    )
+
+webhooks_registry = WebhooksRegistry()
+
+
+def webhook_factory(platform: Membership, category: Category):
+    return webhooks_registry.get(platform, category)
 
 
 class NewDiscordNotificator(OrderExecutorsNotificationRepository):
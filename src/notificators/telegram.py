@@ -21,12 +21,12 @@ class TelegramNotificationsRepository(EventNotificationRepository):
 
     def chat_message(self, dto: EventChatMessageDTO):
         from notifications import new_chat_message
+        from orders.outbox import send_task
 
         if IS_PROD:
             logger.info(f"Sending new chat")
-            new_chat_message.delay(
-                text=get_new_chat_message(dto)
-            )
+            # sent by outbox relay once committed, not again when the batch is rolled back
+            send_task(new_chat_message, text=get_new_chat_message(dto))
 
     def __init__(self, client: TelegramClient):
         self.client = client
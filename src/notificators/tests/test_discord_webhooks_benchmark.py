@@ -0,0 +1,85 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from discord import RequestsWebhookAdapter, Webhook
+
+from notificators.constants import Category
+from notificators.discord import BOT_NAME, TimeoutRequestsSession, WebhooksRegistry, web_hooks
+from profiles.constants import Membership
+
+MESSAGES_COUNT = 50
+
+
+class DiscordStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.connections.add(self.client_address)
+        self.send_response(204)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def discord_stand_in():
+    DiscordStandInHandler.connections = set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DiscordStandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def new_session_webhook(base_url: str, platform: Membership, category: Category) -> Webhook:
+    """Previous webhook_factory: new session and webhook for every message"""
+    webhook_id, token = web_hooks[platform][category].split('/')
+    adapter = RequestsWebhookAdapter(sleep=False, session=TimeoutRequestsSession())
+    adapter.BASE = base_url
+    return Webhook.partial(int(webhook_id), token, adapter=adapter)
+
+
+def send_messages(webhook_factory):
+    for _ in range(MESSAGES_COUNT):
+        webhook_factory(Membership.PS4, Category.pvp).send('benchmark', username=BOT_NAME)
+
+
+def test_registry_reuses_connection(discord_stand_in):
+    registry = WebhooksRegistry(base_url=discord_stand_in)
+
+    registry.get(Membership.PS4, Category.pvp).send('first', username=BOT_NAME)
+    registry.get(Membership.Xbox, Category.pve).send('second', username=BOT_NAME)
+
+    assert registry.get(Membership.PS4, Category.pvp) is registry.get(Membership.PS4, Category.pvp)
+    assert len(DiscordStandInHandler.connections) == 1
+
+
+def test_registry_recreated_after_fork(discord_stand_in, monkeypatch):
+    registry = WebhooksRegistry(base_url=discord_stand_in)
+    webhook = registry.get(Membership.PS4, Category.pvp)
+
+    monkeypatch.setattr('notificators.discord.os.getpid', lambda: -1)
+
+    assert registry.get(Membership.PS4, Category.pvp) is not webhook
+
+
+def test_benchmark_webhooks_throughput(discord_stand_in, benchmark):
+    benchmark(
+        lambda: send_messages(lambda platform, category: new_session_webhook(discord_stand_in, platform, category)),
+        name=f'discord webhooks, {MESSAGES_COUNT} messages with new sessions'
+    )
+    new_sessions_connections = len(DiscordStandInHandler.connections)
+
+    DiscordStandInHandler.connections = set()
+    registry = WebhooksRegistry(base_url=discord_stand_in)
+    benchmark(lambda: send_messages(registry.get), name=f'discord webhooks, {MESSAGES_COUNT} messages with registry')
+
+    assert new_sessions_connections > 1
+    assert len(DiscordStandInHandler.connections) == 1
@@ -1,5 +1,6 @@
 from dependency_injector import providers
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class OrdersConfig(AppConfig):
@@ -10,18 +11,28 @@ class OrdersConfig(AppConfig):
         from boosting import container
         from orders.repositories import DjangoClientOrderRepository, DjangoOrderObjectiveRepository
         from orders.repositories import DjangoShoppingCartRepository, DjangoShoppingCartItemRepository
-        from orders.repositories import DjangoPromoCodeRepository
+        from orders.repositories import DjangoPromoCodeRepository, RedisShoppingCartTouchesRepository
         from orders.repositories import DjangoChatRoomRepository, DjangoChatMessagesRepository
+        from orders.repositories import RedisOrderObjectiveStatusCountersRepository
+        from . import signals
         from . import tasks
         from . import views
 
         container.orders.client_orders_repository.override(providers.Factory(DjangoClientOrderRepository))
         container.orders.order_objectives_repository.override(providers.Factory(DjangoOrderObjectiveRepository))
+        container.orders.order_objective_status_counters_repository.override(
+            providers.Factory(RedisOrderObjectiveStatusCountersRepository)
+        )
 
         container.cart.shopping_cart_repository.override(providers.Factory(DjangoShoppingCartRepository))
         container.cart.shopping_cart_items_repository.override(providers.Factory(DjangoShoppingCartItemRepository))
+        container.cart.shopping_cart_touches_repository.override(providers.Singleton(RedisShoppingCartTouchesRepository))
         container.chat.chat_rooms_repository.override(providers.Factory(DjangoChatRoomRepository))
         container.chat.chat_messages_repository.override(providers.Factory(DjangoChatMessagesRepository))
         container.services.promo_code_repository.override(providers.Factory(DjangoPromoCodeRepository))
 
         container.wire(modules=[tasks, views])
+
+        if settings.ORDER_OBJECTIVE_TRANSITIONS == 'table':
+            from core.order.domain.order_states import OrderObjectiveStateMachineMixin
+            OrderObjectiveStateMachineMixin.use_transition_table()
@@ -0,0 +1,26 @@
+BATCH_SIZE = 5000
+
+
+def backfill_conversation_keys(connection, table: str, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Fills conversation keys of chat messages written without them, returns count of filled messages.
+    Raw SQL only, it is shared by migrations and must not depend on current models.
+    """
+    updated = 0
+
+    # every batch is committed on its own, table is not locked for the whole backfill
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT MAX(id) FROM {table}')
+        last_id = cursor.fetchone()[0] or 0
+
+        for start in range(0, last_id + 1, batch_size):
+            cursor.execute(
+                f"UPDATE {table} "
+                f"SET conversation_key = LEAST(sender_id, receiver_id) || ':' || GREATEST(sender_id, receiver_id) "
+                f"WHERE id >= %s AND id < %s AND conversation_key IS NULL "
+                f"AND sender_id IS NOT NULL AND receiver_id IS NOT NULL",
+                [start, start + batch_size]
+            )
+            updated += cursor.rowcount
+
+    return updated
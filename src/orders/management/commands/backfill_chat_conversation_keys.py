@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from orders.chat_backfill import BATCH_SIZE, backfill_conversation_keys
+from orders.orm_models import ChatMessage
+
+
+class Command(BaseCommand):
+    help = (
+        'Fills conversation keys of chat messages written without them, '
+        'run once instances without conversation keys are stopped'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, batch_size: int, **options):
+        updated = backfill_conversation_keys(connection, ChatMessage._meta.db_table, batch_size)
+        self.stdout.write(f'{updated} chat messages are backfilled')
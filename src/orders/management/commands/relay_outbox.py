@@ -0,0 +1,35 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from orders.outbox import OutboxRelay
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Sends outbox messages to the broker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0.5, help='Seconds to wait when outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Drain outbox and exit')
+
+    def handle(self, *args, interval: float, once: bool, **options):
+        relay = OutboxRelay()
+
+        while True:
+            # connection broken by database restart or failover is not reused
+            close_old_connections()
+            try:
+                relayed = relay.relay()
+            except Exception as e:
+                logger.exception(e)
+                close_old_connections()
+                relayed = 0
+
+            if once:
+                return
+            if not relayed:
+                time.sleep(interval)
@@ -0,0 +1,36 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.chat.application.use_cases.persist_chat_messages import PersistChatMessagesDTOInput
+from infrastructure.ws.chat.write_behind import ChatMessagesDeadLetters
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Persists chat messages batches which write behind failed to persist'
+
+    def handle(self, *args, **options):
+        from boosting import container
+        uc = container.chat.persist_messages_uc()
+        dead_letters = ChatMessagesDeadLetters()
+        replayed = 0
+
+        while True:
+            messages = dead_letters.pop()
+            if messages is None:
+                break
+
+            try:
+                with transaction.atomic():
+                    uc.execute(PersistChatMessagesDTOInput(messages=messages))
+            except Exception as e:
+                logger.exception(e)
+                # kept first for the next replay
+                dead_letters.push(messages, front=True)
+                break
+            replayed += 1
+
+        self.stdout.write(f'{replayed} chat messages batches are replayed')
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.8 on 2026-10-18 18:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0085_ormclientorder_payed_with_cashback'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ormorderobjective',
+            index=models.Index(condition=models.Q(status='PENDING_APPROVAL'), fields=['status_changed_at'], name='objective_pending_approval'),
+        ),
+    ]
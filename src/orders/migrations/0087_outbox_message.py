@@ -0,0 +1,27 @@
+# Generated by Django 3.0.8 on 2026-10-18 18:50
+
+from django.db import migrations, models
+import django.utils.timezone
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0086_order_objective_pending_approval_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ORMOutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('task', models.CharField(max_length=255)),
+                ('kwargs', jsonfield.fields.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'outbox_message',
+            },
+        ),
+    ]
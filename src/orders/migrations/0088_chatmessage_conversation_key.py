@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+from orders.chat_backfill import backfill_conversation_keys
+
+
+def backfill_conversation_key(apps, schema_editor):
+    ChatMessage = apps.get_model('orders', 'ChatMessage')
+    backfill_conversation_keys(schema_editor.connection, ChatMessage._meta.db_table)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('orders', '0087_outbox_message'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatmessage',
+            name='conversation_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_conversation_key, migrations.RunPython.noop),
+        # built concurrently, plain CREATE INDEX blocks writes to chat messages while it runs
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'CREATE INDEX CONCURRENTLY IF NOT EXISTS chat_message_conversation '
+                    'ON orders_chatmessage (conversation_key, created_at, id)',
+                    'DROP INDEX CONCURRENTLY IF EXISTS chat_message_conversation',
+                ),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='chatmessage',
+                    index=models.Index(
+                        fields=['conversation_key', 'created_at', 'id'], name='chat_message_conversation'
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.0.8 on 2026-10-18 19:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('orders', '0088_chatmessage_conversation_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ORMChatRoom',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('booster_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'chat_room',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ormchatroom',
+            constraint=models.UniqueConstraint(fields=('client', 'booster_user'), name='chat_room_pair'),
+        ),
+        migrations.RunSQL(
+            'INSERT INTO chat_room (client_id, booster_user_id, created_at) '
+            'SELECT co.client_id, u.id, MIN(o.created_at) FROM order_objective AS o '
+            'JOIN client_orders AS co ON co.id = o.client_order_id '
+            'JOIN profiles_user AS u ON u.booster_profile_id = o.booster_id '
+            'WHERE co.client_id IS NOT NULL '
+            'GROUP BY co.client_id, u.id',
+            migrations.RunSQL.noop
+        ),
+    ]
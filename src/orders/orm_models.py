@@ -1,5 +1,5 @@
 
-from django.db import models
+from django.db import connection, models
 from django.utils.timezone import now
 from jsonfield import JSONField
 
@@ -93,6 +93,13 @@ class ORMOrderObjective(OrderObjectiveStateMachineMixin, models.Model):
         db_table = "order_objective"
         abstract = False
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=['status_changed_at'],
+                name='objective_pending_approval',
+                condition=models.Q(status=OrderObjectiveStatusSM.PENDING_APPROVAL.value)
+            ),
+        ]
 
     id = models.CharField(max_length=128, primary_key=True, default=random_guid)
     client_order = models.ForeignKey("ORMClientOrder", on_delete=models.CASCADE, blank=True, null=True)
@@ -159,9 +166,79 @@ class ChatMessage(models.Model):
         related_name='receiver_chat_messages'
     )
     is_seen = models.BooleanField(default=False)
+    # same for both directions of users pair, see make_conversation_key
+    conversation_key = models.CharField(max_length=64, null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=['conversation_key', 'created_at', 'id'], name='chat_message_conversation'),
+        ]
 
     def __str__(self):
         return f"Message: {self.sender}: {self.msg}"
+
+    @staticmethod
+    def make_conversation_key(user_id: int, user_id_2: int) -> str:
+        return f"{min(user_id, user_id_2)}:{max(user_id, user_id_2)}"
+
+    def save(self, *args, **kwargs):
+        if self.conversation_key is None and self.sender_id and self.receiver_id:
+            self.conversation_key = self.make_conversation_key(self.sender_id, self.receiver_id)
+        super().save(*args, **kwargs)
+
+
+class ORMChatRoom(models.Model):
+    """
+    Client and booster user pair sharing at least one order objective, the chat room index.
+    Row is added once a booster is assigned and kept, so chat history stays available.
+    """
+    class Meta:
+        db_table = "chat_room"
+        constraints = [
+            models.UniqueConstraint(fields=['client', 'booster_user'], name='chat_room_pair'),
+        ]
+
+    client = models.ForeignKey('profiles.User', on_delete=models.CASCADE, related_name='+')
+    booster_user = models.ForeignKey('profiles.User', on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return f"<ChatRoom client={self.client_id} booster={self.booster_user_id}>"
+
+    @classmethod
+    def add_for_objectives(cls, objective_ids: list):
+        """
+        Adds rooms of objectives clients and their boosters users, existing rooms are skipped
+        """
+        if not objective_ids:
+            return
+
+        from profiles.models import User
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {cls._meta.db_table} (client_id, booster_user_id, created_at) '
+                f'SELECT DISTINCT co.client_id, u.id, now() FROM {ORMOrderObjective._meta.db_table} AS o '
+                f'JOIN {ORMClientOrder._meta.db_table} AS co ON co.id = o.client_order_id '
+                f'JOIN {User._meta.db_table} AS u ON u.booster_profile_id = o.booster_id '
+                f'WHERE o.id = ANY(%s) AND co.client_id IS NOT NULL '
+                f'ON CONFLICT (client_id, booster_user_id) DO NOTHING',
+                [list(objective_ids)]
+            )
+
+
+class ORMOutboxMessage(models.Model):
+    """
+    Celery task written in the same transaction as the change it is about, relay sends it to the broker
+    """
+    class Meta:
+        db_table = "outbox_message"
+
+    id = models.BigAutoField(primary_key=True)
+    task = models.CharField(max_length=255)
+    kwargs = JSONField(default=dict)
+    created_at = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return f"<OutboxMessage {self.task} {self.kwargs}>"
@@ -0,0 +1,86 @@
+import time
+import typing as t
+
+from celery import Task, current_app
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils.timezone import now
+
+from orders.orm_models import ORMOutboxMessage
+
+
+def send_task(task: Task, **kwargs):
+    """
+    Writes task into outbox within current transaction, relay sends it to the broker once committed
+    """
+    ORMOutboxMessage.objects.create(task=task.name, kwargs=kwargs)
+
+
+class OutboxRelay:
+    """
+    Sends outbox messages in batches over one broker connection and deletes them.
+    Delivery is at least once: batch is sent again if it can not be deleted after sending.
+    """
+    BATCH_SIZE = 200
+    STATS_KEY = 'outbox-relay:stats'
+    STATS_WINDOW = 60
+
+    def __init__(self, app=None):
+        self.app = app or current_app
+        self._window_started_at = time.monotonic()
+        self._window_relayed = 0
+
+    def relay_batch(self) -> int:
+        with transaction.atomic():
+            messages = list(
+                ORMOutboxMessage.objects.select_for_update(skip_locked=True).order_by('id')[:self.BATCH_SIZE]
+            )
+            if not messages:
+                return 0
+
+            with self.app.producer_or_acquire() as producer:
+                for message in messages:
+                    self.app.send_task(message.task, kwargs=message.kwargs, producer=producer)
+
+            ORMOutboxMessage.objects.filter(id__in=[m.id for m in messages]).delete()
+
+        self._window_relayed += len(messages)
+        self._save_stats(lag=(now() - messages[0].created_at).total_seconds())
+        return len(messages)
+
+    def relay(self) -> int:
+        """
+        Drains outbox until it is empty
+        """
+        relayed = 0
+        while True:
+            batch = self.relay_batch()
+            relayed += batch
+            if batch < self.BATCH_SIZE:
+                return relayed
+
+    def _save_stats(self, lag: float):
+        elapsed = time.monotonic() - self._window_started_at
+        stats = cache.get(self.STATS_KEY) or {}
+        stats.update(lag=lag, relayed_at=time.time())
+        if elapsed >= self.STATS_WINDOW:
+            stats['throughput'] = self._window_relayed / elapsed
+            self._window_started_at = time.monotonic()
+            self._window_relayed = 0
+        cache.set(self.STATS_KEY, stats, timeout=None)
+
+    @classmethod
+    def stats(cls) -> t.Dict[str, t.Any]:
+        """
+        Pending messages, age of the oldest one and relay stats: lag of the last batch, messages per second
+        """
+        pending = ORMOutboxMessage.objects.aggregate(count=Count('id'), oldest=Min('created_at'))
+        stats = cache.get(cls.STATS_KEY) or {}
+        return {
+            'pending': pending['count'],
+            'oldest_age': (now() - pending['oldest']).total_seconds() if pending['oldest'] else 0,
+            'lag': stats.get('lag'),
+            'throughput': stats.get('throughput'),
+            'relayed_at': stats.get('relayed_at'),
+        }
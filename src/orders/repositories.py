@@ -1,28 +1,40 @@
+import collections
+import datetime as dt
 import logging
+import time
 import typing as t
 
-from django.db.models import Q
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q, QuerySet
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
 
 from core.chat.domain.chat_room import ChatMessage, ChatRole, ChatRoom
 from core.chat.application.repository import ChatMessagesRepository, ChatRoomRepository
 from core.domain.entities.shopping_cart.exceptions import ShoppingCartDoesNotExists
 from core.order.application.exceptions import OrderDoesNotExists, OrderObjectiveNotExists
-from core.order.application.repository import OrderObjectiveRepository, ClientOrderRepository
+from core.order.application.repository import (
+    ClientOrderRepository, OrderObjectiveRepository, OrderObjectiveStatusCountersRepository,
+)
 from core.order.domain.consts import OrderObjectiveStatus
 from core.order.domain.order import ClientOrder, ClientOrderObjective
+from core.order.domain.order_states import OrderObjectiveStatusSM
 from core.shopping_cart.application.repository import (
     PromoCodeRepository, ShoppingCartItemRepository,
-    ShoppingCartRepository,
+    ShoppingCartRepository, ShoppingCartSnapshotRepository, ShoppingCartTouchesRepository,
 )
 from core.shopping_cart.domain.promo_code import PromoCode, PromoCodeDoesNotExists
 from core.shopping_cart.domain.shopping_cart import ShoppingCart, ShoppingCartItem
 from core.shopping_cart.domain.types import ShoppingCartId
+from core.utils.ttl_lru_cache import TTLLRUCache
 from orders.orm_models import (
-    ChatMessage as ORMChatMessage, ORMClientOrder, ORMOrderObjective, ORMShoppingCart,
+    ChatMessage as ORMChatMessage, ORMChatRoom, ORMClientOrder, ORMOrderObjective, ORMShoppingCart,
     ORMShoppingCartItem,
 )
 from profiles.constants import Membership
 from services.models import ServiceConfig, PromoCode as ORMPromoCode
+from services.repositories import DestinyServiceConfigRepository, DestinyServiceRepository
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +57,30 @@ class DjangoShoppingCartRepository(ShoppingCartRepository):
 
         return self._encode_shopping_cart(res)
 
+    def get_aggregate_by_id(self, shopping_cart_id: str) -> ShoppingCart:
+        res = ORMShoppingCart.objects.select_related('promo_code').prefetch_related(
+            Prefetch(
+                'cart_items',
+                queryset=ORMShoppingCartItem.objects.select_related(
+                    'service', 'service__category'
+                ).prefetch_related('selected_options')
+            ),
+            'promo_code__service',
+        ).filter(id=shopping_cart_id).first()
+
+        if not res:
+            raise ShoppingCartDoesNotExists()
+
+        cart = self._encode_shopping_cart(res)
+        cart.set_current_items([
+            DjangoShoppingCartItemRepository.encode_aggregate_model(item) for item in res.cart_items.all()
+        ])
+
+        if res.promo_code:
+            cart.apply_promo(DjangoPromoCodeRepository.encode_model(res.promo_code))
+
+        return cart
+
     def create(self, shopping_cart: ShoppingCart) -> t.NoReturn:
         ORMShoppingCart.objects.update_or_create(
             id=shopping_cart.id,
@@ -61,6 +97,67 @@ class DjangoShoppingCartRepository(ShoppingCartRepository):
     def delete(self, shopping_cart_id: str):
         ORMShoppingCart.objects.filter(id=shopping_cart_id).delete()
 
+    def list_stale_ids(
+        self,
+        fetched_before: dt.datetime,
+        after_id: t.Optional[ShoppingCartId],
+        limit: int,
+    ) -> t.List[ShoppingCartId]:
+        qs = ORMShoppingCart.objects.filter(
+            ~Exists(ORMClientOrder.objects.filter(order_id=OuterRef('id'))),
+            fetched_at__lt=fetched_before,
+        )
+        if after_id:
+            qs = qs.filter(id__gt=after_id)
+        return list(qs.order_by('id').values_list('id', flat=True)[:limit])
+
+    def delete_stale_bulk(
+        self,
+        shopping_cart_ids: t.List[ShoppingCartId],
+        fetched_before: dt.datetime,
+    ) -> t.Tuple[int, int]:
+        cart_table = ORMShoppingCart._meta.db_table
+        item_table = ORMShoppingCartItem._meta.db_table
+        options_table = ORMShoppingCartItem.selected_options.through._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # carts could be fetched after they were listed, such carts are kept
+            cursor.execute(
+                f'SELECT id FROM {cart_table} WHERE id = ANY(%s) AND fetched_at < %s FOR UPDATE SKIP LOCKED',
+                [shopping_cart_ids, fetched_before]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                return 0, 0
+
+            cursor.execute(
+                f'DELETE FROM {options_table} o USING {item_table} i '
+                f'WHERE o.ormshoppingcartitem_id = i.id AND i.shopping_cart_id = ANY(%s)',
+                [ids]
+            )
+            rows_count = cursor.rowcount
+            cursor.execute(f'DELETE FROM {item_table} WHERE shopping_cart_id = ANY(%s)', [ids])
+            rows_count += cursor.rowcount
+            cursor.execute(f'DELETE FROM {cart_table} WHERE id = ANY(%s)', [ids])
+            carts_count = cursor.rowcount
+
+        return carts_count, rows_count + carts_count
+
+    def update_fetched_at_bulk(self, fetched_at: t.Dict[ShoppingCartId, dt.datetime]):
+        if not fetched_at:
+            return
+
+        values = ', '.join(['(%s, %s::timestamptz)'] * len(fetched_at))
+        params = [param for item in fetched_at.items() for param in item]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {ORMShoppingCart._meta.db_table} AS c SET fetched_at = v.fetched_at '
+                f'FROM (VALUES {values}) AS v (id, fetched_at) '
+                f'WHERE c.id = v.id AND c.fetched_at < v.fetched_at',
+                params
+            )
+
 
 class DjangoShoppingCartItemRepository(ShoppingCartItemRepository):
 
@@ -73,29 +170,52 @@ class DjangoShoppingCartItemRepository(ShoppingCartItemRepository):
     @staticmethod
     def _encode_model(data: ORMShoppingCartItem) -> ShoppingCartItem:
         return ShoppingCartItem(
-            bungie_profile_id=data.bungie_profile.membership_id,
-            character_id=data.character.character_id,
+            bungie_profile_id=data.bungie_profile_id,
+            character_id=data.character_id,
             _id=data.id,
-            shopping_cart_id=data.shopping_cart.id,
-            service_slug=data.service.slug,
+            shopping_cart_id=data.shopping_cart_id,
+            service_slug=data.service_id,
             range_options=data.range_options,
         )
 
+    @classmethod
+    def encode_aggregate_model(cls, data: ORMShoppingCartItem) -> ShoppingCartItem:
+        """
+        Expects `service` to be selected and `selected_options` to be prefetched
+        """
+        item = cls._encode_model(data)
+        item.service = DestinyServiceRepository.encode_model(data.service)
+        item.selected_options = [
+            DestinyServiceConfigRepository.encode_model(o) for o in data.selected_options.all()
+        ]
+        return item
+
     def create(
         self, item: ShoppingCartItem, options: t.List[int],
     ) -> ShoppingCartItem:
-        cart_item = ORMShoppingCartItem.objects.create(
-            bungie_profile_id=item.bungie_profile_id,
-            character_id=item.character_id,
-            id=item.id,
-            service_id=item.service_slug,
-            shopping_cart_id=item.shopping_cart_id,
-            range_options=item.range_options
-        )
-
-        cart_item.selected_options.set(options)
-
-        return self._encode_model(cart_item)
+        return self.create_bulk([item], {item.id: options})[0]
+
+    def create_bulk(
+        self, items: t.List[ShoppingCartItem], options: t.Dict[str, t.List[int]],
+    ) -> t.List[ShoppingCartItem]:
+        ORMShoppingCartItem.objects.bulk_create([
+            ORMShoppingCartItem(
+                bungie_profile_id=item.bungie_profile_id,
+                character_id=item.character_id,
+                id=item.id,
+                service_id=item.service_slug,
+                shopping_cart_id=item.shopping_cart_id,
+                range_options=item.range_options
+            ) for item in items
+        ])
+
+        through = ORMShoppingCartItem.selected_options.through
+        through.objects.bulk_create([
+            through(ormshoppingcartitem_id=item.id, serviceconfig_id=option_id)
+            for item in items for option_id in set(options.get(item.id, []))
+        ])
+
+        return items
 
     def get_by_shopping_cart(self, shopping_cart: ShoppingCart) -> t.List[ShoppingCartItem]:
         items = ORMShoppingCartItem.objects.filter(shopping_cart=shopping_cart.id)
@@ -176,44 +296,195 @@ class DjangoClientOrderRepository(ClientOrderRepository):
         )
 
 
+class RedisOrderObjectiveStatusCountersRepository(OrderObjectiveStatusCountersRepository):
+    """
+    Counters are kept in redis hash: status -> objectives count.
+    Counting is best effort, drift is fixed by reconciliation and nothing is counted when default cache is not redis.
+    """
+    KEY = 'order-objective-statuses'
+    RECONCILED_FIELD = 'reconciled_at'
+
+    @staticmethod
+    def _redis():
+        try:
+            return get_redis_connection('default')
+        except NotImplementedError:
+            return None
+
+    def move(
+        self,
+        from_status: t.Optional[OrderObjectiveStatus],
+        to_status: t.Optional[OrderObjectiveStatus],
+        count: int = 1
+    ):
+        redis = self._redis()
+        if redis is None or from_status == to_status or not count:
+            return
+
+        try:
+            pipe = redis.pipeline(transaction=True)
+            if from_status is not None:
+                pipe.hincrby(self.KEY, OrderObjectiveStatus(from_status).value, -count)
+            if to_status is not None:
+                pipe.hincrby(self.KEY, OrderObjectiveStatus(to_status).value, count)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f'Objectives status counters move {from_status} -> {to_status} is lost: {e}')
+
+    def get(self, statuses: t.List[OrderObjectiveStatus]) -> t.Optional[t.Dict[OrderObjectiveStatus, int]]:
+        redis = self._redis()
+        if redis is None:
+            return None
+
+        try:
+            reconciled_at, *counts = redis.hmget(self.KEY, self.RECONCILED_FIELD, *[s.value for s in statuses])
+        except RedisError as e:
+            logger.warning(f'Objectives status counters are not available: {e}')
+            return None
+
+        if reconciled_at is None:
+            return None
+        return {status: int(count or 0) for status, count in zip(statuses, counts)}
+
+    def reset(self, counts: t.Dict[OrderObjectiveStatus, int]):
+        redis = self._redis()
+        if redis is None:
+            return
+
+        mapping = {status.value: count for status, count in counts.items()}
+        mapping[self.RECONCILED_FIELD] = time.time()
+        try:
+            pipe = redis.pipeline(transaction=True)
+            pipe.delete(self.KEY)
+            pipe.hset(self.KEY, mapping=mapping)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f'Objectives status counters are not reset: {e}')
+
+
 class DjangoOrderObjectiveRepository(OrderObjectiveRepository):
+    IN_PROGRESS_STATUSES = [OrderObjectiveStatus.PENDING_APPROVAL, OrderObjectiveStatus.COMPLETED]
+
+    # shared with ORMOrderObjective signals, which count saves of ORM objects
+    status_counters = RedisOrderObjectiveStatusCountersRepository()
+
+    @classmethod
+    def move_status_counters(cls, moves: t.Iterable[t.Tuple[t.Optional[str], t.Optional[str]]]):
+        """
+        Moves counters by (from status, to status) pairs once the new statuses are committed
+        """
+        moves = collections.Counter(
+            (
+                None if from_status is None else OrderObjectiveStatus(from_status),
+                None if to_status is None else OrderObjectiveStatus(to_status),
+            ) for from_status, to_status in moves if from_status != to_status
+        )
+        if not moves:
+            return
+
+        def move():
+            for (from_status, to_status), count in moves.items():
+                cls.status_counters.move(from_status, to_status, count)
+        transaction.on_commit(move)
+
+    @staticmethod
+    def base_query() -> QuerySet:
+        """
+        Loads everything `_encode` needs
+        """
+        return ORMOrderObjective.objects.select_related('client_order').prefetch_related(
+            Prefetch('selected_options', queryset=ServiceConfig.objects.only('id'))
+        )
 
     def list_pending_approval_orders(self) -> t.List[ClientOrderObjective]:
-        res = ORMOrderObjective.objects.filter(
+        res = self.base_query().filter(
             status=OrderObjectiveStatus.PENDING_APPROVAL
         )
         return list(map(self._encode, res))
 
+    def list_pending_approval_keys(
+        self,
+        changed_before: dt.datetime,
+        after: t.Optional[t.Tuple[dt.datetime, str]],
+        limit: int
+    ) -> t.List[t.Tuple[dt.datetime, str]]:
+        qs = ORMOrderObjective.objects.filter(
+            status=OrderObjectiveStatus.PENDING_APPROVAL.value,
+            status_changed_at__lte=changed_before
+        )
+        if after is not None:
+            after_changed_at, after_id = after
+            qs = qs.filter(
+                Q(status_changed_at__gt=after_changed_at) | Q(status_changed_at=after_changed_at, id__gt=after_id)
+            )
+        return list(qs.order_by('status_changed_at', 'id').values_list('status_changed_at', 'id')[:limit])
+
+    def transition_bulk(self, order_objective_ids: t.List[str], trigger: str, changed_at: dt.datetime) -> int:
+        transition = OrderObjectiveStatusSM.get_transition(trigger)
+        if 'after' in transition or 'before' in transition:
+            raise ValueError(f'Transition {trigger} has callbacks and can not be applied in bulk')
+
+        where, params = 'id = ANY(%s)', [list(order_objective_ids)]
+        if transition['source'] != '*':
+            sources = transition['source'] if isinstance(transition['source'], list) else [transition['source']]
+            where += ' AND status = ANY(%s)'
+            params.append([s.value for s in sources])
+
+        # previous status of every updated row is returned, counters are moved for any source
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH old AS ('
+                f'SELECT id, status FROM {ORMOrderObjective._meta.db_table} '
+                f'WHERE {where} ORDER BY id FOR UPDATE'
+                f') '
+                f'UPDATE {ORMOrderObjective._meta.db_table} AS o '
+                f'SET status = %s, status_changed_at = %s '
+                f'FROM old '
+                f'WHERE o.id = old.id '
+                f'RETURNING old.status, o.status',
+                params + [transition['dest'].value, changed_at]
+            )
+            moves = cursor.fetchall()
+
+        self.move_status_counters(moves)
+        return len(moves)
+
     def count_orders_in_progress(self) -> int:
+        counts = self.status_counters.get(self.IN_PROGRESS_STATUSES)
+        if counts is not None:
+            return sum(counts.values())
+
         res = ORMOrderObjective.objects.filter(
-            status__in=[
-                OrderObjectiveStatus.PENDING_APPROVAL.value, OrderObjectiveStatus.COMPLETED.value
-            ]
+            status__in=[s.value for s in self.IN_PROGRESS_STATUSES]
         )
         return res.count()
 
+    def count_by_status(self) -> t.Dict[OrderObjectiveStatus, int]:
+        res = ORMOrderObjective.objects.order_by().values_list('status').annotate(count=Count('id'))
+        return {OrderObjectiveStatus(status): count for status, count in res}
+
     def get_by_id(self, order_objective_id: str) -> ClientOrderObjective:
         try:
-            obj = ORMOrderObjective.objects.get(id=order_objective_id)
+            obj = self.base_query().get(id=order_objective_id)
             return self._encode(obj)
         except ORMOrderObjective.DoesNotExist:
             raise OrderObjectiveNotExists()
 
     def list_by_booster(self, booster_id: int) -> t.List[ClientOrderObjective]:
-        objs = ORMOrderObjective.objects.filter(
+        objs = self.base_query().filter(
             booster__user__id=booster_id
         )
         return list(map(self._encode, objs))
 
     def list_by_client(self, client_id: int) -> t.List[ClientOrderObjective]:
-        objs = ORMOrderObjective.objects.filter(
+        objs = self.base_query().filter(
             client_order__client__id=client_id
         )
         return list(map(self._encode, objs))
 
     def get_by_user_and_id(self, order_objective_id: str, client_id: int) -> ClientOrderObjective:
         try:
-            objective = ORMOrderObjective.objects.filter(
+            objective = self.base_query().filter(
                 Q(client_order__client_id=client_id) | Q(booster__user__id=client_id),
                 id=order_objective_id,
             ).first()
@@ -225,20 +496,80 @@ class DjangoOrderObjectiveRepository(OrderObjectiveRepository):
             raise OrderObjectiveNotExists()
 
     def save(self, order: ClientOrderObjective):
-        ORMOrderObjective.objects.filter(id=order.id).update(
-            status=order.status,
-            status_changed_at=order.status_changed_at,
-            booster_id=order.booster_id
-        )
+        self.save_many([order])
+
+    def assign_booster(self, order: ClientOrderObjective) -> bool:
+        # only the winner of the race gets a row back, so losers move no counters
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH old AS ('
+                f'SELECT id, status FROM {ORMOrderObjective._meta.db_table} WHERE id = %s FOR UPDATE'
+                f') '
+                f'UPDATE {ORMOrderObjective._meta.db_table} AS o '
+                f'SET status = %s, status_changed_at = %s, booster_id = %s '
+                f'FROM old '
+                f'WHERE o.id = old.id AND o.booster_id IS NULL '
+                f'RETURNING old.status, o.status',
+                [order.id, OrderObjectiveStatus(order.status).value, order.status_changed_at, order.booster_id]
+            )
+            moves = cursor.fetchall()
+        if not moves:
+            return False
+
+        self.move_status_counters(moves)
+        ORMChatRoom.add_for_objectives([order.id])
+        return True
+
+    def transition_many(self, orders: t.List[ClientOrderObjective], trigger: str):
+        # new statuses, chat rooms and outbox tasks of `after` callbacks are committed together
+        with transaction.atomic():
+            super().transition_many(orders, trigger)
+
+    def save_many(self, orders: t.List[ClientOrderObjective]):
+        if not orders:
+            return
+
+        values = ', '.join(['(%s, %s, %s::timestamptz, %s::integer)'] * len(orders))
+        params = [
+            param for order in orders for param in (
+                order.id, OrderObjectiveStatus(order.status).value, order.status_changed_at, order.booster_id
+            )
+        ]
+
+        # `old` rows are locked before the update and are their latest committed versions,
+        # booster assigned concurrently is not overwritten by entity loaded without it
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH old AS ('
+                f'SELECT id, status, booster_id FROM {ORMOrderObjective._meta.db_table} '
+                f'WHERE id = ANY(%s) ORDER BY id FOR UPDATE'
+                f') '
+                f'UPDATE {ORMOrderObjective._meta.db_table} AS o '
+                f'SET status = v.status, status_changed_at = v.status_changed_at, '
+                f'booster_id = COALESCE(v.booster_id, o.booster_id) '
+                f'FROM (VALUES {values}) AS v (id, status, status_changed_at, booster_id), old '
+                f'WHERE o.id = v.id AND old.id = o.id '
+                f'RETURNING o.id, old.status, o.status, old.booster_id, o.booster_id',
+                [[order.id for order in orders]] + params
+            )
+            rows = cursor.fetchall()
+
+        self.move_status_counters((old_status, status) for _, old_status, status, _, _ in rows)
+        assigned = [
+            objective_id for objective_id, _, _, old_booster_id, booster_id in rows
+            if booster_id is not None and booster_id != old_booster_id
+        ]
+        if assigned:
+            ORMChatRoom.add_for_objectives(assigned)
 
     def list_by_orders(self, order_ids: t.List[str]):
-        objs = ORMOrderObjective.objects.filter(
+        objs = self.base_query().filter(
             client_order_id__in=order_ids
         )
         return list(map(self._encode, objs))
 
     def get_by_order(self, order_id: str) -> t.List[ClientOrderObjective]:
-        objs = ORMOrderObjective.objects.prefetch_related('selected_options').filter(
+        objs = self.base_query().filter(
             client_order=order_id
         )
         return list(map(self._encode, objs))
@@ -251,7 +582,7 @@ class DjangoOrderObjectiveRepository(OrderObjectiveRepository):
             service_slug=data.service_id,
             destiny_profile_id=data.destiny_profile_id,
             destiny_character_id=data.destiny_character_id,
-            selected_option_ids=[c.id for c in data.selected_options.filter()],
+            selected_option_ids=[c.id for c in data.selected_options.all()],
             price=data.price,
             range_options=data.range_options,
             status=data.status,
@@ -262,8 +593,8 @@ class DjangoOrderObjectiveRepository(OrderObjectiveRepository):
         )
 
     def create_bulk(self, order_objectives: t.List[ClientOrderObjective]):
-        for order_objective in order_objectives:
-            _orm_obj = ORMOrderObjective(
+        ORMOrderObjective.objects.bulk_create([
+            ORMOrderObjective(
                 id=order_objective.id,
                 client_order_id=order_objective.client_order_id,
                 service_id=order_objective.service_slug,
@@ -274,16 +605,36 @@ class DjangoOrderObjectiveRepository(OrderObjectiveRepository):
                 status_changed_at=order_objective.status_changed_at,
                 booster_id=order_objective.booster_id,
                 created_at=order_objective.created_at
-            )
-            _orm_obj.save()
+            ) for order_objective in order_objectives
+        ])
 
-            for option in ServiceConfig.objects.filter(id__in=order_objective.selected_option_ids):
-                _orm_obj.selected_options.add(option)
+        option_ids = {
+            option_id for order_objective in order_objectives for option_id in order_objective.selected_option_ids
+        }
+        existing_option_ids = set(
+            ServiceConfig.objects.filter(id__in=option_ids).values_list('id', flat=True)
+        ) if option_ids else set()
+
+        through = ORMOrderObjective.selected_options.through
+        through.objects.bulk_create([
+            through(ormorderobjective_id=order_objective.id, serviceconfig_id=option_id)
+            for order_objective in order_objectives
+            for option_id in set(order_objective.selected_option_ids) & existing_option_ids
+        ])
+
+        self.move_status_counters((None, o.status) for o in order_objectives)
 
 
 class DjangoPromoCodeRepository(PromoCodeRepository):
+    """
+    Encoded promo codes are cached in process, PromoCode signals drop changed codes
+    and ttl bounds staleness in other processes.
+    Cached usage_limit is informational only, it is decremented in DB.
+    """
+    cache = TTLLRUCache(maxsize=256, ttl=60)
+
     @staticmethod
-    def _encode_model(data: ORMPromoCode) -> PromoCode:
+    def encode_model(data: ORMPromoCode) -> PromoCode:
         return PromoCode(
             code=data.code,
             service_slugs=[s.slug for s in data.service.all()],
@@ -294,14 +645,123 @@ class DjangoPromoCodeRepository(PromoCodeRepository):
         )
 
     def find_by_code(self, code: str) -> PromoCode:
+        promo = self.cache.get(code)
+        if promo:
+            return promo
+
         try:
             data = ORMPromoCode.objects.prefetch_related('service').get(
                 code=code
             )
-            return self._encode_model(data)
         except ORMPromoCode.DoesNotExist:
             raise PromoCodeDoesNotExists()
 
+        promo = self.encode_model(data)
+        self.cache.set(code, promo)
+        return promo
+
+
+class DjangoCacheShoppingCartSnapshotRepository(ShoppingCartSnapshotRepository):
+    KEY_PREFIX = 'cart-snapshot'
+    VERSION_KEY = f'{KEY_PREFIX}:version'
+    HITS_KEY = f'{KEY_PREFIX}:hits'
+    MISSES_KEY = f'{KEY_PREFIX}:misses'
+    TIMEOUT = 60 * 30
+
+    @staticmethod
+    def _incr(key: str):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+    def _key(self, shopping_cart_id: ShoppingCartId) -> str:
+        # version starts from the current timestamp so an evicted version key never resurrects old snapshots
+        version = cache.get_or_set(self.VERSION_KEY, time.time_ns, timeout=None)
+        return f'{self.KEY_PREFIX}:{version}:{shopping_cart_id}'
+
+    def get(self, shopping_cart_id: ShoppingCartId) -> t.Optional[dict]:
+        snapshot = cache.get(self._key(shopping_cart_id))
+        self._incr(self.MISSES_KEY if snapshot is None else self.HITS_KEY)
+        return snapshot
+
+    def save(self, shopping_cart_id: ShoppingCartId, snapshot: dict):
+        cache.set(self._key(shopping_cart_id), snapshot, timeout=self.TIMEOUT)
+
+    def invalidate(self, shopping_cart_id: ShoppingCartId):
+        cache.delete(self._key(shopping_cart_id))
+
+    def bump_version(self):
+        try:
+            cache.incr(self.VERSION_KEY)
+        except ValueError:
+            cache.set(self.VERSION_KEY, time.time_ns(), timeout=None)
+
+    def stats(self) -> t.Dict[str, int]:
+        values = cache.get_many([self.HITS_KEY, self.MISSES_KEY])
+        return dict(
+            hits=values.get(self.HITS_KEY, 0),
+            misses=values.get(self.MISSES_KEY, 0),
+        )
+
+
+class RedisShoppingCartTouchesRepository(ShoppingCartTouchesRepository):
+    """
+    Touches are kept in redis sorted set: cart id -> last access timestamp.
+    Touching is best effort and does nothing when default cache is not redis.
+    """
+    KEY = 'cart-touches'
+
+    def __init__(self):
+        self._connection = None
+        self._is_resolved = False
+
+    def _redis(self):
+        if not self._is_resolved:
+            try:
+                self._connection = get_redis_connection('default')
+            except NotImplementedError:
+                self._connection = None
+            self._is_resolved = True
+        return self._connection
+
+    def touch(self, shopping_cart_id: ShoppingCartId):
+        redis = self._redis()
+        if redis is None:
+            return
+
+        try:
+            redis.zadd(self.KEY, {shopping_cart_id: time.time()})
+        except RedisError as e:
+            logger.warning(f'Cart {shopping_cart_id} touch is lost: {e}')
+
+    def pop(self, limit: int) -> t.Dict[ShoppingCartId, dt.datetime]:
+        redis = self._redis()
+        if redis is None:
+            return {}
+
+        try:
+            popped = redis.zpopmin(self.KEY, limit)
+        except RedisError as e:
+            logger.warning(f'Cart touches are not popped: {e}')
+            return {}
+
+        return {
+            cart_id.decode(): dt.datetime.fromtimestamp(score, tz=dt.timezone.utc)
+            for cart_id, score in popped
+        }
+
+    def restore(self, touches: t.Dict[ShoppingCartId, dt.datetime]):
+        redis = self._redis()
+        if redis is None or not touches:
+            return
+
+        try:
+            # a cart touched again after pop has a newer score already
+            redis.zadd(self.KEY, {cart_id: at.timestamp() for cart_id, at in touches.items()}, nx=True)
+        except RedisError as e:
+            logger.warning(f'{len(touches)} cart touches are lost: {e}')
+
 
 class DjangoChatRoomRepository(ChatRoomRepository):
 
@@ -311,41 +771,16 @@ class DjangoChatRoomRepository(ChatRoomRepository):
         user_id_2: int,
         role: ChatRole
     ) -> ChatRoom:
-        try:
-            objective = ORMOrderObjective.objects.filter(
-                Q(
-                    Q(client_order__client_id=user_id) & Q(booster__user__id=user_id_2),
-                ) | Q(
-                    Q(client_order__client_id=user_id_2) & Q(booster__user__id=user_id),
-                )
-            ).first()
-            if not objective:
-                raise OrderObjectiveNotExists()
-            chat_room = self._encode_chat_room(objective)
-            return chat_room
-        except ORMOrderObjective.DoesNotExist:
+        client_id, booster_id = (user_id, user_id_2) if role == ChatRole.client else (user_id_2, user_id)
+        if not ORMChatRoom.objects.filter(client_id=client_id, booster_user_id=booster_id).exists():
             raise OrderObjectiveNotExists()
+        return ChatRoom(client_id=client_id, booster_id=booster_id)
 
     def list_rooms_by_user(self, user_id) -> t.List[ChatRoom]:
-        messages = ORMOrderObjective.objects.order_by(
-            'client_order__client_id',
-            'booster__user__id'
-        ).distinct(
-            'client_order__client_id',
-            'booster__user__id'
-        ).filter(
-            Q(client_order__client_id=user_id) |
-            Q(booster__user__id=user_id),
-            booster__isnull=False
-        )
-        return list(map(self._encode_chat_room, messages))
-
-    @staticmethod
-    def _encode_chat_room(order_objective: ORMOrderObjective):
-        return ChatRoom(
-            client_id=order_objective.client_order.client_id,
-            booster_id=order_objective.booster.user.first().id,
-        )
+        rooms = ORMChatRoom.objects.filter(
+            Q(client_id=user_id) | Q(booster_user_id=user_id)
+        ).order_by('client_id', 'booster_user_id').values_list('client_id', 'booster_user_id')
+        return [ChatRoom(client_id=client_id, booster_id=booster_id) for client_id, booster_id in rooms]
 
 
 class DjangoChatMessagesRepository(ChatMessagesRepository):
@@ -354,25 +789,78 @@ class DjangoChatMessagesRepository(ChatMessagesRepository):
             sender_id=message.sender_id,
             receiver_id=message.receiver_id,
             msg=message.text,
-            created_at=message.created_at
+            created_at=message.created_at,
+            conversation_key=ORMChatMessage.make_conversation_key(message.sender_id, message.receiver_id)
         )
 
+    def create_bulk(self, messages: t.List[ChatMessage]):
+        ORMChatMessage.objects.bulk_create([
+            ORMChatMessage(
+                sender_id=message.sender_id,
+                receiver_id=message.receiver_id,
+                msg=message.text,
+                created_at=message.created_at,
+                conversation_key=ORMChatMessage.make_conversation_key(message.sender_id, message.receiver_id)
+            ) for message in messages
+        ])
+
     def list_messages_by_users_pair(self, client_id: int, booster_id: int) -> t.List[ChatMessage]:
         messages = ORMChatMessage.objects.filter(
-            (
-                Q(sender=client_id) &
-                Q(receiver=booster_id)
-            ) |
-            (
-                Q(sender=booster_id) &
-                Q(receiver=client_id)
-            )
-        ).order_by('created_at')
+            conversation_key=ORMChatMessage.make_conversation_key(client_id, booster_id)
+        ).order_by('created_at', 'id')
         return list(map(self._encode, messages))
 
+    def list_page_by_users_pair(
+        self,
+        client_id: int,
+        booster_id: int,
+        limit: int,
+        before: t.Optional[t.Tuple[dt.datetime, int]] = None
+    ) -> t.List[ChatMessage]:
+        messages = ORMChatMessage.objects.filter(
+            conversation_key=ORMChatMessage.make_conversation_key(client_id, booster_id)
+        )
+        if before is not None:
+            before_created_at, before_id = before
+            messages = messages.filter(
+                Q(created_at__lt=before_created_at) | Q(created_at=before_created_at, id__lt=before_id)
+            )
+        messages = list(messages.order_by('-created_at', '-id')[:limit])
+        return list(map(self._encode, messages[::-1]))
+
+    def list_last_by_users_pairs(
+        self,
+        pairs: t.List[t.Tuple[int, int]],
+        limit: int
+    ) -> t.Dict[t.Tuple[int, int], t.List[ChatMessage]]:
+        if not pairs:
+            return {}
+
+        keys = {ORMChatMessage.make_conversation_key(*pair): pair for pair in pairs}
+        messages = ORMChatMessage.objects.raw(
+            f'SELECT id, sender_id, receiver_id, msg, created_at, conversation_key FROM ('
+            f'SELECT id, sender_id, receiver_id, msg, created_at, conversation_key, ROW_NUMBER() OVER ('
+            f'PARTITION BY conversation_key ORDER BY created_at DESC, id DESC'
+            f') AS row_number FROM {ORMChatMessage._meta.db_table} WHERE conversation_key = ANY(%s)'
+            f') AS m WHERE row_number <= %s ORDER BY conversation_key, created_at, id',
+            [list(keys), limit]
+        )
+
+        result = {pair: [] for pair in pairs}
+        for message in messages:
+            result[keys[message.conversation_key]].append(self._encode(message))
+        return result
+
+    def count_unread_by_senders(self, receiver_id: int) -> t.Dict[int, int]:
+        res = ORMChatMessage.objects.filter(
+            receiver_id=receiver_id, is_seen=False
+        ).order_by().values_list('sender_id').annotate(count=Count('id'))
+        return dict(res)
+
     @staticmethod
     def _encode(message: ORMChatMessage) -> ChatMessage:
         return ChatMessage(
+            _id=message.id,
             sender_id=message.sender_id,
             receiver_id=message.receiver_id,
             created_at=message.created_at,
@@ -1,13 +1,16 @@
 from dependency_injector import containers, providers
 
-from core.shopping_cart.application.use_cases.add_to_shopping_cart import AddItemToShoppingCartUseCase
+from core.shopping_cart.application.use_cases.add_to_shopping_cart import (
+    AddItemsToShoppingCartUseCase,
+    AddItemToShoppingCartUseCase,
+)
 from core.shopping_cart.application.use_cases.apply_promo import ApplyPromoUseCase
 from core.shopping_cart.application.use_cases.list_shopping_cart import ListShoppingCartUseCase
 from core.shopping_cart.application.use_cases.remove_cart_item import RemoveCartItemUseCase
 from infrastructure.injectors.service import DestinyServiceInjectors
 from orders.repositories import (
-    DjangoClientOrderRepository, DjangoOrderObjectiveRepository, DjangoPromoCodeRepository,
-    DjangoShoppingCartItemRepository,
+    DjangoCacheShoppingCartSnapshotRepository, DjangoClientOrderRepository, DjangoOrderObjectiveRepository,
+    DjangoPromoCodeRepository, DjangoShoppingCartItemRepository, RedisShoppingCartTouchesRepository,
     DjangoShoppingCartRepository,
 )
 from profiles.repository import (
@@ -39,6 +42,12 @@ class ShoppingCartService(containers.DeclarativeContainer):
     promo_code_repository = providers.Singleton(
         DjangoPromoCodeRepository
     )
+    cart_snapshot_repository = providers.Singleton(
+        DjangoCacheShoppingCartSnapshotRepository
+    )
+    cart_touches_repository = providers.Singleton(
+        RedisShoppingCartTouchesRepository
+    )
 
     add_item_uc = providers.Factory(
         AddItemToShoppingCartUseCase,
@@ -48,6 +57,19 @@ class ShoppingCartService(containers.DeclarativeContainer):
         destiny_character_repository=BungieProfilesService.destiny_character_repository,
         service_repository=DestinyServiceInjectors.service_rep,
         service_configs_repository=DestinyServiceInjectors.service_configs_rep,
+        service_price_table_repository=DestinyServiceInjectors.service_price_table_rep,
+        promo_code_repository=promo_code_repository
+    )
+
+    add_items_uc = providers.Factory(
+        AddItemsToShoppingCartUseCase,
+        shopping_cart_repository=shopping_cart_repository,
+        shopping_cart_items_repository=shopping_cart_items_repository,
+        destiny_bungie_profile_repository=BungieProfilesService.destiny_bungie_profile_repository,
+        destiny_character_repository=BungieProfilesService.destiny_character_repository,
+        service_repository=DestinyServiceInjectors.service_rep,
+        service_configs_repository=DestinyServiceInjectors.service_configs_rep,
+        service_price_table_repository=DestinyServiceInjectors.service_price_table_rep,
         promo_code_repository=promo_code_repository
     )
 
@@ -59,7 +81,10 @@ class ShoppingCartService(containers.DeclarativeContainer):
         destiny_character_repository=BungieProfilesService.destiny_character_repository,
         service_repository=DestinyServiceInjectors.service_rep,
         service_configs_repository=DestinyServiceInjectors.service_configs_rep,
-        promo_code_repository=promo_code_repository
+        service_price_table_repository=DestinyServiceInjectors.service_price_table_rep,
+        promo_code_repository=promo_code_repository,
+        cart_snapshot_repository=cart_snapshot_repository,
+        cart_touches_repository=cart_touches_repository
     )
     remove_cart_item_uc = providers.Factory(
         RemoveCartItemUseCase,
@@ -67,6 +92,7 @@ class ShoppingCartService(containers.DeclarativeContainer):
         cart_repository=shopping_cart_repository,
         service_repository=DestinyServiceInjectors.service_rep,
         service_configs_repository=DestinyServiceInjectors.service_configs_rep,
+        service_price_table_repository=DestinyServiceInjectors.service_price_table_rep,
         promo_code_repository=promo_code_repository
     )
 
@@ -76,5 +102,6 @@ class ShoppingCartService(containers.DeclarativeContainer):
         shopping_cart_items_repository=shopping_cart_items_repository,
         service_repository=DestinyServiceInjectors.service_rep,
         service_configs_repository=DestinyServiceInjectors.service_configs_rep,
+        service_price_table_repository=DestinyServiceInjectors.service_price_table_rep,
         promo_code_repository=promo_code_repository
     )
@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from orders.orm_models import ORMChatRoom, ORMOrderObjective
+from orders.repositories import DjangoOrderObjectiveRepository, DjangoPromoCodeRepository
+from orders.services import ShoppingCartService
+from services.models import PromoCode, Service, ServiceConfig
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=ServiceConfig)
+@receiver(post_delete, sender=ServiceConfig)
+@receiver(post_save, sender=PromoCode)
+@receiver(post_delete, sender=PromoCode)
+@receiver(m2m_changed, sender=PromoCode.service.through)
+def bump_cart_snapshots_version(sender, **kwargs):
+    # readers of the new version must not see rows of uncommitted transaction
+    transaction.on_commit(lambda: ShoppingCartService.cart_snapshot_repository().bump_version())
+
+
+@receiver(post_save, sender=PromoCode)
+@receiver(post_delete, sender=PromoCode)
+def drop_cached_promo_code(sender, instance: PromoCode, **kwargs):
+    DjangoPromoCodeRepository.cache.delete(instance.code)
+
+
+@receiver(m2m_changed, sender=PromoCode.service.through)
+def drop_cached_promo_codes(sender, instance, pk_set, reverse, **kwargs):
+    if not reverse:
+        DjangoPromoCodeRepository.cache.delete(instance.code)
+    elif pk_set:
+        for code in pk_set:
+            DjangoPromoCodeRepository.cache.delete(code)
+    else:
+        # clear from service side
+        DjangoPromoCodeRepository.cache.clear()
+
+
+@receiver(post_save, sender=ORMOrderObjective)
+def add_chat_room(sender, instance: ORMOrderObjective, update_fields=None, **kwargs):
+    if instance.booster_id and (update_fields is None or 'booster' in update_fields):
+        ORMChatRoom.add_for_objectives([instance.id])
+
+
+@receiver(post_init, sender=ORMOrderObjective)
+def remember_objective_status(sender, instance: ORMOrderObjective, **kwargs):
+    # deferred status is not loaded here, its changes are not counted
+    instance._saved_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=ORMOrderObjective)
+def move_objective_status_counters(sender, instance: ORMOrderObjective, created, **kwargs):
+    previous = None if created else instance._saved_status
+    if created or previous is not None:
+        DjangoOrderObjectiveRepository.move_status_counters([(previous, instance.status)])
+    instance._saved_status = instance.status
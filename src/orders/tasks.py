@@ -20,6 +20,7 @@ from core.order.application.use_cases.status_callbacks.invalid_credentials impor
 from core.order.application.use_cases.status_callbacks.order_paused_callback import BoosterPausedOrderDTORequest
 from core.order.application.use_cases.status_callbacks.order_pending_approval import \
     OrderPendingApprovalCallbackDTORequest
+from core.shopping_cart.application.use_cases.delete_stale_carts import DeleteStaleShoppingCartsDTORequest
 from infrastructure.injectors.application import ApplicationContainer
 
 from notificators.new_email import DjangoEmailNotificator
@@ -434,3 +435,29 @@ def accept_pending_orders_task(
     )
     uc.execute(dto)
 
+
+@shared_task
+@inject
+def reconcile_order_objective_status_counters_task(
+    uc=Provide[ApplicationContainer.orders_uc.reconcile_status_counters_uc]
+):
+    uc.execute()
+
+
+@shared_task
+@inject
+def flush_shopping_cart_touches_task(
+    uc=Provide[ApplicationContainer.cart_uc.flush_cart_touches_uc]
+):
+    uc.execute()
+
+
+@shared_task
+@inject
+def delete_stale_shopping_carts_task(
+    uc=Provide[ApplicationContainer.cart_uc.delete_stale_carts_uc]
+):
+    dto = DeleteStaleShoppingCartsDTORequest(
+        now=timezone.now()
+    )
+    uc.execute(dto)
@@ -0,0 +1,166 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.domain.utils import generate_id
+from core.order.application.repository import MQEventsRepository
+from core.shopping_cart.application.use_cases.add_to_shopping_cart import (
+    AddItemToShoppingCartDTOInput,
+    AddItemToShoppingCartUseCase,
+    BungieDestinyCharacterDTO,
+    BungieProfileDTO,
+    ItemAddedToCart,
+)
+from core.shopping_cart.application.use_cases.apply_promo import ApplyPromoUseCase, ApplyPromoUseCaseDTOInput
+from core.shopping_cart.application.use_cases.cart_payed import CartPayedDTORequest, CartPayedUseCase
+from core.shopping_cart.application.use_cases.list_shopping_cart import (
+    ListShoppingCartDTOInput,
+    ListShoppingCartUseCase,
+)
+from orders.repositories import (
+    DjangoCacheShoppingCartSnapshotRepository, DjangoClientOrderRepository, DjangoOrderObjectiveRepository,
+    DjangoPromoCodeRepository, DjangoShoppingCartItemRepository, DjangoShoppingCartRepository,
+    RedisShoppingCartTouchesRepository,
+)
+from profiles.constants import CharacterClasses, Membership
+from profiles.repository import (
+    DjangoClientRepository, DjangoDestinyBungieProfileRepository, DjangoDestinyCharacterRepository,
+    DjangoProfileCredentialsRepository,
+)
+from services.repositories import (
+    DestinyServiceConfigRepository, DestinyServiceRepository,
+    DjangoServicePriceTableRepository,
+)
+
+CART_SIZES = [1, 10, 50]
+
+# queries budget per execute, a regression fails the suite
+ADD_ITEM_QUERIES = 21
+LIST_CART_QUERIES = 5
+APPLY_PROMO_QUERIES = 5
+CART_PAYED_QUERIES = 21
+
+
+@pytest.fixture()
+def repositories():
+    return dict(
+        service_repository=DestinyServiceRepository(),
+        service_configs_repository=DestinyServiceConfigRepository(),
+        promo_code_repository=DjangoPromoCodeRepository(),
+        service_price_table_repository=DjangoServicePriceTableRepository(),
+    )
+
+
+@pytest.fixture()
+def add_item_uc(repositories):
+    return AddItemToShoppingCartUseCase(
+        shopping_cart_repository=DjangoShoppingCartRepository(),
+        shopping_cart_items_repository=DjangoShoppingCartItemRepository(),
+        destiny_bungie_profile_repository=DjangoDestinyBungieProfileRepository(),
+        destiny_character_repository=DjangoDestinyCharacterRepository(),
+        **repositories
+    )
+
+
+@pytest.fixture()
+def list_cart_uc(repositories):
+    return ListShoppingCartUseCase(
+        shopping_cart_repository=DjangoShoppingCartRepository(),
+        shopping_cart_items_repository=DjangoShoppingCartItemRepository(),
+        destiny_bungie_profile_repository=DjangoDestinyBungieProfileRepository(),
+        destiny_character_repository=DjangoDestinyCharacterRepository(),
+        cart_snapshot_repository=DjangoCacheShoppingCartSnapshotRepository(),
+        cart_touches_repository=RedisShoppingCartTouchesRepository(),
+        **repositories
+    )
+
+
+@pytest.fixture()
+def apply_promo_uc(repositories):
+    return ApplyPromoUseCase(
+        shopping_cart_repository=DjangoShoppingCartRepository(),
+        shopping_cart_items_repository=DjangoShoppingCartItemRepository(),
+        **repositories
+    )
+
+
+@pytest.fixture()
+def cart_payed_uc(repositories):
+    return CartPayedUseCase(
+        cart_repository=DjangoShoppingCartRepository(),
+        cart_item_repository=DjangoShoppingCartItemRepository(),
+        order_repository=DjangoClientOrderRepository(),
+        order_objective_repository=DjangoOrderObjectiveRepository(),
+        clients_repository=DjangoClientRepository(),
+        profile_credentials_repository=DjangoProfileCredentialsRepository(),
+        destiny_bungie_profile_repository=DjangoDestinyBungieProfileRepository(),
+        events_repository=MagicMock(spec=MQEventsRepository),
+        **repositories
+    )
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('items_count', CART_SIZES)
+def test_add_item_to_cart(
+    benchmark, add_item_uc, db_shopping_cart, db_options_service, db_destiny_profile, db_destiny_character,
+    items_count
+):
+    cart = db_shopping_cart(items_count, promo_code=False)
+    dto = AddItemToShoppingCartDTOInput(
+        cart_id=cart.id,
+        adding_to_cart=ItemAddedToCart(
+            bungie_profile=BungieProfileDTO(
+                membership_id=db_destiny_profile.membership_id,
+                membership_type=Membership(db_destiny_profile.membership_type),
+                username=db_destiny_profile.username
+            ),
+            character=BungieDestinyCharacterDTO(
+                character_id=db_destiny_character.character_id,
+                character_class=CharacterClasses(db_destiny_character.character_class),
+                bungie_profile_id=db_destiny_profile.membership_id
+            ),
+            option_ids=list(db_options_service.configs.values_list('id', flat=True)),
+            service_slug=db_options_service.slug,
+        )
+    )
+
+    result = benchmark(lambda: add_item_uc.execute(dto))
+
+    assert result.queries <= ADD_ITEM_QUERIES
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('items_count', CART_SIZES)
+def test_list_shopping_cart(benchmark, list_cart_uc, db_shopping_cart, items_count):
+    dto = ListShoppingCartDTOInput(cart_id=db_shopping_cart(items_count, promo_code=False).id)
+
+    result = benchmark(lambda: list_cart_uc.execute(dto))
+
+    assert result.queries <= LIST_CART_QUERIES
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('items_count', CART_SIZES)
+def test_apply_promo(benchmark, apply_promo_uc, db_shopping_cart, db_promo_code, items_count):
+    dto = ApplyPromoUseCaseDTOInput(cart_id=db_shopping_cart(items_count, promo_code=False).id, code=db_promo_code.code)
+
+    result = benchmark(lambda: apply_promo_uc.execute(dto))
+
+    assert result.queries <= APPLY_PROMO_QUERIES
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('items_count', CART_SIZES)
+def test_cart_payed(benchmark, cart_payed_uc, db_shopping_cart, items_count):
+    def setup():
+        return CartPayedDTORequest(
+            cart_id=db_shopping_cart(items_count, promo_code=False).id,
+            payment_id=generate_id(),
+            user_email='benchmark@littlelight.store',
+            pay_with_cashback=Decimal(0),
+        ),
+
+    result = benchmark(cart_payed_uc.execute, setup=setup)
+
+    assert result.queries <= CART_PAYED_QUERIES
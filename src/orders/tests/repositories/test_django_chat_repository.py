@@ -0,0 +1,272 @@
+import datetime as dt
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from pydantic import ValidationError
+
+from core.application.repositories import EventNotificationRepository
+from core.chat.application.use_cases.create_chat_message import (
+    CreateChatMessageDTOInput, CreateChatMessageDTOOutput, CreateChatMessageUseCase,
+)
+from core.chat.application.use_cases.list_chat_history import (
+    ChatHistoryCursorDTO, ListChatHistoryDTOInput, ListChatHistoryUseCase,
+)
+from core.chat.application.use_cases.list_user_rooms import ListUserRoomsDTOInput, ListUserRoomsUseCase
+from core.chat.application.use_cases.persist_chat_messages import (
+    PersistChatMessagesDTOInput, PersistChatMessagesUseCase,
+)
+from core.chat.domain.chat_room import ChatMessage, ChatRole
+from core.clients.application.repository import ClientsRepository
+from core.clients.domain.client import Client
+from core.order.application.exceptions import OrderObjectiveNotExists
+from core.order.application.repository import MQEventsRepository
+from orders.orm_models import ChatMessage as ORMChatMessage, ORMOrderObjective
+from orders.repositories import DjangoChatMessagesRepository, DjangoChatRoomRepository
+from profiles.models import User
+from profiles.repository import DjangoClientRepository
+
+
+@pytest.fixture()
+def messages_repository():
+    return DjangoChatMessagesRepository()
+
+
+@pytest.fixture()
+def db_chat_room(db_order, db_client, db_booster_user, db_service, db_destiny_profile, db_destiny_character):
+    db_order.client = db_client
+    db_order.save()
+    db_booster_user.booster_profile.avatar = 'boosters/avatar.png'
+    db_booster_user.booster_profile.save()
+    ORMOrderObjective.objects.create(
+        client_order=db_order,
+        price=100,
+        service=db_service,
+        destiny_profile=db_destiny_profile,
+        destiny_character=db_destiny_character,
+        booster=db_booster_user.booster_profile
+    )
+    return db_client, db_booster_user
+
+
+@pytest.fixture()
+def db_chat_messages(db_chat_room):
+    client, booster = db_chat_room
+    created_at = dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+
+    def func(count: int):
+        return [
+            ORMChatMessage.objects.create(
+                sender=client if i % 2 else booster,
+                receiver=booster if i % 2 else client,
+                msg=f'message {i}',
+                # pairs of messages sent at the same time are ordered by id
+                created_at=created_at + dt.timedelta(seconds=i // 2)
+            ) for i in range(count)
+        ]
+    return func
+
+
+@pytest.mark.django_db()
+def test_list_page_by_users_pair(messages_repository, db_chat_room, db_chat_messages):
+    client, booster = db_chat_room
+    messages = db_chat_messages(7)
+
+    pages = []
+    before = None
+    while True:
+        page = messages_repository.list_page_by_users_pair(client.id, booster.id, limit=3, before=before)
+        if not page:
+            break
+        pages.append([m.id for m in page])
+        before = (page[0].created_at, page[0].id)
+
+    assert pages == [
+        [m.id for m in messages[4:]],
+        [m.id for m in messages[1:4]],
+        [messages[0].id],
+    ]
+
+
+@pytest.mark.django_db()
+def test_list_rooms_last_messages(messages_repository, db_chat_room, db_chat_messages):
+    client, booster = db_chat_room
+    messages = db_chat_messages(5)
+    uc = ListUserRoomsUseCase(DjangoChatRoomRepository(), messages_repository, DjangoClientRepository())
+
+    result = uc.execute(ListUserRoomsDTOInput(role=ChatRole.client, user_id=client.id, messages_limit=2))
+
+    room, = result.rooms
+    assert [m.id for m in room.messages] == [m.id for m in messages[-2:]]
+    assert room.has_more
+    # messages from booster to client
+    assert room.unread_count == 3
+
+
+@pytest.mark.django_db()
+def test_list_chat_history(messages_repository, db_chat_room, db_chat_messages):
+    client, booster = db_chat_room
+    messages = db_chat_messages(5)
+    uc = ListChatHistoryUseCase(DjangoChatRoomRepository(), messages_repository)
+
+    result = uc.execute(ListChatHistoryDTOInput(
+        role=ChatRole.booster,
+        user_id=booster.id,
+        receiver_id=client.id,
+        before=ChatHistoryCursorDTO(created_at=messages[3].created_at, id=messages[3].id),
+        limit=2
+    ))
+
+    assert [m.id for m in result.messages] == [messages[1].id, messages[2].id]
+    assert result.has_more
+
+
+@pytest.mark.parametrize('limit', [0, -1])
+def test_list_chat_history_limit_validated(limit):
+    with pytest.raises(ValidationError):
+        ListChatHistoryDTOInput(
+            role=ChatRole.booster,
+            user_id=1,
+            receiver_id=2,
+            before=ChatHistoryCursorDTO(created_at=dt.datetime(2020, 1, 1), id=1),
+            limit=limit
+        )
+
+
+@pytest.mark.django_db()
+def test_conversation_key_is_same_for_both_directions(db_chat_room, db_chat_messages):
+    client, booster = db_chat_room
+    to_booster, to_client = db_chat_messages(2)[::-1]
+
+    assert to_booster.sender_id == client.id
+    assert to_client.sender_id == booster.id
+    key = f'{min(client.id, booster.id)}:{max(client.id, booster.id)}'
+    assert to_booster.conversation_key == to_client.conversation_key == key
+
+
+@pytest.mark.django_db()
+def test_backfill_conversation_keys(db_chat_room, db_chat_messages):
+    client, booster = db_chat_room
+    db_chat_messages(3)
+    # written by instances without conversation keys
+    ORMChatMessage.objects.update(conversation_key=None)
+
+    call_command('backfill_chat_conversation_keys', batch_size=2)
+
+    assert set(ORMChatMessage.objects.values_list('conversation_key', flat=True)) == {
+        ORMChatMessage.make_conversation_key(client.id, booster.id)
+    }
+
+
+@pytest.mark.django_db()
+def test_list_last_by_users_pairs(messages_repository, db_chat_room, db_chat_messages, django_assert_num_queries):
+    client, booster = db_chat_room
+    messages = db_chat_messages(5)
+    other = User.objects.create(username='other', email='other@test.com')
+    other_message = ORMChatMessage.objects.create(
+        sender=other, receiver=client, msg='other', created_at=messages[-1].created_at
+    )
+
+    with django_assert_num_queries(1):
+        result = messages_repository.list_last_by_users_pairs(
+            [(client.id, booster.id), (client.id, other.id), (booster.id, other.id)], limit=3
+        )
+
+    assert [m.id for m in result[(client.id, booster.id)]] == [m.id for m in messages[-3:]]
+    assert [m.id for m in result[(client.id, other.id)]] == [other_message.id]
+    assert result[(booster.id, other.id)] == []
+
+
+@pytest.mark.django_db()
+def test_create_bulk(messages_repository, db_chat_room, django_assert_num_queries):
+    client, booster = db_chat_room
+    created_at = dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+
+    with django_assert_num_queries(1):
+        messages_repository.create_bulk([
+            ChatMessage(sender_id=client.id, receiver_id=booster.id, created_at=created_at, text='hello'),
+            ChatMessage(sender_id=booster.id, receiver_id=client.id, created_at=created_at, text='hi'),
+        ])
+
+    assert [m.text for m in messages_repository.list_messages_by_users_pair(client.id, booster.id)] == ['hello', 'hi']
+
+
+@pytest.mark.django_db()
+def test_get_chat_room(db_chat_room, django_assert_num_queries):
+    client, booster = db_chat_room
+    repository = DjangoChatRoomRepository()
+
+    with django_assert_num_queries(1):
+        room = repository.get_chat_room(booster.id, client.id, ChatRole.booster)
+
+    assert (room.client_id, room.booster_id) == (client.id, booster.id)
+    with pytest.raises(OrderObjectiveNotExists):
+        repository.get_chat_room(client.id, booster.id, ChatRole.booster)
+
+
+@pytest.mark.django_db()
+def test_list_rooms_by_user(db_chat_room, django_assert_num_queries):
+    client, booster = db_chat_room
+    repository = DjangoChatRoomRepository()
+
+    with django_assert_num_queries(1):
+        client_rooms = repository.list_rooms_by_user(client.id)
+
+    assert [(r.client_id, r.booster_id) for r in client_rooms] == [(client.id, booster.id)]
+    booster_rooms = repository.list_rooms_by_user(booster.id)
+    assert [(r.client_id, r.booster_id) for r in booster_rooms] == [(client.id, booster.id)]
+
+
+@pytest.mark.django_db()
+def test_create_message_in_known_room_is_not_authorized_again(db_chat_room, django_assert_num_queries):
+    client, booster = db_chat_room
+    uc = CreateChatMessageUseCase(DjangoChatRoomRepository())
+
+    with django_assert_num_queries(0):
+        message = uc.execute(CreateChatMessageDTOInput(
+            role=ChatRole.booster,
+            text='hello',
+            user_id=booster.id,
+            receiver_id=client.id,
+            known_rooms=frozenset({(client.id, booster.id)})
+        ))
+
+    assert (message.sender_id, message.receiver_id) == (booster.id, client.id)
+
+
+@pytest.mark.django_db()
+def test_persist_chat_messages_kept_when_notification_write_fails(messages_repository, db_chat_room):
+    client, booster = db_chat_room
+    users_repository = MagicMock(spec=ClientsRepository)
+    users_repository.list_by_ids.return_value = [
+        Client(_id=client.id, email='client@test.com', username='client'),
+        Client(_id=booster.id, email='booster@test.com', username='booster'),
+    ]
+
+    def save(user):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 / 0')
+
+    users_repository.save.side_effect = save
+    uc = PersistChatMessagesUseCase(
+        chat_messages_repository=messages_repository,
+        event_repository=MagicMock(spec=EventNotificationRepository),
+        users_repository=users_repository,
+        events_repository=MagicMock(spec=MQEventsRepository),
+        savepoint=transaction.atomic
+    )
+    created_at = dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+
+    with transaction.atomic():
+        result = uc.execute(PersistChatMessagesDTOInput(messages=[
+            CreateChatMessageDTOOutput(
+                sender_id=client.id, receiver_id=booster.id, created_at=created_at, text='hello', role=ChatRole.client
+            ),
+            CreateChatMessageDTOOutput(
+                sender_id=booster.id, receiver_id=client.id, created_at=created_at, text='hi', role=ChatRole.booster
+            ),
+        ]))
+
+    assert result.notified_receivers == 0
+    assert ORMChatMessage.objects.count() == 2
@@ -1,6 +1,26 @@
+import datetime as dt
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
 import pytest
+from django.db import DatabaseError
+from redis.exceptions import RedisError
+from transitions import MachineError
 
-from orders.repositories import DjangoOrderObjectiveRepository
+from core.domain.utils import generate_id
+from core.order.application.repository import OrderObjectiveStatusCountersRepository
+from core.order.application.use_cases.accept_pending_approval_orders_uc import (
+    AcceptPendingApprovalOrdersDTORequest, AcceptPendingApprovalOrdersUseCase,
+)
+from core.order.application.use_cases.reconcile_status_counters_uc import (
+    ReconcileOrderObjectiveStatusCountersUseCase,
+)
+from core.order.domain.consts import OrderObjectiveStatus
+from core.order.domain.order_states import OrderObjectiveStatusSM
+from core.order.domain.order import ClientOrderObjective
+from orders.orm_models import ORMChatRoom, ORMOrderObjective, ORMOutboxMessage
+from orders.repositories import DjangoOrderObjectiveRepository, RedisOrderObjectiveStatusCountersRepository
+from profiles.models import BoosterUser
 
 
 @pytest.fixture()
@@ -16,3 +36,380 @@ def test_list_order_objectives_by_orders(
 ):
     list_by_orders = repository.list_by_orders([client_order.id])
     print(list_by_orders)
+
+
+@pytest.fixture()
+def db_order_objectives(
+    db_order,
+    db_client,
+    db_booster_user,
+    db_service,
+    db_service_configs,
+    db_destiny_profile,
+    db_destiny_character
+):
+    db_order.client = db_client
+    db_order.save()
+
+    def func(count: int):
+        for _ in range(count):
+            obj = ORMOrderObjective.objects.create(
+                client_order=db_order,
+                price=100,
+                service=db_service,
+                status=OrderObjectiveStatus.PENDING_APPROVAL.value,
+                status_changed_at=dt.datetime.now(),
+                destiny_profile=db_destiny_profile,
+                destiny_character=db_destiny_character,
+                booster=db_booster_user.booster_profile
+            )
+            obj.selected_options.add(db_service_configs)
+    return func
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('count', [1, 5])
+@pytest.mark.parametrize('method', [
+    'list_by_booster', 'list_by_client', 'list_by_orders', 'list_pending_approval_orders', 'get_by_order'
+])
+def test_list_queries_count(
+    repository,
+    db_order_objectives,
+    db_order,
+    db_client,
+    db_booster_user,
+    db_service_configs,
+    django_assert_num_queries,
+    method,
+    count
+):
+    db_order_objectives(count)
+    args = dict(
+        list_by_booster=(db_booster_user.id,),
+        list_by_client=(db_client.id,),
+        list_by_orders=([db_order.id],),
+        list_pending_approval_orders=(),
+        get_by_order=(db_order.id,),
+    )[method]
+
+    # objectives with client orders, selected options
+    with django_assert_num_queries(2):
+        objectives = getattr(repository, method)(*args)
+
+    assert len(objectives) == count
+    assert all(o.selected_option_ids == [db_service_configs.id] for o in objectives)
+    assert all(o.client_id == db_client.id for o in objectives)
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('count', [1, 10])
+def test_create_bulk(
+    repository,
+    db_order,
+    db_client,
+    db_service,
+    db_service_configs,
+    db_destiny_profile,
+    db_destiny_character,
+    django_assert_num_queries,
+    count
+):
+    objectives = [
+        ClientOrderObjective(
+            _id=generate_id(),
+            client_order_id=db_order.id,
+            service_slug=db_service.slug,
+            destiny_character_id=db_destiny_character.pk,
+            destiny_profile_id=db_destiny_profile.pk,
+            selected_option_ids=[db_service_configs.id, -1],
+            range_options=None,
+            price=Decimal(100),
+            status=OrderObjectiveStatus.PENDING_APPROVAL,
+            status_changed_at=dt.datetime.now(),
+            created_at=dt.datetime.now(),
+            client_id=db_client.id,
+        ) for _ in range(count)
+    ]
+
+    # objectives, options validation, options
+    with django_assert_num_queries(3):
+        repository.create_bulk(objectives)
+
+    created = repository.list_by_orders([db_order.id])
+    assert len(created) == count
+    assert all(o.selected_option_ids == [db_service_configs.id] for o in created)
+
+
+@pytest.mark.django_db()
+def test_accept_pending_approval_orders(repository, db_order_objectives, django_assert_num_queries):
+    now = dt.datetime.now()
+    db_order_objectives(5)
+    objectives = list(ORMOrderObjective.objects.order_by('id'))
+    for i, o in enumerate(objectives):
+        o.status_changed_at = now - dt.timedelta(days=2, hours=i - 1)
+    objectives[-1].status = OrderObjectiveStatus.IN_PROGRESS.value
+    ORMOrderObjective.objects.bulk_update(objectives, ['status', 'status_changed_at'])
+
+    uc = AcceptPendingApprovalOrdersUseCase(order_objectives_repository=repository)
+    uc.BATCH_SIZE = 2
+
+    # full and partial batch, keys and transition each
+    with django_assert_num_queries(4):
+        result = uc.execute(AcceptPendingApprovalOrdersDTORequest(now=now))
+
+    assert result.accepted == 3
+    statuses = dict(ORMOrderObjective.objects.values_list('id', 'status'))
+    assert statuses == {
+        objectives[0].id: OrderObjectiveStatus.PENDING_APPROVAL.value,
+        objectives[1].id: OrderObjectiveStatus.COMPLETED.value,
+        objectives[2].id: OrderObjectiveStatus.COMPLETED.value,
+        objectives[3].id: OrderObjectiveStatus.COMPLETED.value,
+        objectives[4].id: OrderObjectiveStatus.IN_PROGRESS.value,
+    }
+
+
+@pytest.mark.django_db()
+def test_transition_bulk_validates_source(repository, db_order_objectives):
+    db_order_objectives(1)
+    objective = ORMOrderObjective.objects.get()
+    objective.status = OrderObjectiveStatus.IN_PROGRESS.value
+    objective.save()
+
+    assert repository.transition_bulk([objective.id], OrderObjectiveStatusSM.SET_COMPLETED, dt.datetime.now()) == 0
+
+    with pytest.raises(ValueError):
+        repository.transition_bulk([objective.id], OrderObjectiveStatusSM.SET_PENDING_APPROVAL, dt.datetime.now())
+
+
+@pytest.mark.django_db()
+def test_save_many(repository, db_order_objectives, db_order, db_booster_user, django_assert_num_queries):
+    db_order_objectives(3)
+    ORMOrderObjective.objects.update(booster=None)
+    objectives = repository.get_by_order(db_order.id)
+    changed_at = dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+    for o in objectives:
+        o.status = OrderObjectiveStatus.IN_PROGRESS
+        o.status_changed_at = changed_at
+    # assigned after objectives were loaded
+    ORMOrderObjective.objects.update(booster=db_booster_user.booster_profile)
+
+    with django_assert_num_queries(1):
+        repository.save_many(objectives)
+
+    assert set(ORMOrderObjective.objects.values_list('status', 'status_changed_at', 'booster_id')) == {
+        (OrderObjectiveStatus.IN_PROGRESS.value, changed_at, db_booster_user.booster_profile.id)
+    }
+
+
+@pytest.mark.django_db()
+def test_save_adds_chat_rooms_of_new_boosters(
+    repository, db_order_objectives, db_order, db_client, db_booster_user, django_assert_num_queries
+):
+    db_order.client = db_client
+    db_order.save()
+    db_order_objectives(2)
+    ORMChatRoom.objects.all().delete()
+    objectives = repository.get_by_order(db_order.id)
+
+    # booster is not changed
+    with django_assert_num_queries(1):
+        repository.save(objectives[0])
+    assert not ORMChatRoom.objects.exists()
+
+    ORMOrderObjective.objects.update(booster=None)
+    # update and chat room insert
+    with django_assert_num_queries(2):
+        repository.save_many(objectives)
+
+    assert list(ORMChatRoom.objects.values_list('client_id', 'booster_user_id')) == [
+        (db_client.id, db_booster_user.id)
+    ]
+
+
+@pytest.mark.django_db()
+def test_transition_many_runs_callbacks_after_save(repository, db_order_objectives, db_order):
+    db_order_objectives(2)
+    objectives = repository.get_by_order(db_order.id)
+    for o in objectives:
+        o.status = OrderObjectiveStatus.IN_PROGRESS
+
+    def send_task(task, order_objective_id):
+        saved = ORMOrderObjective.objects.get(id=order_objective_id)
+        assert saved.status == OrderObjectiveStatus.PENDING_APPROVAL.value
+
+    with patch('orders.outbox.send_task', side_effect=send_task) as task:
+        repository.transition_many(objectives, OrderObjectiveStatusSM.SET_PENDING_APPROVAL)
+
+    assert task.call_count == 2
+
+
+@pytest.mark.django_db()
+def test_transition_many_rolled_back_when_outbox_fails(repository, db_order_objectives, db_order):
+    db_order_objectives(1)
+    ORMOrderObjective.objects.update(status=OrderObjectiveStatus.IN_PROGRESS.value)
+    objectives = repository.get_by_order(db_order.id)
+
+    with patch.object(ORMOutboxMessage.objects, 'create', side_effect=DatabaseError('outbox is not written')):
+        with pytest.raises(DatabaseError):
+            repository.transition_many(objectives, OrderObjectiveStatusSM.SET_PENDING_APPROVAL)
+
+    assert ORMOrderObjective.objects.get().status == OrderObjectiveStatus.IN_PROGRESS.value
+
+
+@pytest.mark.django_db()
+def test_transition_many_not_allowed(repository, db_order_objectives, db_order):
+    db_order_objectives(2)
+    objectives = repository.get_by_order(db_order.id)
+    objectives[-1].status = OrderObjectiveStatus.IN_PROGRESS
+
+    with pytest.raises(MachineError):
+        repository.transition_many(objectives, OrderObjectiveStatusSM.SET_COMPLETED)
+
+    assert set(ORMOrderObjective.objects.values_list('status', flat=True)) == {
+        OrderObjectiveStatus.PENDING_APPROVAL.value
+    }
+
+
+@pytest.fixture()
+def status_counters():
+    counters = MagicMock(spec=OrderObjectiveStatusCountersRepository)
+    with patch.object(DjangoOrderObjectiveRepository, 'status_counters', counters):
+        yield counters
+
+
+@pytest.mark.django_db()
+def test_count_orders_in_progress_from_counters(repository, status_counters, django_assert_num_queries):
+    status_counters.get.return_value = {
+        OrderObjectiveStatus.PENDING_APPROVAL: 2, OrderObjectiveStatus.COMPLETED: 3
+    }
+
+    with django_assert_num_queries(0):
+        assert repository.count_orders_in_progress() == 5
+
+
+@pytest.mark.django_db()
+def test_count_orders_in_progress_not_reconciled(repository, status_counters, db_order_objectives):
+    status_counters.get.return_value = None
+    db_order_objectives(2)
+
+    assert repository.count_orders_in_progress() == 2
+
+
+@pytest.mark.django_db()
+def test_transitions_move_status_counters(repository, status_counters, db_order_objectives, db_order, run_on_commit):
+    db_order_objectives(2)
+    objectives = repository.get_by_order(db_order.id)
+    run_on_commit()
+    status_counters.reset_mock()
+
+    repository.transition_many(objectives[:1], OrderObjectiveStatusSM.SET_COMPLETED)
+    repository.transition_bulk([objectives[1].id], OrderObjectiveStatusSM.SET_COMPLETED, dt.datetime.now())
+    status_counters.move.assert_not_called()
+
+    run_on_commit()
+    assert status_counters.move.call_count == 2
+    status_counters.move.assert_called_with(OrderObjectiveStatus.PENDING_APPROVAL, OrderObjectiveStatus.COMPLETED, 1)
+
+
+@pytest.mark.django_db()
+def test_transition_bulk_from_any_source_moves_status_counters(
+    repository, status_counters, db_order_objectives, db_order, run_on_commit
+):
+    db_order_objectives(3)
+    objectives = repository.get_by_order(db_order.id)
+    ORMOrderObjective.objects.filter(id=objectives[0].id).update(status=OrderObjectiveStatus.COMPLETED.value)
+    run_on_commit()
+    status_counters.reset_mock()
+
+    updated = repository.transition_bulk(
+        [o.id for o in objectives], OrderObjectiveStatusSM.SET_IN_PROGRESS, dt.datetime.now(tz=dt.timezone.utc)
+    )
+    run_on_commit()
+
+    assert updated == 3
+    assert status_counters.move.call_count == 2
+    status_counters.move.assert_any_call(OrderObjectiveStatus.COMPLETED, OrderObjectiveStatus.IN_PROGRESS, 1)
+    status_counters.move.assert_any_call(OrderObjectiveStatus.PENDING_APPROVAL, OrderObjectiveStatus.IN_PROGRESS, 2)
+
+
+@pytest.mark.django_db()
+def test_orm_save_moves_status_counters(status_counters, db_order_objectives, run_on_commit):
+    db_order_objectives(1)
+    run_on_commit()
+    status_counters.move.assert_called_once_with(None, OrderObjectiveStatus.PENDING_APPROVAL, 1)
+    status_counters.reset_mock()
+
+    objective = ORMOrderObjective.objects.get()
+    objective.save()
+    objective.status = OrderObjectiveStatus.COMPLETED.value
+    objective.save()
+    run_on_commit()
+
+    status_counters.move.assert_called_once_with(
+        OrderObjectiveStatus.PENDING_APPROVAL, OrderObjectiveStatus.COMPLETED, 1
+    )
+
+
+def test_redis_status_counters_reset_errors():
+    redis = MagicMock()
+    redis.pipeline.return_value.execute.side_effect = RedisError('redis is down')
+    counters = RedisOrderObjectiveStatusCountersRepository()
+
+    with patch.object(RedisOrderObjectiveStatusCountersRepository, '_redis', return_value=redis):
+        counters.reset({OrderObjectiveStatus.COMPLETED: 3})
+
+    mapping = redis.pipeline.return_value.hset.call_args[1]['mapping']
+    assert mapping[OrderObjectiveStatus.COMPLETED.value] == 3
+
+
+@pytest.mark.django_db()
+def test_reconcile_status_counters(repository, status_counters, db_order_objectives):
+    db_order_objectives(2)
+    status_counters.get.return_value = {status: 0 for status in OrderObjectiveStatus}
+
+    ReconcileOrderObjectiveStatusCountersUseCase(repository, status_counters).execute()
+
+    counts = status_counters.reset.call_args[0][0]
+    assert counts[OrderObjectiveStatus.PENDING_APPROVAL] == 2
+    assert sum(counts.values()) == 2
+
+
+@pytest.mark.django_db()
+def test_assign_booster_once(
+    repository,
+    db_order_objectives,
+    db_order,
+    db_client,
+    db_booster_user,
+    status_counters,
+    run_on_commit,
+    django_assert_num_queries
+):
+    db_order.client = db_client
+    db_order.save()
+    db_order_objectives(1)
+    ORMOrderObjective.objects.update(booster=None)
+    run_on_commit()
+    status_counters.reset_mock()
+    first, second = repository.get_by_order(db_order.id) + repository.get_by_order(db_order.id)
+    first_booster, second_booster = db_booster_user.booster_profile, BoosterUser.objects.create()
+
+    first.assign_booster(first_booster.id)
+    second.assign_booster(second_booster.id)
+
+    # update and chat room insert
+    with django_assert_num_queries(2):
+        assert repository.assign_booster(first)
+    assert not repository.assign_booster(second)
+    run_on_commit()
+
+    # the losing booster moves no counters
+    status_counters.move.assert_called_once_with(
+        OrderObjectiveStatus.PENDING_APPROVAL, OrderObjectiveStatus.AWAITING_BOOSTER, 1
+    )
+    objective = ORMOrderObjective.objects.get()
+    assert objective.booster_id == first_booster.id
+    assert objective.status == OrderObjectiveStatus.AWAITING_BOOSTER.value
+    assert list(ORMChatRoom.objects.values_list('client_id', 'booster_user_id')) == [
+        (db_client.id, db_booster_user.id)
+    ]
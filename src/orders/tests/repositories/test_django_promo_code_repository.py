@@ -0,0 +1,58 @@
+import pytest
+
+from core.shopping_cart.domain.promo_code import PromoCodeDoesNotExists
+from orders.repositories import DjangoPromoCodeRepository
+from services.models import PromoCode as PromoCodeORM
+
+
+@pytest.fixture()
+def rep():
+    DjangoPromoCodeRepository.cache.clear()
+    return DjangoPromoCodeRepository()
+
+
+@pytest.fixture()
+def db_promo_code(db_service):
+    promo = PromoCodeORM.objects.create(code='TEST-PROMO', discount=10)
+    promo.service.add(db_service)
+    return promo
+
+
+@pytest.mark.django_db
+def test_find_by_code_cached(rep, db_promo_code, db_service, django_assert_num_queries):
+    rep.find_by_code(db_promo_code.code)
+
+    with django_assert_num_queries(0):
+        promo = rep.find_by_code(db_promo_code.code)
+
+    assert promo.discount == 10
+    assert promo.service_slugs == [db_service.slug]
+
+
+@pytest.mark.django_db
+def test_find_by_code_invalidated_on_save(rep, db_promo_code):
+    rep.find_by_code(db_promo_code.code)
+
+    db_promo_code.discount = 20
+    db_promo_code.save()
+
+    assert rep.find_by_code(db_promo_code.code).discount == 20
+
+
+@pytest.mark.django_db
+def test_find_by_code_invalidated_on_services_changed(rep, db_promo_code, db_service):
+    rep.find_by_code(db_promo_code.code)
+
+    db_service.promo_codes.remove(db_promo_code)
+
+    assert rep.find_by_code(db_promo_code.code).service_slugs == []
+
+
+@pytest.mark.django_db
+def test_find_by_code_invalidated_on_delete(rep, db_promo_code):
+    rep.find_by_code(db_promo_code.code)
+
+    db_promo_code.delete()
+
+    with pytest.raises(PromoCodeDoesNotExists):
+        rep.find_by_code('TEST-PROMO')
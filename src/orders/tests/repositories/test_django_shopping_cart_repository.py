@@ -0,0 +1,360 @@
+import datetime as dt
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from core.shopping_cart.application.repository import ShoppingCartTouchesRepository
+from core.shopping_cart.application.use_cases.add_to_shopping_cart import (
+    AddItemsToShoppingCartDTOInput,
+    AddItemsToShoppingCartUseCase,
+    BungieDestinyCharacterDTO,
+    BungieProfileDTO,
+    ItemAddedToCart,
+    MAX_ITEMS_ADDED,
+)
+from core.shopping_cart.application.use_cases.delete_stale_carts import (
+    DeleteStaleShoppingCartsDTORequest,
+    DeleteStaleShoppingCartsUseCase,
+)
+from core.shopping_cart.application.use_cases.flush_cart_touches import FlushShoppingCartTouchesUseCase
+from core.shopping_cart.application.use_cases.list_cart_items_mixin import ListCartItemsUseCaseMixin
+from core.shopping_cart.application.use_cases.list_shopping_cart import (
+    ListShoppingCartDTOInput,
+    ListShoppingCartUseCase,
+)
+from core.shopping_cart.domain.shopping_cart import ShoppingCartItem
+from django.db import DatabaseError
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from orders.orm_models import ORMClientOrder, ORMShoppingCart, ORMShoppingCartItem
+from orders.repositories import (
+    DjangoCacheShoppingCartSnapshotRepository, DjangoPromoCodeRepository, DjangoShoppingCartItemRepository,
+    DjangoShoppingCartRepository, RedisShoppingCartTouchesRepository,
+)
+from profiles.constants import CharacterClasses, Membership
+from profiles.orm_models import ORMDestinyBungieCharacter, ORMDestinyBungieProfile
+from profiles.repository import DjangoDestinyBungieProfileRepository, DjangoDestinyCharacterRepository
+from services.repositories import (
+    DestinyServiceConfigRepository, DestinyServiceRepository,
+    DjangoServicePriceTableRepository,
+)
+
+
+@pytest.fixture()
+def uc():
+    return ListCartItemsUseCaseMixin(
+        cart_repository=DjangoShoppingCartRepository(),
+        cart_item_repository=DjangoShoppingCartItemRepository(),
+        service_repository=DestinyServiceRepository(),
+        service_configs_repository=DestinyServiceConfigRepository(),
+        promo_code_repository=DjangoPromoCodeRepository(),
+        service_price_table_repository=DjangoServicePriceTableRepository()
+    )
+
+
+@pytest.fixture()
+def list_cart_uc():
+    return ListShoppingCartUseCase(
+        shopping_cart_repository=DjangoShoppingCartRepository(),
+        shopping_cart_items_repository=DjangoShoppingCartItemRepository(),
+        destiny_bungie_profile_repository=DjangoDestinyBungieProfileRepository(),
+        destiny_character_repository=DjangoDestinyCharacterRepository(),
+        service_repository=DestinyServiceRepository(),
+        service_configs_repository=DestinyServiceConfigRepository(),
+        promo_code_repository=DjangoPromoCodeRepository(),
+        service_price_table_repository=DjangoServicePriceTableRepository(),
+        cart_snapshot_repository=DjangoCacheShoppingCartSnapshotRepository(),
+        cart_touches_repository=RedisShoppingCartTouchesRepository()
+    )
+
+
+@pytest.fixture()
+def add_items_uc():
+    return AddItemsToShoppingCartUseCase(
+        shopping_cart_repository=DjangoShoppingCartRepository(),
+        shopping_cart_items_repository=DjangoShoppingCartItemRepository(),
+        destiny_bungie_profile_repository=DjangoDestinyBungieProfileRepository(),
+        destiny_character_repository=DjangoDestinyCharacterRepository(),
+        service_repository=DestinyServiceRepository(),
+        service_configs_repository=DestinyServiceConfigRepository(),
+        promo_code_repository=DjangoPromoCodeRepository(),
+        service_price_table_repository=DjangoServicePriceTableRepository()
+    )
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('items_count', [1, 10, 50])
+def test_get_shopping_cart_by_id_queries_count_is_constant(
+    uc,
+    db_shopping_cart,
+    db_options_service,
+    django_assert_num_queries,
+    items_count
+):
+    cart_id = db_shopping_cart(items_count).id
+    # price tables are compiled once per process
+    uc.service_price_table_repository.get_by_slug(db_options_service.slug)
+
+    # cart with promo, items with services, selected options, promo services
+    with django_assert_num_queries(4):
+        cart = uc.get_shopping_cart_by_id(cart_id)
+
+    assert len(cart.items) == items_count
+    assert cart.promo.code == 'TEST-PROMO'
+
+
+@pytest.mark.django_db()
+def test_get_shopping_cart_by_id_prices(uc, db_shopping_cart):
+    cart = uc.get_shopping_cart_by_id(db_shopping_cart(2).id)
+
+    item = cart.items[0]
+    assert item.service.slug == 'options-service'
+    assert {o.title for o in item.selected_options} == {'First', 'Second'}
+    assert item.price == Decimal(60)
+    assert item.old_price == Decimal(65)
+
+    total_price, total_old_price = cart.prices
+    assert total_price == Decimal(108)
+    assert total_old_price == Decimal(120)
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('items_count', [1, 10, 50])
+def test_list_shopping_cart_queries_count_is_constant(
+    list_cart_uc,
+    db_shopping_cart,
+    db_options_service,
+    django_assert_num_queries,
+    items_count
+):
+    cart_id = db_shopping_cart(items_count).id
+    list_cart_uc.service_price_table_repository.get_by_slug(db_options_service.slug)
+
+    # cart aggregate + destiny profiles + destiny characters
+    with django_assert_num_queries(6):
+        result = list_cart_uc.execute(ListShoppingCartDTOInput(cart_id=cart_id))
+
+    assert len(result.cart_items) == items_count
+    assert result.cart_items[0].destiny_profile.membership_id == result.cart_items[0].destiny_character.membership_id
+
+
+@pytest.mark.django_db()
+def test_list_shopping_cart_served_from_snapshot(
+    locmem_cache,
+    list_cart_uc,
+    db_shopping_cart,
+    django_assert_num_queries
+):
+    cart_id = db_shopping_cart(3).id
+    dto = ListShoppingCartDTOInput(cart_id=cart_id)
+
+    result = list_cart_uc.execute(dto)
+
+    with django_assert_num_queries(0):
+        cached = list_cart_uc.execute(dto)
+
+    assert cached == result
+    assert list_cart_uc.cart_snapshot_repository.stats() == dict(hits=1, misses=1)
+
+
+@pytest.mark.django_db()
+def test_list_shopping_cart_snapshot_invalidation(
+    locmem_cache,
+    run_on_commit,
+    list_cart_uc,
+    db_shopping_cart,
+    db_options_service,
+    django_assert_num_queries
+):
+    cart_id = db_shopping_cart(1).id
+    dto = ListShoppingCartDTOInput(cart_id=cart_id)
+    list_cart_uc.execute(dto)
+
+    list_cart_uc.cart_snapshot_repository.invalidate(cart_id)
+    with django_assert_num_queries(6):
+        list_cart_uc.execute(dto)
+
+    db_options_service.configs.update(price=40)
+    # queryset update skips signals, admin edits go through save()
+    db_options_service.save()
+    # version is bumped once the change is committed
+    assert list_cart_uc.execute(dto).total_price != Decimal(81)
+
+    run_on_commit()
+    result = list_cart_uc.execute(dto)
+    assert result.total_price == Decimal(81)
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('items_count', [1, 10])
+def test_add_items_queries_count_is_constant(
+    add_items_uc,
+    db_options_service,
+    django_assert_num_queries,
+    items_count
+):
+    option_ids = list(db_options_service.configs.values_list('id', flat=True))
+    items = [
+        ItemAddedToCart(
+            bungie_profile=BungieProfileDTO(
+                membership_id=f'profile-{i % 2}',
+                membership_type=Membership.Steam,
+                username=f'Guardian {i % 2}'
+            ),
+            character=BungieDestinyCharacterDTO(
+                character_id=f'character-{i}',
+                character_class=CharacterClasses.titan,
+                bungie_profile_id=f'profile-{i % 2}'
+            ),
+            option_ids=option_ids,
+            service_slug=db_options_service.slug,
+        ) for i in range(items_count)
+    ]
+    add_items_uc.service_price_table_repository.get_by_slug(db_options_service.slug)
+
+    # cart update_or_create, bungie entities upsert, items and options insert, cart aggregate
+    with django_assert_num_queries(15):
+        result = add_items_uc.execute(AddItemsToShoppingCartDTOInput(cart_id=None, adding_to_cart=items))
+
+    assert len(result.cart_item_ids) == items_count
+    assert result.total_price == Decimal(60) * items_count
+    assert ORMShoppingCartItem.objects.filter(shopping_cart_id=result.cart_id).count() == items_count
+    assert ORMDestinyBungieProfile.objects.filter(membership_id__startswith='profile-').count() == min(items_count, 2)
+    assert ORMDestinyBungieCharacter.objects.filter(bungie_profile__membership_id__startswith='profile-').count() == items_count
+
+
+def test_add_items_count_is_bounded():
+    item = ItemAddedToCart(
+        bungie_profile=BungieProfileDTO(membership_id='profile', membership_type=Membership.Steam, username='Guardian'),
+        character=BungieDestinyCharacterDTO(
+            character_id='character', character_class=CharacterClasses.titan, bungie_profile_id='profile'
+        ),
+        option_ids=[1],
+        service_slug='service',
+    )
+
+    AddItemsToShoppingCartDTOInput(cart_id=None, adding_to_cart=[item] * MAX_ITEMS_ADDED)
+    with pytest.raises(ValidationError):
+        AddItemsToShoppingCartDTOInput(cart_id=None, adding_to_cart=[item] * (MAX_ITEMS_ADDED + 1))
+
+
+@pytest.mark.django_db()
+def test_delete_stale_carts(db_shopping_cart):
+    now = timezone.now()
+    stale_at = now - DeleteStaleShoppingCartsUseCase.STALE_AFTER - dt.timedelta(minutes=1)
+
+    stale_carts = [db_shopping_cart(2) for _ in range(3)]
+    ordered_cart = db_shopping_cart(1)
+    fresh_cart = db_shopping_cart(1)
+    ORMShoppingCart.objects.exclude(id=fresh_cart.id).update(fetched_at=stale_at)
+    ORMClientOrder.objects.create(
+        id='order', payment_id='payment', created_at=now, order_status_changed_at=now, order_id=ordered_cart.id
+    )
+
+    uc = DeleteStaleShoppingCartsUseCase(cart_repository=DjangoShoppingCartRepository())
+    uc.BATCH_SIZE = 2
+    result = uc.execute(DeleteStaleShoppingCartsDTORequest(now=now))
+
+    # 3 carts, 6 items with 2 selected options each
+    assert result.carts_count == 3
+    assert result.rows_count == 3 + 6 + 12
+    assert set(ORMShoppingCart.objects.values_list('id', flat=True)) == {ordered_cart.id, fresh_cart.id}
+    assert not ORMShoppingCartItem.objects.filter(shopping_cart_id__in=[c.id for c in stale_carts]).exists()
+
+
+class InMemoryShoppingCartTouchesRepository(ShoppingCartTouchesRepository):
+    def __init__(self, touches):
+        self.touches = touches
+
+    def touch(self, shopping_cart_id):
+        pass
+
+    def pop(self, limit):
+        popped = dict(list(self.touches.items())[:limit])
+        for cart_id in popped:
+            del self.touches[cart_id]
+        return popped
+
+    def restore(self, touches):
+        for cart_id, at in touches.items():
+            self.touches.setdefault(cart_id, at)
+
+
+@pytest.mark.django_db()
+def test_flush_cart_touches(db_shopping_cart):
+    now = timezone.now()
+    carts = [db_shopping_cart(0) for _ in range(3)]
+    ORMShoppingCart.objects.update(fetched_at=now - dt.timedelta(days=1))
+    touches = InMemoryShoppingCartTouchesRepository({
+        carts[0].id: now,
+        carts[1].id: now - dt.timedelta(days=2),
+        'unknown-cart': now,
+    })
+
+    uc = FlushShoppingCartTouchesUseCase(
+        cart_repository=DjangoShoppingCartRepository(),
+        cart_touches_repository=touches
+    )
+    uc.BATCH_SIZE = 2
+
+    assert uc.execute() == 3
+    fetched_at = dict(ORMShoppingCart.objects.values_list('id', 'fetched_at'))
+    assert fetched_at[carts[0].id] == now
+    # older touches never move fetched_at back
+    assert fetched_at[carts[1].id] == now - dt.timedelta(days=1)
+    assert fetched_at[carts[2].id] == now - dt.timedelta(days=1)
+
+
+@pytest.mark.django_db()
+def test_flush_cart_touches_restored_on_failure(db_shopping_cart):
+    now = timezone.now()
+    cart = db_shopping_cart(0)
+    touches = InMemoryShoppingCartTouchesRepository({cart.id: now})
+    cart_repository = MagicMock(spec=DjangoShoppingCartRepository)
+    cart_repository.update_fetched_at_bulk.side_effect = DatabaseError('connection lost')
+
+    uc = FlushShoppingCartTouchesUseCase(cart_repository=cart_repository, cart_touches_repository=touches)
+
+    with pytest.raises(DatabaseError):
+        uc.execute()
+    assert touches.touches == {cart.id: now}
+
+
+def test_redis_cart_touches_errors():
+    repository = RedisShoppingCartTouchesRepository()
+    repository._connection, repository._is_resolved = MagicMock(), True
+    repository._connection.zpopmin.side_effect = RedisError('redis is down')
+    now = timezone.now()
+
+    assert repository.pop(10) == {}
+
+    repository.restore({'cart-id': now})
+    repository._connection.zadd.assert_called_once_with(
+        RedisShoppingCartTouchesRepository.KEY, {'cart-id': now.timestamp()}, nx=True
+    )
+
+
+@pytest.mark.django_db()
+def test_create_cart_item(db_shopping_cart, db_options_service, db_destiny_character, django_assert_num_queries):
+    cart = db_shopping_cart(0)
+    option_ids = list(db_options_service.configs.values_list('id', flat=True))
+    item = ShoppingCartItem.create(
+        bungie_profile_id=db_destiny_character.bungie_profile_id,
+        character_id=db_destiny_character.character_id,
+        service_slug=db_options_service.slug,
+        shopping_cart_id=cart.id,
+        range_options=None,
+    )
+
+    # item and selected options inserts, nothing is read back
+    with django_assert_num_queries(2):
+        created = DjangoShoppingCartItemRepository().create(item, option_ids)
+
+    assert created.id == item.id
+    assert created.service_slug == db_options_service.slug
+    orm_item = ORMShoppingCartItem.objects.get(id=item.id)
+    assert orm_item.shopping_cart_id == cart.id
+    assert set(orm_item.selected_options.values_list('id', flat=True)) == set(option_ids)
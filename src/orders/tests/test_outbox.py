@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import transaction
+
+from orders.orm_models import ORMOutboxMessage
+from orders.outbox import OutboxRelay, send_task
+from orders.tasks import new_chat_message, order_created_notifications
+
+
+@pytest.fixture()
+def app():
+    return MagicMock()
+
+
+@pytest.mark.django_db()
+def test_send_task_rolled_back():
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            send_task(new_chat_message, client_id=1, message='hello')
+            raise RuntimeError()
+
+    assert not ORMOutboxMessage.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_relay(app, locmem_cache, django_assert_num_queries):
+    send_task(new_chat_message, client_id=1, message='hello')
+    send_task(order_created_notifications, client_order_id='order')
+    relay = OutboxRelay(app)
+    relay.BATCH_SIZE = 1
+
+    assert relay.relay() == 2
+
+    producer = app.producer_or_acquire.return_value.__enter__.return_value
+    assert app.send_task.call_args_list == [
+        ((new_chat_message.name,), dict(kwargs={'client_id': 1, 'message': 'hello'}, producer=producer)),
+        ((order_created_notifications.name,), dict(kwargs={'client_order_id': 'order'}, producer=producer)),
+    ]
+    assert not ORMOutboxMessage.objects.exists()
+
+    stats = OutboxRelay.stats()
+    assert stats['pending'] == 0
+    assert stats['lag'] is not None
+
+
+@pytest.mark.django_db()
+def test_relay_send_failed(app):
+    send_task(new_chat_message, client_id=1, message='hello')
+    app.send_task.side_effect = ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        OutboxRelay(app).relay_batch()
+
+    assert ORMOutboxMessage.objects.count() == 1
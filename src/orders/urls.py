@@ -6,6 +6,7 @@ from . import v2_views, views
 app_name = 'orders'
 urlpatterns = [
     path('invoice/complete', views.invoice_complete),
+    path('outbox/stats', views.outbox_stats),
     path('featured/week', views.OrderCompletedLastWeekAPIView.as_view(), name='featured-orders'),
     path('user/orders/', views.UserOrdersView.as_view()),
     path('user/booster/orders/', views.UserBoosterOrdersView.as_view()),
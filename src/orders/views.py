@@ -19,6 +19,7 @@ from core.order.application.use_cases.process_payment_callback_uc import (
 )
 from infrastructure.injectors.application import ApplicationContainer
 from orders.enum import OrderStatus
+from orders.outbox import OutboxRelay
 from profiles.models import (
     ProfileCredentials,
 )
@@ -70,6 +71,12 @@ class OrderCompletedLastWeekAPIView(ListAPIView):
         return queryset.order_by("-created_at")
 
 
+@api_view(["GET"])
+@permission_classes((permissions.IsAdminUser,))
+def outbox_stats(request):
+    return Response(OutboxRelay.stats())
+
+
 @api_view(["POST"])
 @permission_classes((permissions.AllowAny,))
 @inject
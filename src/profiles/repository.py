@@ -130,6 +130,12 @@ class DjangoDestinyBungieProfileRepository(DestinyBungieProfileRepository):
             raise DestinyProfileDoesNotExists()
         return self._encode_profile(profile)
 
+    def list_by_ids(self, membership_ids: t.List[str]) -> t.List[DestinyBungieProfile]:
+        profiles = ORMDestinyBungieProfile.objects.filter(
+            membership_id__in=membership_ids
+        )
+        return list(map(self._encode_profile, profiles))
+
     def create_or_update(self, profile: DestinyBungieProfile):
         _, is_created = ORMDestinyBungieProfile.objects.update_or_create(
             membership_id=profile.membership_id,
@@ -139,6 +145,26 @@ class DjangoDestinyBungieProfileRepository(DestinyBungieProfileRepository):
             )
         )
 
+    def create_or_update_bulk(self, profiles: t.List[DestinyBungieProfile]):
+        existing = ORMDestinyBungieProfile.objects.in_bulk([p.membership_id for p in profiles])
+        to_create, to_update = [], []
+
+        for profile in profiles:
+            obj = existing.get(profile.membership_id)
+            if not obj:
+                to_create.append(ORMDestinyBungieProfile(
+                    membership_id=profile.membership_id,
+                    username=profile.username,
+                    membership_type=profile.membership_type.value
+                ))
+            elif (obj.username, obj.membership_type) != (profile.username, profile.membership_type.value):
+                obj.username = profile.username
+                obj.membership_type = profile.membership_type.value
+                to_update.append(obj)
+
+        ORMDestinyBungieProfile.objects.bulk_create(to_create, ignore_conflicts=True)
+        ORMDestinyBungieProfile.objects.bulk_update(to_update, ['username', 'membership_type'])
+
     def get_by_cart_id(self, cart_id: ShoppingCartId):
         profiles = ORMDestinyBungieProfile.objects.prefetch_related('cart_items').filter(
             cart_items__shopping_cart_id=cart_id
@@ -184,7 +210,7 @@ class DjangoDestinyCharacterRepository(DestinyBungieCharacterRepository):
         return DestinyCharacter(
             character_id=character.character_id,
             character_class=character.game_class,
-            bungie_id=character.bungie_profile.pk
+            bungie_id=character.bungie_profile_id
         )
 
     def get_by_id(self, character_id: str) -> DestinyCharacter:
@@ -194,6 +220,12 @@ class DjangoDestinyCharacterRepository(DestinyBungieCharacterRepository):
         else:
             return self._encode_model(character)
 
+    def list_by_ids(self, character_ids: t.List[str]) -> t.List[DestinyCharacter]:
+        characters = ORMDestinyBungieCharacter.objects.filter(
+            character_id__in=character_ids
+        )
+        return list(map(self._encode_model, characters))
+
     def list_by_client_order_id(self, client_order_id: str) -> t.List[DestinyCharacter]:
         characters = ORMDestinyBungieCharacter.objects.filter(
             ormorderobjective__client_order=client_order_id
@@ -207,6 +239,26 @@ class DjangoDestinyCharacterRepository(DestinyBungieCharacterRepository):
             character_class=character.character_class.value
         )
 
+    def create_or_update_bulk(self, characters: t.List[DestinyCharacter]):
+        existing = ORMDestinyBungieCharacter.objects.in_bulk([c.character_id for c in characters])
+        to_create, to_update = [], []
+
+        for character in characters:
+            obj = existing.get(character.character_id)
+            if not obj:
+                to_create.append(ORMDestinyBungieCharacter(
+                    bungie_profile_id=character.bungie_id,
+                    character_id=character.character_id,
+                    character_class=character.character_class.value
+                ))
+            elif (obj.bungie_profile_id, obj.character_class) != (character.bungie_id, character.character_class.value):
+                obj.bungie_profile_id = character.bungie_id
+                obj.character_class = character.character_class.value
+                to_update.append(obj)
+
+        ORMDestinyBungieCharacter.objects.bulk_create(to_create, ignore_conflicts=True)
+        ORMDestinyBungieCharacter.objects.bulk_update(to_update, ['bungie_profile', 'character_class'])
+
 
 class DjangoProfileCredentialsRepository(ClientCredentialsRepository):
     def list_by_booster_and_orders(
@@ -11,11 +11,14 @@ class ServicesConfig(AppConfig):
         from services.repositories import (
             DestinyServiceRepository, DestinyServiceConfigRepository,
             DjangoMainPageServicesRepository,
-            DjangoServiceDetailedInfoRepository
+            DjangoServiceDetailedInfoRepository,
+            DjangoServicePriceTableRepository
         )
+        from . import signals
 
         container.services.service_rep.override(providers.Factory(DestinyServiceRepository))
         container.services.service_configs_rep.override(providers.Factory(DestinyServiceConfigRepository))
+        container.services.service_price_table_rep.override(providers.Singleton(DjangoServicePriceTableRepository))
         container.services.main_page_services_repository.override(providers.Factory(DjangoMainPageServicesRepository))
         container.services.service_detailed_info_repository.override(providers.Factory(DjangoServiceDetailedInfoRepository))
 
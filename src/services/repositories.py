@@ -1,16 +1,21 @@
+import threading
+import time
 import typing as t
 from collections import defaultdict
 
+from django.core.cache import cache
 from django.db.models import Avg, Count, Q
 
 from core.application.repositories.aggregates.main_page_services_repository import MainPageServicesRepository
 from core.application.repositories.service_group_tag import ServiceGroupTagRepository
+from core.application.exceptions import ServiceDoesNotExists
 from core.application.repositories.services import (
-    ServiceConfigsRepository, ServiceDetailedInfoRepository, ServiceRepository,
+    ServiceConfigsRepository, ServiceDetailedInfoRepository, ServicePriceTableRepository, ServiceRepository,
 )
+from core.domain.entities.constants import ConfigurationType
 from core.domain.entities.service import (
     Service, ServiceConfig, ServiceDetailedInfo, ServiceGroupTag, ServicePageStaticData,
-    ShortServiceInfo,
+    ServicePriceTable, ShortServiceInfo,
 )
 from core.order.domain.consts import OrderObjectiveStatus
 from services.models import Service as ServiceORM, ServiceConfig as ServiceConfigORM, ServiceGroupTagORM
@@ -38,24 +43,24 @@ class DestinyServiceRepository(ServiceRepository):
         res = ServiceORM.objects.filter(
             order_objectives__client_order_id__in=client_orders
         )
-        return list(map(self._encode_model, res))
+        return list(map(self.encode_model, res))
 
     def list_by_client_order(self, client_order: str) -> t.List[Service]:
         res = ServiceORM.objects.filter(
             order_objectives__client_order_id=client_order
         )
-        return list(map(self._encode_model, res))
+        return list(map(self.encode_model, res))
 
     def get_by_slug(self, slug: str) -> Service:
         res = ServiceORM.objects.get(slug=slug)
-        return self._encode_model(res)
+        return self.encode_model(res)
 
     def list_active(self) -> t.List[Service]:
         res = ServiceORM.objects.filter(is_hidden=False)
-        return [self._encode_model(d) for d in res]
+        return [self.encode_model(d) for d in res]
 
     @staticmethod
-    def _encode_model(data: ServiceORM) -> Service:
+    def encode_model(data: ServiceORM) -> Service:
         return Service(
             title=data.title,
             slug=data.slug,
@@ -85,7 +90,7 @@ class DestinyServiceConfigRepository(ServiceConfigsRepository):
         )
         res = defaultdict(list)
         for el in configs:
-            res[el.service_id].append(self._encode_model(el))
+            res[el.service_id].append(self.encode_model(el))
 
         return res
 
@@ -93,18 +98,18 @@ class DestinyServiceConfigRepository(ServiceConfigsRepository):
         objs = ServiceConfigORM.objects.filter(
             order_objectives__client_order__id__in=client_orders
         )
-        return list(map(self._encode_model, objs))
+        return list(map(self.encode_model, objs))
 
     def list_by_service(self, service_slug: str) -> t.List[ServiceConfig]:
         objs = ServiceConfigORM.objects.filter(service=service_slug)
-        return list(map(self._encode_model, objs))
+        return list(map(self.encode_model, objs))
 
     def list_by_shopping_cart_item(self, cart_item_id: str) -> t.List[ServiceConfig]:
         objs = ServiceConfigORM.objects.prefetch_related('cart_items').filter(cart_items__id=cart_item_id)
-        return list(map(self._encode_model, objs))
+        return list(map(self.encode_model, objs))
 
     @staticmethod
-    def _encode_model(config: ServiceConfigORM):
+    def encode_model(config: ServiceConfigORM):
         return ServiceConfig(
             title=config.title,
             description=config.description,
@@ -193,3 +198,79 @@ class DjangoServiceDetailedInfoRepository(ServiceDetailedInfoRepository):
                 description=data.static_description
             )
         )
+
+
+class DjangoServicePriceTableRepository(ServicePriceTableRepository):
+    """
+    Price tables of all services are compiled once per process.
+    They are recompiled when version stamp in cache is changed by another process,
+    stamp is checked at most once per VERSION_CHECK_INTERVAL seconds.
+    """
+    VERSION_KEY = 'service-price-table:version'
+    VERSION_CHECK_INTERVAL = 5
+    MAX_AGE = 60 * 5
+
+    _lock = threading.Lock()
+    _tables: t.Dict[str, ServicePriceTable] = {}
+    _version: t.Optional[int] = None
+    _compiled_at: t.Optional[float] = None
+    _checked_at: float = 0
+
+    @staticmethod
+    def _compile() -> t.Dict[str, ServicePriceTable]:
+        options = defaultdict(dict)
+        configs = ServiceConfigORM.objects.order_by().values_list('service_id', 'id', 'price', 'old_price')
+
+        for service_id, option_id, price, old_price in configs:
+            if price:
+                options[service_id][option_id] = (price, old_price if old_price else price)
+
+        services = ServiceORM.objects.order_by().values_list('slug', 'configuration_type', 'base_price')
+
+        return {
+            slug: ServicePriceTable(
+                slug=slug,
+                configuration_type=ConfigurationType[configuration_type] if configuration_type else None,
+                base_price=base_price,
+                options=options[slug]
+            ) for slug, configuration_type, base_price in services
+        }
+
+    @classmethod
+    def _get_tables(cls) -> t.Dict[str, ServicePriceTable]:
+        now = time.monotonic()
+
+        is_compiled = cls._compiled_at is not None
+        if is_compiled and now - cls._checked_at < cls.VERSION_CHECK_INTERVAL:
+            return cls._tables
+
+        with cls._lock:
+            version = cache.get(cls.VERSION_KEY)
+            if (
+                cls._compiled_at is None
+                or version != cls._version
+                or now - cls._compiled_at > cls.MAX_AGE
+            ):
+                cls._tables = cls._compile()
+                cls._version = version
+                cls._compiled_at = now
+            cls._checked_at = now
+
+        return cls._tables
+
+    def get_by_slug(self, slug: str) -> ServicePriceTable:
+        # created services are compiled once their save bumps the version, unknown slugs do not recompile
+        table = self._get_tables().get(slug)
+        if not table:
+            raise ServiceDoesNotExists()
+        return table
+
+    def bump_version(self):
+        cls = type(self)
+        with cls._lock:
+            cls._compiled_at = None
+
+        try:
+            cache.incr(self.VERSION_KEY)
+        except ValueError:
+            cache.set(self.VERSION_KEY, time.time_ns(), timeout=None)
@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from infrastructure.injectors.service import DestinyServiceInjectors
+from services.models import Service, ServiceConfig
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=ServiceConfig)
+@receiver(post_delete, sender=ServiceConfig)
+def bump_service_price_tables_version(sender, **kwargs):
+    # other processes recompile on the new version, they must see the committed rows
+    transaction.on_commit(lambda: DestinyServiceInjectors.service_price_table_rep().bump_version())
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import pytest
+
+from core.application.exceptions import ServiceDoesNotExists
+from core.domain.entities.constants import ConfigurationType
+from core.domain.entities.service import OptionsPriceCalculator
+from services.repositories import (
+    DestinyServiceConfigRepository, DestinyServiceRepository,
+    DjangoServicePriceTableRepository,
+)
+
+
+@pytest.fixture()
+def rep():
+    return DjangoServicePriceTableRepository()
+
+
+@pytest.mark.django_db
+def test_get_price(rep, db_options_service):
+    option_ids = [c.id for c in db_options_service.configs.all()]
+
+    table = rep.get_by_slug(db_options_service.slug)
+
+    assert table.get_price(option_ids, None) == (Decimal(60), Decimal(65))
+    assert table.get_price(option_ids[:1], None) == (Decimal(30), Decimal(35))
+    assert table.get_price([], None) == (Decimal(10), Decimal(10))
+
+
+@pytest.mark.django_db
+def test_get_price_range_options(rep, db_options_service):
+    db_options_service.configuration_type = ConfigurationType.range_select.value
+    db_options_service.save()
+
+    table = rep.get_by_slug(db_options_service.slug)
+
+    assert table.get_price([], {'totalPrice': 15, 'totalOldPrice': 20}) == (Decimal(15), Decimal(20))
+
+
+@pytest.mark.django_db
+def test_compiled_once(rep, db_options_service, django_assert_num_queries):
+    rep.get_by_slug(db_options_service.slug)
+
+    with django_assert_num_queries(0):
+        rep.get_by_slug(db_options_service.slug)
+
+
+@pytest.mark.django_db
+def test_recompiled_after_config_changed(rep, db_options_service, run_on_commit):
+    config = db_options_service.configs.get(title='Second')
+    rep.get_by_slug(db_options_service.slug)
+
+    config.price = 40
+    config.save()
+    # version is bumped once the change is committed
+    assert rep.get_by_slug(db_options_service.slug).get_price([config.id], None) == (Decimal(40), Decimal(40))
+
+    run_on_commit()
+    table = rep.get_by_slug(db_options_service.slug)
+    assert table.get_price([config.id], None) == (Decimal(50), Decimal(50))
+
+
+@pytest.mark.django_db
+def test_service_does_not_exists(rep, db_options_service, django_assert_num_queries):
+    rep.get_by_slug(db_options_service.slug)
+
+    with django_assert_num_queries(0):
+        with pytest.raises(ServiceDoesNotExists):
+            rep.get_by_slug('unknown-service')
+
+
+@pytest.mark.django_db
+def test_benchmark_cart_pricing(benchmark, rep, db_options_service):
+    items_count = 200
+    slug = db_options_service.slug
+    option_ids = [c.id for c in db_options_service.configs.all()]
+    prices = {}
+
+    def price_from_repositories():
+        for _ in range(items_count):
+            service = DestinyServiceRepository().get_by_slug(slug)
+            options = DestinyServiceConfigRepository().list_by_service(slug)
+            prices['before'] = OptionsPriceCalculator.get_price(options, None, service.base_price)
+
+    def price_from_table():
+        for _ in range(items_count):
+            prices['after'] = rep.get_by_slug(slug).get_price(option_ids, None)
+
+    before = benchmark(price_from_repositories, name='cart pricing, repositories')
+    after = benchmark(price_from_table, name='cart pricing, compiled price table')
+
+    assert prices['before'] == prices['after']
+    # service, its category and its options per item
+    assert before.queries == 3 * items_count
+    assert after.queries == 0